@@ -58,6 +58,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # gzip / Brotli for /api/; before anything that reads or changes the body
+    'core.compression.CompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -138,19 +140,54 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Static JSON snapshot of the public API written by `manage.py export_api`
+API_SNAPSHOT_ROOT = os.environ.get('API_SNAPSHOT_ROOT', os.path.join(BASE_DIR, 'snapshot'))
+
 # Supabase Configuration (for development)
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 SUPABASE_BUCKET = os.environ.get('SUPABASE_BUCKET', 'atelier-media')
+# Optional CDN origin in front of /storage/v1/object/public/
+SUPABASE_CDN_URL = os.environ.get('SUPABASE_CDN_URL', '')
 
 # Media files - Use Supabase Storage if configured, otherwise local
 if SUPABASE_URL and SUPABASE_KEY:
     DEFAULT_FILE_STORAGE = 'utils.supabase_storage.SupabaseStorage'
-    MEDIA_URL = f"{SUPABASE_URL}/storage/v1/object/public/{SUPABASE_BUCKET}/"
+    MEDIA_URL = f"{SUPABASE_CDN_URL or SUPABASE_URL}/storage/v1/object/public/{SUPABASE_BUCKET}/"
 else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Local read-through cache for Supabase media reads (utils/media_cache.py),
+# shared by every worker on the host; empty turns it off
+MEDIA_CACHE_DIR = os.environ.get('MEDIA_CACHE_DIR', os.path.join(BASE_DIR, 'media_cache'))
+MEDIA_CACHE_MAX_SIZE = int(os.environ.get('MEDIA_CACHE_MAX_SIZE', 512 * 1024 * 1024))
+
+# SupabaseStorage.delete() only queues; queued objects are removed in
+# batches on a background thread once the deleting transaction commits.
+# Off flushes inline at commit instead
+MEDIA_DELETIONS_IN_BACKGROUND = os.environ.get('MEDIA_DELETIONS_IN_BACKGROUND', 'True') == 'True'
+
+# Resized image variants (core/images.py) render on a background thread pool
+# once the upload commits; off renders them inline at commit instead
+IMAGE_VARIANTS_IN_BACKGROUND = os.environ.get('IMAGE_VARIANTS_IN_BACKGROUND', 'True') == 'True'
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Local memory is fine for a single dev server; production shares a cache
+# across gunicorn workers so signal-driven invalidation reaches all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'atelier-spaces-nate',
+    }
+}
+
+# Cached API responses are keyed by model version stamps, so this only bounds
+# how long superseded entries linger before the backend evicts them
+API_RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -162,6 +199,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # orjson-backed, byte-compatible with JSONRenderer (core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -28,6 +28,14 @@ DATABASES = {
     )
 }
 
+# Cache - file based so every gunicorn worker on the dyno sees the same entries
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/tmp/atelier-cache'),
+    }
+}
+
 # CORS
 CORS_ALLOWED_ORIGINS = [
     origin.strip() 
@@ -43,11 +51,13 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 SUPABASE_URL = os.environ.get('SUPABASE_URL', 'https://loetbmdkawhlkamtqjij.supabase.co')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 SUPABASE_BUCKET = os.environ.get('SUPABASE_BUCKET', 'atelier-media')
+# Optional CDN origin in front of /storage/v1/object/public/
+SUPABASE_CDN_URL = os.environ.get('SUPABASE_CDN_URL', '')
 
 # Media files - Always use Supabase Storage in production
 if SUPABASE_URL and SUPABASE_KEY:
     DEFAULT_FILE_STORAGE = 'utils.supabase_storage.SupabaseStorage'
-    MEDIA_URL = f"{SUPABASE_URL}/storage/v1/object/public/{SUPABASE_BUCKET}/"
+    MEDIA_URL = f"{SUPABASE_CDN_URL or SUPABASE_URL}/storage/v1/object/public/{SUPABASE_BUCKET}/"
 else:
     # Fallback to local storage if Supabase not configured
     MEDIA_URL = '/media/'
@@ -19,7 +19,7 @@ from core.views import (
     CategoryViewSet, ProjectViewSet, NewsArticleViewSet,
     CollaborationViewSet, SiteSettingsViewSet, HeroSlideViewSet,
     WorkCategoryViewSet, WorkViewSet, TeamMemberViewSet,
-    AboutSectionViewSet, SloganSectionViewSet
+    AboutSectionViewSet, SloganSectionViewSet, HomeView
 )
 
 # API Schema for documentation
@@ -53,6 +53,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     
     # API
+    path('api/home/', HomeView.as_view(), name='home'),
     path('api/', include(router.urls)),
     
     # JWT Authentication
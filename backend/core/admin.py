@@ -13,8 +13,7 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     
     def project_count(self, obj):
-        count = obj.projects.count()
-        return format_html('<strong>{}</strong>', count)
+        return format_html('<strong>{}</strong>', obj.project_count)
     project_count.short_description = 'Projects'
 
 
@@ -153,8 +152,7 @@ class WorkCategoryAdmin(admin.ModelAdmin):
     )
     
     def works_count(self, obj):
-        count = obj.works.count()
-        return format_html('<strong>{}</strong>', count)
+        return format_html('<strong>{}</strong>', obj.works_count)
     works_count.short_description = 'Works'
 
 
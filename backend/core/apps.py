@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import repair_sqlite_search_triggers
+        post_migrate.connect(repair_sqlite_search_triggers, sender=self)
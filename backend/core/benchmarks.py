@@ -0,0 +1,528 @@
+"""
+API benchmarks
+Scenarios run by `python manage.py benchmark` against a throwaway,
+seeded test database. Each scenario returns rows of timing results.
+"""
+
+import statistics
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .counters import recount
+from .models import (
+    Category, Project, NewsArticle, Collaboration, HeroSlide,
+    WorkCategory, Work, TeamMember
+)
+from .related import rebuild_related_works
+
+
+SCENARIOS = {}
+
+# Spread distinct words through seeded text so searches are selective
+VOCABULARY = [
+    'timber', 'brick', 'pavilion', 'courtyard', 'omweso', 'kinsman', 'ceramic',
+    'lagoon', 'terrace', 'lattice', 'archive', 'vernacular', 'canopy', 'market',
+]
+
+
+def scenario(name):
+    """Register a benchmark scenario under `name`"""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def seed_content(projects=2000, works=1000, articles=1000, collaborations=2000):
+    """Bulk-insert a realistic volume of content for benchmarks and tests"""
+    now = timezone.now()
+    author = User.objects.create_user('author', first_name='Nate', last_name='Author')
+
+    categories = Category.objects.bulk_create([
+        Category(name=f'Category {i}', slug=f'category-{i}', description='Seeded category')
+        for i in range(8)
+    ])
+    work_categories = WorkCategory.objects.bulk_create([
+        WorkCategory(name=name, display_name=label, image=f'categories/{name}.jpg',
+                     description=f'{label} works', display_order=i)
+        for i, (name, label) in enumerate(WorkCategory.CATEGORY_CHOICES)
+    ])
+    project_types = [key for key, _ in Project.PROJECT_TYPES]
+
+    Project.objects.bulk_create([
+        Project(
+            title=f'Project {i}', slug=f'project-{i}',
+            description=f'Summary of project {i}',
+            full_content=f'Process notes for project {i} on {VOCABULARY[i % len(VOCABULARY)]}. ' * 20,
+            project_type=project_types[i % len(project_types)],
+            category=categories[i % len(categories)],
+            featured_image=f'projects/featured/project-{i}.jpg',
+            image_1=f'projects/gallery/project-{i}-1.jpg',
+            featured=i % 50 == 0, display_order=i % 10,
+        )
+        for i in range(projects)
+    ], batch_size=500)
+    Work.objects.bulk_create([
+        Work(
+            title=f'Work {i}', slug=f'work-{i}',
+            category=work_categories[i % len(work_categories)],
+            featured_image=f'works/work-{i}.jpg',
+            description=f'Description of work {i}',
+            full_content=f'Details of work {i}. ' * 10,
+            is_featured=i % 40 == 0, display_order=i % 10,
+        )
+        for i in range(works)
+    ], batch_size=500)
+    NewsArticle.objects.bulk_create([
+        NewsArticle(
+            title=f'Article {i}', slug=f'article-{i}',
+            excerpt=f'Excerpt of article {i}',
+            content=f'Body of article {i} about {VOCABULARY[i % len(VOCABULARY)]}. ' * 40,
+            featured_image=f'news/article-{i}.jpg',
+            author=author, published=i % 5 != 0,
+            publish_date=now - timedelta(hours=i),
+        )
+        for i in range(articles)
+    ], batch_size=500)
+    Collaboration.objects.bulk_create([
+        Collaboration(
+            name=f'Visitor {i}', email=f'visitor{i}@example.com',
+            project_type='design', message='I would love to collaborate on a project.',
+            reviewed=i % 3 == 0,
+        )
+        for i in range(collaborations)
+    ], batch_size=500)
+    HeroSlide.objects.bulk_create([
+        HeroSlide(image=f'hero/slide-{i}.jpg', caption=f'Slide {i}', display_order=i)
+        for i in range(5)
+    ])
+    TeamMember.objects.bulk_create([
+        TeamMember(name=f'Member {i}', role='Designer', bio='Bio', image=f'team/member-{i}.jpg',
+                   display_order=i)
+        for i in range(6)
+    ])
+    # bulk_create skips the signals that maintain counters and related works
+    recount()
+    rebuild_related_works()
+    cache.clear()
+
+
+def measure(label, func, iterations, before=None):
+    """Time `func` over `iterations` runs and count the queries it issues"""
+    timings = []
+    cpu = []
+    queries = []
+    payload = 0
+    for _ in range(iterations):
+        if before is not None:
+            before()
+        with CaptureQueriesContext(connection) as ctx:
+            start, start_cpu = time.perf_counter(), time.process_time()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+            cpu.append((time.process_time() - start_cpu) * 1000)
+        queries.append(len(ctx.captured_queries))
+        payload = len(getattr(result, 'content', b''))
+    timings.sort()
+    return {
+        'case': label,
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'cpu_ms': statistics.median(cpu),
+        'queries': statistics.mean(queries),
+        'bytes': payload,
+    }
+
+
+def _get(client, path, **extra):
+    response = client.get(path, **extra)
+    assert response.status_code == 200, f'{path} returned {response.status_code}'
+    return response
+
+
+@scenario('home')
+def bench_home(iterations):
+    """Homepage waterfall vs. the aggregated, cached /api/home/ endpoint"""
+    from .homepage import invalidate_home_payload
+
+    client = Client()
+    waterfall = [
+        '/api/hero-slides/', '/api/slogan/current/', '/api/works/featured/',
+        '/api/projects/featured/', '/api/news/latest/', '/api/settings/current/',
+    ]
+
+    def legacy():
+        for path in waterfall:
+            _get(client, path)
+
+    return [
+        measure('legacy waterfall (6 requests)', legacy, iterations, before=cache.clear),
+        measure('/api/home/ cold', lambda: _get(client, '/api/home/'), iterations,
+                before=invalidate_home_payload),
+        measure('/api/home/ warm', lambda: _get(client, '/api/home/'), iterations),
+    ]
+
+
+@scenario('search')
+def bench_search(iterations):
+    """icontains SearchFilter (?search=) vs. ranked full-text search (?q=)"""
+    client = Client()
+    rows = []
+    for path in ('/api/projects/', '/api/news/'):
+        for term in ('lagoon', 'vernacular canopy'):
+            rows.append(measure(f'{path}?search={term}', lambda: _get(client, path, data={'search': term}),
+                                iterations, before=cache.clear))
+            rows.append(measure(f'{path}?q={term}', lambda: _get(client, path, data={'q': term}),
+                                iterations, before=cache.clear))
+    return rows
+
+
+@scenario('pagination')
+def bench_pagination(iterations):
+    """Page-number (COUNT + OFFSET) vs. keyset ?cursor= pagination, first and deep pages"""
+    from .pagination import KeysetPagination
+
+    client = Client()
+    rows = []
+    for path, model in (('/api/projects/', Project), ('/api/news/', NewsArticle)):
+        queryset = model.objects.filter(published=True) if model is NewsArticle else model.objects.all()
+        total = queryset.count()
+        last_page = (total - 1) // KeysetPagination.page_size + 1
+        # Cursor pointing just before the last page, as if walked there via `next`
+        keyset = KeysetPagination()
+        keyset.fields = keyset.get_ordering(queryset)
+        keyset.base_url = f'http://testserver{path}?cursor='
+        deep_cursor = keyset.encode_cursor(
+            queryset.order_by(*keyset.order_expressions())[(last_page - 1) * keyset.page_size - 1], reverse=False
+        )
+        rows.extend([
+            measure(f'{path}?page=1', lambda: _get(client, path, data={'page': 1}), iterations,
+                    before=cache.clear),
+            measure(f'{path}?page={last_page}', lambda: _get(client, path, data={'page': last_page}), iterations,
+                    before=cache.clear),
+            measure(f'{path}?cursor= (first)', lambda: _get(client, path, data={'cursor': ''}), iterations,
+                    before=cache.clear),
+            measure(f'{path}?cursor=<page {last_page}>', lambda: _get(client, deep_cursor), iterations,
+                    before=cache.clear),
+        ])
+    return rows
+
+
+@scenario('related')
+def bench_related(iterations):
+    """Work detail: related works queried per request vs. the precomputed index"""
+    from unittest import mock
+
+    from .serializers import WorkDetailSerializer, WorkListSerializer
+
+    def legacy_related_works(serializer, obj):
+        # The pre-index implementation: a fresh ordered, sliced query per request
+        return WorkListSerializer(obj.category.works.exclude(id=obj.id)[:6], many=True).data
+
+    client = Client()
+    path = f'/api/works/{Work.objects.order_by("pk").first().slug}/'
+    with mock.patch.object(WorkDetailSerializer, 'get_related_works', legacy_related_works):
+        before = measure(f'{path} per-request query', lambda: _get(client, path), iterations,
+                         before=cache.clear)
+    return [
+        before,
+        measure(f'{path} precomputed', lambda: _get(client, path), iterations, before=cache.clear),
+    ]
+
+
+@scenario('fields')
+def bench_fields(iterations):
+    """Full representations vs. ?fields= sparse fieldsets (payload size and CPU)"""
+    client = Client()
+    project = Project.objects.order_by('pk').first().slug
+    work = Work.objects.order_by('pk').first().slug
+    cases = [
+        ('/api/projects/', 'id,title,slug,featured_image'),
+        (f'/api/projects/{project}/', 'title,featured_image'),
+        ('/api/works/', 'id,title,slug,featured_image'),
+        (f'/api/works/{work}/', 'title,featured_image'),
+        ('/api/news/', 'title,slug,publish_date'),
+    ]
+    rows = []
+    for path, fields in cases:
+        rows.append(measure(path, lambda: _get(client, path), iterations, before=cache.clear))
+        rows.append(measure(f'{path}?fields={fields}', lambda: _get(client, path, data={'fields': fields}),
+                            iterations, before=cache.clear))
+    return rows
+
+
+@scenario('rendering')
+def bench_rendering(iterations):
+    """100-row list pages: instances + json vs. .values() projection + orjson"""
+    from contextlib import ExitStack
+    from unittest import mock
+
+    from rest_framework.renderers import JSONRenderer
+
+    from . import renderers
+    from .pagination import OptInCursorPagination
+    from .projection import ValuesProjectionMixin
+
+    client = Client()
+    cases = [
+        ('instances, json', True, False),
+        ('instances, orjson', True, True),
+        ('values, json', False, False),
+        ('values, orjson', False, True),
+    ]
+    rows = []
+    with mock.patch.object(OptInCursorPagination, 'page_size', 100):
+        for path in ('/api/projects/', '/api/works/', '/api/news/'):
+            for label, instances, fast_json in cases:
+                with ExitStack() as stack:
+                    if instances:
+                        stack.enter_context(mock.patch.object(ValuesProjectionMixin, 'get_values_plan',
+                                                              return_value=None))
+                    if not fast_json:
+                        stack.enter_context(mock.patch.object(renderers, 'orjson', None))
+                    rows.append(measure(f'{path} {label}', lambda: _get(client, path), iterations,
+                                        before=cache.clear))
+        # Encoding alone, on a decoded 100-row page
+        data = _get(client, '/api/projects/').json()
+    for label, renderer in (('JSONRenderer', JSONRenderer()), ('FastJSONRenderer', renderers.FastJSONRenderer())):
+        rows.append(measure(f'encode page: {label}', lambda: SimpleNamespace(content=renderer.render(data)),
+                            iterations))
+    return rows
+
+
+@scenario('media_urls')
+def bench_media_urls(iterations):
+    """500 public media URLs (100 rows x 5 images): client get_public_url() vs. string builder"""
+    import os
+    from unittest import mock
+
+    from supabase import create_client
+
+    from utils.supabase_storage import SupabaseStorage
+
+    names = [f'projects/gallery/project-{i}-{n}.jpg' for i in range(100) for n in range(5)]
+    with mock.patch.dict(os.environ, {'SUPABASE_URL': 'https://example.supabase.co',
+                                      'SUPABASE_KEY': 'benchmark-key'}):
+        storage = SupabaseStorage()
+    bucket = create_client(storage.supabase_url, storage.supabase_key).storage.from_(storage.bucket_name)
+
+    def legacy():
+        for name in names:
+            bucket.get_public_url(name)
+
+    def local():
+        for name in names:
+            storage.url(name)
+
+    return [
+        measure('client get_public_url()', legacy, iterations),
+        measure('SupabaseStorage.url()', local, iterations),
+    ]
+
+
+@scenario('storage_client')
+def bench_storage_client(iterations):
+    """Supabase client: cold start and per-upload latency, full SDK per storage vs. shared pooled client"""
+    import os
+    import subprocess
+    import sys
+    from unittest import mock
+
+    from supabase import create_client
+
+    from utils.supabase_client import close_clients
+    from utils.supabase_storage import SupabaseStorage
+
+    from utils.fake_storage import FakeStorageServer
+
+    cold_start = {
+        'cold start: supabase.create_client': (
+            'from supabase import create_client; create_client("http://127.0.0.1:9", "key").storage.from_("b")'
+        ),
+        'cold start: shared storage client': (
+            'from utils.supabase_client import get_storage_client; get_storage_client("http://127.0.0.1:9", "key")'
+        ),
+    }
+    rows = []
+    for label, code in cold_start.items():
+        # Interpreter startup included in both; the difference is the import and construction
+        rows.append(measure(label, lambda: subprocess.run([sys.executable, '-c', code], check=True),
+                            min(iterations, 10)))
+
+    payload = b'x' * 64 * 1024
+    counter = iter(range(10 ** 9))
+    with FakeStorageServer() as server, mock.patch.dict(os.environ, {
+        'SUPABASE_URL': server.url, 'SUPABASE_KEY': 'benchmark-key', 'SUPABASE_BUCKET': server.bucket,
+    }):
+        def legacy():
+            # What every SupabaseStorage() used to do before uploading
+            bucket = create_client(server.url, 'benchmark-key').storage.from_(server.bucket)
+            bucket.upload(f'bench/legacy-{next(counter)}.bin', payload)
+
+        def shared():
+            SupabaseStorage().bucket.upload(f'bench/shared-{next(counter)}.bin', payload)
+
+        rows.append(measure('64 KiB upload: new SDK client', legacy, iterations))
+        rows.append(measure('64 KiB upload: shared pooled client', shared, iterations))
+        close_clients()
+    return rows
+
+
+@scenario('image_variants')
+def bench_image_variants(iterations):
+    """A 1920x1080 hero photo: bytes sent as the original vs. 640w variants, and the cost of processing it"""
+    import tempfile
+    from io import BytesIO
+
+    from django.core.files.storage import FileSystemStorage
+    from django.db.models.fields.files import ImageFieldFile
+    from PIL import Image, ImageFilter
+
+    from . import images
+
+    # Photo-like content: smooth gradients plus sensor-style noise
+    photo = Image.merge('RGB', [
+        Image.linear_gradient('L').resize((1920, 1080)),
+        Image.radial_gradient('L').resize((1920, 1080)),
+        Image.effect_noise((1920, 1080), 40).filter(ImageFilter.GaussianBlur(1)),
+    ])
+    original = BytesIO()
+    photo.save(original, 'JPEG', quality=90)
+    rows = [measure('original 1920w JPEG', lambda: SimpleNamespace(content=original.getvalue()), iterations)]
+
+    small = photo.resize((640, 360), Image.LANCZOS, reducing_gap=3.0)
+    for fmt in images.available_formats():
+        encoder, _, options = images.VARIANT_FORMATS[fmt]
+
+        def encode():
+            buffer = BytesIO()
+            small.save(buffer, encoder, **options)
+            return SimpleNamespace(content=buffer.getvalue())
+
+        rows.append(measure(f'640w {fmt} (encode)', encode, min(iterations, 10)))
+
+    def describe_full():
+        # Size, colour and placeholder from a full decode, as without draft mode
+        image = Image.open(BytesIO(original.getvalue()))
+        image.load()
+        return SimpleNamespace(content=images.summarize(image, *image.size)['placeholder'].encode())
+
+    rows.append(measure('image info: full decode', describe_full, iterations))
+    rows.append(measure('image info: draft decode (upload path)', lambda: SimpleNamespace(
+        content=images.describe_upload(BytesIO(original.getvalue()))['placeholder'].encode()
+    ), iterations))
+
+    with tempfile.TemporaryDirectory() as root:
+        storage = FileSystemStorage(location=root)
+        name = storage.save('hero/photo.jpg', BytesIO(original.getvalue()))
+        field_file = ImageFieldFile(None, SimpleNamespace(storage=storage, name='image'), name)
+        rows.append(measure('render all variants (background job)', lambda: images.render_variants(field_file),
+                            min(iterations, 3)))
+    return rows
+
+
+@scenario('storage')
+def bench_storage(iterations):
+    """SupabaseStorage against the in-process fake with 10 ms latency and 50 MB/s, so runs repeat offline"""
+    import os
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest import mock
+
+    import httpx
+    from django.core.files.base import ContentFile
+    from django.db import transaction
+    from django.test import override_settings
+
+    from utils import supabase_client
+    from utils.fake_storage import FakeStorageServer
+    from utils.supabase_client import close_clients
+    from utils.supabase_storage import SupabaseStorage
+
+    small, large = b's' * 64 * 1024, b'l' * 8 * 1024 * 1024
+    counter = iter(range(10 ** 9))
+    rows = []
+    with tempfile.TemporaryDirectory() as root, \
+            FakeStorageServer(latency=0.01, bandwidth=50 * 1024 * 1024, keep_bodies=False) as server, \
+            mock.patch.dict(os.environ, {
+                'SUPABASE_URL': server.url, 'SUPABASE_KEY': 'benchmark-key', 'SUPABASE_BUCKET': server.bucket,
+            }), \
+            override_settings(MEDIA_CACHE_DIR=root, MEDIA_DELETIONS_IN_BACKGROUND=False):
+        storage = SupabaseStorage()
+        with override_settings(MEDIA_CACHE_DIR=''):
+            uncached = SupabaseStorage()
+        session = storage.client.session
+
+        def save(data, prefix='bench'):
+            return storage.save(f'{prefix}/{next(counter)}.bin', ContentFile(data))
+
+        rows.append(measure('save 64 KiB', lambda: save(small), iterations))
+        rows.append(measure('save 8 MiB (resumable)', lambda: save(large), min(iterations, 5)))
+
+        def upload(name):
+            supabase_client.upload(session, storage.storage_url, storage.bucket_name, name,
+                                   ContentFile(small), len(small), 'application/octet-stream')
+
+        def upload_batch(workers):
+            names = [f'batch/{next(counter)}.bin' for _ in range(16)]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(upload, names))
+
+        rows.append(measure('16 x 64 KiB uploads, 1 thread', lambda: upload_batch(1), min(iterations, 10)))
+        rows.append(measure('16 x 64 KiB uploads, 8 threads', lambda: upload_batch(8), min(iterations, 10)))
+
+        # Downloads need bodies
+        server.keep_bodies = True
+        name = save(small * 16)
+
+        def read(backend):
+            with backend.open(name) as file:
+                return SimpleNamespace(content=file.read())
+
+        rows.append(measure('open 1 MiB: no cache', lambda: read(uncached), iterations))
+        read(storage)
+        rows.append(measure('open 1 MiB: disk cache (304)', lambda: read(storage), iterations))
+        rows.append(measure('GET 1 MiB public URL', lambda: httpx.get(storage.url(name)), iterations))
+
+        server.store('unindexed/object.bin', 'application/octet-stream', small)
+        rows.append(measure('exists(): index', lambda: storage.exists(name), iterations))
+        rows.append(measure('exists(): HEAD', lambda: storage.exists('unindexed/object.bin'), iterations))
+
+        for i in range(500):
+            server.store(f'listing/{i}.bin', 'application/octet-stream', b'')
+        rows.append(measure('list_objects(): 500 objects', lambda: list(storage.list_objects('listing')),
+                            iterations))
+
+        doomed = []
+
+        def save_four():
+            doomed[:] = [save(b'x', 'removed') for _ in range(4)]
+
+        def remove_each():
+            for name in doomed:
+                storage.bucket.remove([name])
+
+        def delete_in_transaction():
+            # As in an admin save: queued during the request, one batch at commit
+            with transaction.atomic():
+                for name in doomed:
+                    storage.delete(name)
+
+        rows.append(measure('delete 4: remove() each', remove_each, min(iterations, 20), before=save_four))
+        rows.append(measure('delete 4: queued, one batch at commit', delete_in_transaction, min(iterations, 20),
+                            before=save_four))
+
+        # Seeded, so the same requests fail on every run; retries back off
+        server.random.seed(1)
+        server.failure_rate = 0.1
+        rows.append(measure('open 1 MiB: no cache, 10% 503s', lambda: read(uncached), iterations))
+        close_clients()
+    return rows
@@ -0,0 +1,78 @@
+"""
+Cache helpers for the core app
+Per-model version stamps shared through Django's cache framework, and a
+process-local cache for singleton rows validated against those stamps.
+"""
+
+import copy
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(model):
+    return f'core:version:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """Return the current version stamp for `model`"""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a stamp lost to eviction never repeats an old value
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_model_version(model):
+    """
+    Advance the version stamp for `model`
+    Bumped immediately and again on commit, so a reader that raced the
+    write and cached pre-commit data under the new stamp is invalidated too.
+    """
+    _bump(model)
+    transaction.on_commit(lambda: _bump(model))
+
+
+class SingletonCache:
+    """
+    Keeps one instance per singleton model in worker memory
+    Each read checks the model's shared version stamp; a mismatch means
+    another worker saved the row and the copy is reloaded.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def get(self, model):
+        version = get_model_version(model)
+        cached = self._instances.get(model)
+        if cached is None or cached[0] != version:
+            obj, created = model.objects.get_or_create(pk=1)
+            if created:
+                # Creating the row bumped the stamp itself
+                version = get_model_version(model)
+            with self._lock:
+                self._instances[model] = (version, obj)
+            cached = (version, obj)
+        # Hand out a copy so callers can't mutate the shared instance
+        return copy.copy(cached[1])
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+
+singletons = SingletonCache()
@@ -0,0 +1,120 @@
+"""
+Response compression for the API
+`/api/` responses are compressed with Brotli (when the `brotli` package is
+installed) or gzip, whichever the client prefers in Accept-Encoding.
+Compressed bodies are kept in the cache framework next to the response
+cache, keyed by a hash of the uncompressed body, so a hot endpoint is
+compressed once per distinct payload rather than once per request. The
+body hash is used instead of the ETag because one ETag covers every
+rendering of a resource (JSON, indented JSON, the browsable API).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+
+API_PREFIX = '/api/'
+
+# Below this, headers and framing outweigh the savings (same as GZipMiddleware)
+MIN_LENGTH = 200
+
+# Middle-of-the-range levels: bodies are cached, but cold misses still pay
+BROTLI_QUALITY = 5
+
+
+def _brotli(content):
+    return brotli.compress(content, quality=BROTLI_QUALITY)
+
+
+def available_encodings():
+    """Supported codings, most preferred first"""
+    encodings = {'gzip': compress_string}
+    if brotli is not None:
+        encodings = {'br': _brotli, **encodings}
+    return encodings
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header"""
+    weights = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(header, encodings=None):
+    """The best supported coding the client accepts, or None"""
+    encodings = available_encodings() if encodings is None else encodings
+    weights = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in encodings:
+        q = weights.get(coding, weights.get('*', 0.0))
+        # Ties keep the server's preference order
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compressed_body(content, coding):
+    """`content` compressed with `coding`, from the cache when it has been seen before"""
+    key = f'core:compressed:{coding}:{hashlib.md5(content).hexdigest()}'
+    body = cache.get(key)
+    if body is None:
+        body = available_encodings()[coding](content)
+        cache.set(key, body, timeout=settings.API_RESPONSE_CACHE_TIMEOUT)
+    return body
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip / Brotli for API responses
+    Streaming, short and already-encoded responses pass through untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(API_PREFIX):
+            return response
+        if response.streaming or response.has_header('Content-Encoding') or len(response.content) < MIN_LENGTH:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        body = compressed_body(response.content, coding)
+        if len(body) >= len(response.content):
+            return response
+        response.content = body
+        response.headers['Content-Length'] = str(len(body))
+        response.headers['Content-Encoding'] = coding
+        # The bytes differ from the identity encoding, so a strong ETag would lie
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,112 @@
+"""
+Conditional GET support for the read API
+Validators (ETag / Last-Modified) come from `updated_at`: the row itself for
+detail views, max(updated_at) plus row count for collections. A matching
+If-None-Match or If-Modified-Since short-circuits to 304 before any
+serializer runs. Last-Modified is only sent for a single row with no
+dependencies: a collection's max(updated_at) stays put when an older row
+is deleted, so there only the ETag (which includes the count) is safe.
+Keyset (`?cursor=`) pages skip the aggregate and its COUNT: their ETag
+comes from the version stamps, which every write bumps.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_model_version
+
+
+def aggregate_validators(queryset):
+    """Return (last_modified, count) for a queryset in a single query"""
+    result = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    return result['last_modified'], result['count']
+
+
+def make_etag(*parts):
+    """Hash validator parts into an opaque, quoted ETag"""
+    seed = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(seed.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified to list, retrieve and GET actions
+    `conditional_dependencies` lists other models whose rows the serializers
+    render (nested categories, counts, related works, authors); their
+    table-wide max(updated_at) and count, or version stamp for models
+    without `updated_at`, are folded into every validator.
+    """
+    conditional_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        build = lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        cursor_query_param = getattr(self.paginator, 'cursor_query_param', None)
+        if cursor_query_param and cursor_query_param in request.query_params:
+            return self.versioned_response(request, queryset.model, build)
+        return self.conditional_response(request, queryset, build)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(
+            request, queryset, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            allow_empty=False
+        )
+
+    def conditional_response(self, request, source, build, allow_empty=True):
+        """
+        Answer with 304 if the client's validators still match `source`,
+        otherwise call `build()` and attach fresh validators to its response.
+        `source` is a queryset or a single model instance.
+        """
+        if hasattr(source, 'aggregate'):
+            last_modified, count = aggregate_validators(source)
+        else:
+            last_modified, count = source.updated_at, 1
+        if not count and not allow_empty:
+            # Missing object: let the view raise its 404
+            return build()
+
+        etag = make_etag(*self._validator_seed(request), count, last_modified)
+        single = not allow_empty or not hasattr(source, 'aggregate')
+        if single and not self.conditional_dependencies and last_modified:
+            timestamp = int(last_modified.timestamp())
+        else:
+            timestamp = None
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def versioned_response(self, request, model, build):
+        """
+        Like conditional_response(), validated by `model`'s and the
+        dependencies' version stamps alone; no query is run for them
+        """
+        etag = make_etag(*self._validator_seed(request, versions_only=True), get_model_version(model))
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = build()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+    def _validator_seed(self, request, versions_only=False):
+        seed = [request.get_full_path(), request.user.is_staff]
+        for model in self.conditional_dependencies:
+            if not versions_only and any(field.name == 'updated_at' for field in model._meta.get_fields()):
+                last_modified, count = aggregate_validators(model.objects.all())
+                seed.extend([model._meta.label, count, last_modified])
+            else:
+                seed.extend([model._meta.label, get_model_version(model)])
+        return seed
@@ -0,0 +1,114 @@
+"""
+Denormalized category counters
+Category.project_count, WorkCategory.works_count and
+WorkCategory.unfeatured_works_count are adjusted in place with F()
+expressions whenever a project or work is created, deleted, moved to
+another category or (for works) featured, so listings never COUNT.
+Writes that bypass signals (bulk_create, queryset.update) can drift;
+`recount()` and `manage.py recount_categories` repair that.
+"""
+
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import Category, Project, WorkCategory, Work
+
+
+# model -> fields whose old values decide which counters to move
+TRACKED_FIELDS = {
+    Project: ('category_id',),
+    Work: ('category_id', 'is_featured'),
+}
+
+
+def _loaded_state(instance):
+    """Tracked values as loaded, or None if any were deferred"""
+    fields = TRACKED_FIELDS[type(instance)]
+    if any(field not in instance.__dict__ for field in fields):
+        return None
+    return tuple(instance.__dict__[field] for field in fields)
+
+
+def _stored_state(instance):
+    fields = TRACKED_FIELDS[type(instance)]
+    return type(instance)._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def _adjust(model, pk, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if pk is None or not deltas:
+        return
+    # Clamp at zero: a drifted counter must not break the write that exposed it
+    model.objects.filter(pk=pk).update(**{
+        field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()
+    })
+
+
+def _apply(model, state, sign):
+    """Add (sign=1) or remove (sign=-1) one row in `state` from its category's counters"""
+    if state is None:
+        return
+    if model is Project:
+        _adjust(Category, state[0], project_count=sign)
+    else:
+        category_id, is_featured = state
+        _adjust(WorkCategory, category_id, works_count=sign,
+                unfeatured_works_count=0 if is_featured else sign)
+
+
+def remember_state(sender, instance, **kwargs):
+    """post_init: note the values this row was counted under"""
+    instance._counted_state = _loaded_state(instance)
+
+
+def capture_previous_state(sender, instance, raw=False, **kwargs):
+    """pre_save: fall back to the database when tracked fields were deferred"""
+    if raw or instance._state.adding or getattr(instance, '_counted_state', None) is not None:
+        return
+    instance._counted_state = _stored_state(instance)
+
+
+def count_saved(sender, instance, created, raw=False, **kwargs):
+    """post_save: move counters from the old category/flags to the new ones"""
+    if raw:
+        return
+    old = None if created else getattr(instance, '_counted_state', None)
+    new = _loaded_state(instance)
+    if old != new:
+        _apply(sender, old, -1)
+        _apply(sender, new, 1)
+    instance._counted_state = new
+
+
+def count_deleted(sender, instance, **kwargs):
+    """post_delete: release the row from the counters it was last counted in"""
+    state = getattr(instance, '_counted_state', None) or _loaded_state(instance)
+    _apply(sender, state, -1)
+
+
+def recount(apply=True):
+    """
+    Compare every stored counter with a fresh COUNT
+    Returns [(instance, field, stored, actual), ...] for counters that
+    drifted, and corrects them unless `apply` is False.
+    """
+    expected = [
+        (Category.objects.annotate(actual_projects=Count('projects')),
+         {'project_count': 'actual_projects'}),
+        (WorkCategory.objects.annotate(
+            actual_works=Count('works'),
+            actual_unfeatured=Count('works', filter=Q(works__is_featured=False)),
+         ), {'works_count': 'actual_works', 'unfeatured_works_count': 'actual_unfeatured'}),
+    ]
+    drift = []
+    for queryset, fields in expected:
+        for obj in queryset.order_by('pk'):
+            changes = {}
+            for field, actual_attr in fields.items():
+                stored, actual = getattr(obj, field), getattr(obj, actual_attr)
+                if stored != actual:
+                    drift.append((obj, field, stored, actual))
+                    changes[field] = actual
+            if changes and apply:
+                queryset.model.objects.filter(pk=obj.pk).update(**changes)
+    return drift
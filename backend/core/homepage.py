@@ -0,0 +1,73 @@
+"""
+Aggregated homepage payload
+Bundles everything the homepage renders into a single cached document
+"""
+
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .conditional import make_etag
+
+from .models import HeroSlide, Project, NewsArticle, SiteSettings, Work, SloganSection
+from .serializers import (
+    HeroSlideSerializer, SloganSectionSerializer, WorkListSerializer,
+    ProjectListSerializer, NewsArticleListSerializer, SiteSettingsSerializer
+)
+
+
+HOME_CACHE_KEY = 'core:home'
+LATEST_NEWS_COUNT = 3
+
+
+def build_home_payload(request):
+    """
+    Build the homepage payload from the database
+    Mirrors the hero-slides, slogan/current, works/featured,
+    projects/featured, news/latest and settings/current endpoints,
+    including their absolute media URLs for `request`'s host.
+    """
+    hero_slides = HeroSlide.objects.filter(is_active=True)
+    featured_works = Work.objects.filter(is_featured=True).select_related('category')
+    featured_projects = Project.objects.filter(featured=True).select_related('category')
+    latest_news = NewsArticle.objects.filter(published=True).select_related('author')[:LATEST_NEWS_COUNT]
+    context = {'request': request}
+
+    return {
+        'hero_slides': HeroSlideSerializer(hero_slides, many=True, context=context).data,
+        'slogan': SloganSectionSerializer(SloganSection.load(), context=context).data,
+        'featured_works': WorkListSerializer(featured_works, many=True, context=context).data,
+        'featured_projects': ProjectListSerializer(featured_projects, many=True, context=context).data,
+        'latest_news': NewsArticleListSerializer(latest_news, many=True, context=context).data,
+        'settings': SiteSettingsSerializer(SiteSettings.load(), context=context).data,
+    }
+
+
+def get_home_payload(request):
+    """
+    Return the cached homepage payload for `request`'s scheme and host as
+    {'etag': ..., 'data': ...}, building it on a miss
+    Every origin's payload lives under the one key, so a single delete
+    invalidates them all.
+    """
+    origin = request.build_absolute_uri('/')
+    payloads = cache.get(HOME_CACHE_KEY) or {}
+    home = payloads.get(origin)
+    if home is None:
+        data = build_home_payload(request)
+        etag = make_etag(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder))
+        home = {'etag': etag, 'data': data}
+        # No timeout: the payload lives until a feeding model changes
+        cache.set(HOME_CACHE_KEY, {**payloads, origin: home}, timeout=None)
+    return home
+
+
+def invalidate_home_payload():
+    """
+    Drop the cached payload so the next request rebuilds it
+    Repeated on commit so a rebuild that raced the write can't stick.
+    """
+    cache.delete(HOME_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(HOME_CACHE_KEY))
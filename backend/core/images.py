@@ -0,0 +1,382 @@
+"""
+Responsive image derivatives and metadata
+Every image field listed in IMAGE_FIELDS gets:
+
+- resized copies at the VARIANT_WIDTHS narrower than the original (plus one
+  at its own width, capped at the widest), in each VARIANT_FORMATS encoding
+  Pillow supports, named in the model's `image_variants` JSON column:
+
+    {'featured_image': {'source': 'projects/featured/a.jpg',
+                        'formats': {'webp': {'320': 'projects/featured/a.320w.webp', ...}, ...}}}
+
+- its size, dominant colour and a tiny base64 placeholder in `image_info`:
+
+    {'featured_image': {'source': 'projects/featured/a.jpg', 'width': 1920, 'height': 1080,
+                        'color': '#8a6f4e', 'placeholder': 'data:image/webp;base64,...'}}
+
+Info for a fresh upload is read from the uploaded bytes during the save
+(JPEGs decode at reduced scale, so this stays cheap). Variants, and info for
+files assigned by name, are rendered after the saving transaction commits on
+a small thread pool, so uploads never wait for encoders. Serializers expose
+both (serializers.ImageVariantsField, ImageInfoField). Replacing or clearing
+an image drops its entries in the same request, so stale data is never
+served. `manage.py backfill_images` fills in existing media.
+"""
+
+import logging
+import os
+import posixpath
+import threading
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, models, transaction
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps, features
+
+from .cache import bump_model_version
+from .homepage import invalidate_home_payload
+from .models import Project, NewsArticle, HeroSlide, WorkCategory, Work, TeamMember, AboutSection
+
+
+logger = logging.getLogger(__name__)
+
+# model -> image fields that get variants and info
+IMAGE_FIELDS = {
+    Project: ('featured_image', 'image_1', 'image_2', 'image_3', 'image_4'),
+    Work: ('featured_image', 'image_1', 'image_2', 'image_3', 'image_4'),
+    NewsArticle: ('featured_image',),
+    HeroSlide: ('image',),
+    WorkCategory: ('image',),
+    TeamMember: ('image',),
+    AboutSection: ('team_image',),
+}
+
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+
+# Preferred first; formats this Pillow build can't encode are skipped
+VARIANT_FORMATS = {
+    'avif': ('AVIF', 'avif', {'quality': 50}),
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Longest side of the inlined placeholder, and of the sample the colour is taken from
+PLACEHOLDER_SIZE = 16
+COLOR_SAMPLE_SIZE = 64
+
+WORKERS = 2
+
+_executor = None
+_pid = None
+_lock = threading.Lock()
+
+
+def available_formats():
+    return [fmt for fmt in VARIANT_FORMATS if fmt == 'jpeg' or features.check(fmt)]
+
+
+def variant_widths(width):
+    """Target widths for an image `width` pixels wide, narrowest first"""
+    widths = [target for target in VARIANT_WIDTHS if target < width]
+    return list(dict.fromkeys([*widths, min(width, VARIANT_WIDTHS[-1])]))
+
+
+def variant_name(source, width, extension):
+    root, _ = posixpath.splitext(source)
+    return f'{root}.{width}w.{extension}'
+
+
+def _normalize(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    return image
+
+
+def load_image(field_file):
+    """The stored image, decoded upright"""
+    with field_file.open('rb') as source:
+        image = Image.open(source)
+        image.load()
+    return _normalize(image)
+
+
+def summarize(image, width, height):
+    """Info entry (without 'source') for an upright `image` whose full size is `width` x `height`"""
+    sample = image.convert('RGB')
+    sample.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+    quantized = sample.quantize(colors=5)
+    _, index = max(quantized.getcolors())
+    color = '#{:02x}{:02x}{:02x}'.format(*quantized.getpalette()[index * 3:index * 3 + 3])
+
+    sample.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = BytesIO()
+    if features.check('webp'):
+        sample.save(buffer, 'WEBP', quality=40)
+        mime = 'image/webp'
+    else:
+        sample.save(buffer, 'JPEG', quality=40)
+        mime = 'image/jpeg'
+    placeholder = f'data:{mime};base64,{b64encode(buffer.getvalue()).decode()}'
+    return {'width': width, 'height': height, 'color': color, 'placeholder': placeholder}
+
+
+def describe_upload(fileobj):
+    """Info entry (without 'source') for an image file, decoding no more of it than needed"""
+    fileobj.seek(0)
+    try:
+        image = Image.open(fileobj)
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation, 1) > 4:
+            # Orientations 5-8 turn the image a quarter
+            width, height = height, width
+        # JPEGs can decode at 1/2, 1/4 or 1/8 scale; the sample needs no more
+        image.draft('RGB', (COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+        image.load()
+        return summarize(_normalize(image), width, height)
+    finally:
+        fileobj.seek(0)
+
+
+def render_variants(field_file, image=None):
+    """Encode and store every variant of `field_file`; returns its `image_variants` entry"""
+    storage = field_file.storage
+    if image is None:
+        image = load_image(field_file)
+
+    widths = variant_widths(image.width)
+    formats = {fmt: dict.fromkeys(str(width) for width in widths) for fmt in available_formats()}
+    # Widest first, each step resized from the last, so later steps are cheap
+    resized = image
+    for width in reversed(widths):
+        height = max(1, round(image.height * width / image.width))
+        resized = resized.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt, variants in formats.items():
+            encoder, extension, options = VARIANT_FORMATS[fmt]
+            frame = resized.convert('RGB') if encoder == 'JPEG' and resized.mode != 'RGB' else resized
+            buffer = BytesIO()
+            frame.save(buffer, encoder, **options)
+            content = ContentFile(buffer.getvalue())
+            content.content_type = f'image/{fmt}'
+            variants[str(width)] = storage.save(variant_name(field_file.name, width, extension), content)
+    return {'source': field_file.name, 'formats': formats}
+
+
+def variant_names(entry):
+    return [name for variants in entry.get('formats', {}).values() for name in variants.values()]
+
+
+def _image_columns():
+    """(model, ImageField names) for every core model with image fields"""
+    for model in apps.get_app_config('core').get_models():
+        fields = [field.name for field in model._meta.get_fields() if isinstance(field, models.ImageField)]
+        if fields:
+            yield model, fields
+
+
+def referenced_files():
+    """Every file named by an ImageField in core, and the variants rendered from it"""
+    names = set()
+    for model, fields in _image_columns():
+        columns = fields + (['image_variants'] if model in IMAGE_FIELDS else [])
+        for row in model._base_manager.values(*columns).iterator():
+            names.update(row[field] for field in fields if row[field])
+            for entry in (row.get('image_variants') or {}).values():
+                names.update(variant_names(entry))
+    return names
+
+
+def image_directories():
+    """Top-level storage directories ImageFields in core upload into"""
+    directories = set()
+    for model, fields in _image_columns():
+        for field in fields:
+            upload_to = model._meta.get_field(field).upload_to
+            if isinstance(upload_to, str) and upload_to.strip('/'):
+                directories.add(upload_to.strip('/').split('/')[0])
+    return sorted(directories)
+
+
+def image_storage(model):
+    """The storage behind `model`'s image fields (they all share one)"""
+    return model._meta.get_field(IMAGE_FIELDS[model][0]).storage
+
+
+def delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception('Could not delete image variant %s', name)
+
+
+def _current(entry, name):
+    return bool(entry) and entry.get('source') == name
+
+
+def render_images(instance, fields=None, force=False):
+    """
+    Render `instance`'s missing (or, with `force`, all) variants and info
+    Returns ({field: variants entry}, {field: info entry}). Writes no rows
+    itself, so rows can be rendered in parallel, but storage backends may
+    query (SupabaseStorage keeps an object index): worker threads close
+    their connection afterwards.
+    """
+    rendered, described = {}, {}
+    for field in fields or IMAGE_FIELDS[type(instance)]:
+        field_file = getattr(instance, field)
+        if not field_file:
+            continue
+        needs_variants = force or not _current(instance.image_variants.get(field), field_file.name)
+        needs_info = force or not _current(instance.image_info.get(field), field_file.name)
+        if not (needs_variants or needs_info):
+            continue
+        try:
+            image = load_image(field_file)
+            if needs_info:
+                described[field] = {'source': field_file.name, **summarize(image, image.width, image.height)}
+            if needs_variants:
+                rendered[field] = render_variants(field_file, image)
+        except Exception:
+            logger.exception('Could not process image %s', field_file.name)
+    return rendered, described
+
+
+def store_images(model, pk, rendered, described):
+    """
+    Save entries from render_images() for images the row still points at
+    Returns the names of the fields that changed.
+    """
+    updated, kept, replaced = set(), set(), []
+    with transaction.atomic():
+        current = model._base_manager.select_for_update().filter(pk=pk).values(
+            'image_variants', 'image_info', *rendered, *described
+        ).first()
+        if current is not None:
+            variants = dict(current['image_variants'] or {})
+            info = dict(current['image_info'] or {})
+            # Images replaced while these were rendered keep their own (pending) entries
+            for field, entry in rendered.items():
+                if current[field] == entry['source']:
+                    if variants.get(field):
+                        replaced.extend(variant_names(variants[field]))
+                    variants[field] = entry
+                    kept.update(variant_names(entry))
+                    updated.add(field)
+            for field, entry in described.items():
+                if current[field] == entry['source']:
+                    info[field] = entry
+                    updated.add(field)
+            if updated:
+                # update() skips auto_now; the ETag and Last-Modified follow updated_at
+                model._base_manager.filter(pk=pk).update(
+                    image_variants=variants, image_info=info, updated_at=timezone.now()
+                )
+                bump_model_version(model)
+                invalidate_home_payload()
+    unused = [name for entry in rendered.values() for name in variant_names(entry) if name not in kept]
+    delete_files(image_storage(model), unused + replaced)
+    return [field for field in IMAGE_FIELDS[model] if field in updated]
+
+
+def process_images(model, pk, fields=None, force=False):
+    """Render and store one row's missing variants and info; returns the fields that changed"""
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        return []
+    rendered, described = render_images(instance, fields, force)
+    if not (rendered or described):
+        return []
+    return store_images(model, pk, rendered, described)
+
+
+def _run(func, *args):
+    try:
+        return func(*args)
+    except Exception:
+        logger.exception('Image job failed')
+    finally:
+        # Each pool thread opens its own connection; don't leave it idle between jobs
+        connection.close()
+
+
+def submit(func, *args):
+    """Run `func(*args)` on the image pool (inline when IMAGE_VARIANTS_IN_BACKGROUND is off)"""
+    global _executor, _pid
+    if not settings.IMAGE_VARIANTS_IN_BACKGROUND:
+        func(*args)
+        return None
+    with _lock:
+        if _executor is None or _pid != os.getpid():
+            # Forked workers don't inherit the parent's pool threads
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='image-variants')
+            _pid = os.getpid()
+        return _executor.submit(_run, func, *args)
+
+
+def capture_stored_images(sender, instance, raw=False, **kwargs):
+    """
+    pre_save: describe fresh uploads from their bytes, and read the stored
+    entries; a background job may have updated them since this instance loaded
+    """
+    if raw:
+        return
+    instance._fresh_info = {}
+    for field in IMAGE_FIELDS[sender]:
+        field_file = getattr(instance, field)
+        if field_file and not field_file._committed:
+            try:
+                instance._fresh_info[field] = describe_upload(field_file.file)
+            except Exception:
+                logger.exception('Could not read uploaded image %s', field_file.name)
+    if instance._state.adding:
+        instance._stored_images = None
+        return
+    instance._stored_images = sender._base_manager.filter(pk=instance.pk).values(
+        'image_variants', 'image_info'
+    ).first()
+
+
+def schedule_for_saved(sender, instance, created, raw=False, **kwargs):
+    """post_save: drop entries of replaced images now, render what's missing after commit"""
+    if raw:
+        return
+    stored = getattr(instance, '_stored_images', None) or {}
+    fresh = getattr(instance, '_fresh_info', None) or {}
+    variants = dict(stored.get('image_variants') or {})
+    info = dict(stored.get('image_info') or {})
+    changed, stale = [], []
+    for field in IMAGE_FIELDS[sender]:
+        name = getattr(instance, field).name or ''
+        if variants.get(field) and not _current(variants[field], name):
+            stale.extend(variant_names(variants.pop(field)))
+        if field in fresh and name:
+            info[field] = {'source': name, **fresh[field]}
+        elif info.get(field) and not _current(info[field], name):
+            del info[field]
+        if name and not (variants.get(field) and info.get(field)):
+            changed.append(field)
+    if variants != instance.image_variants or info != instance.image_info:
+        instance.updated_at = timezone.now()
+        sender._base_manager.filter(pk=instance.pk).update(
+            image_variants=variants, image_info=info, updated_at=instance.updated_at
+        )
+        instance.image_variants, instance.image_info = variants, info
+    if stale:
+        storage = image_storage(sender)
+        transaction.on_commit(lambda: submit(delete_files, storage, stale))
+    if changed:
+        transaction.on_commit(lambda: submit(process_images, sender, instance.pk, changed))
+
+
+def delete_for_deleted(sender, instance, **kwargs):
+    """post_delete: django-cleanup removes the originals; remove their variants too"""
+    names = [name for entry in (instance.image_variants or {}).values() for name in variant_names(entry)]
+    if names:
+        storage = image_storage(sender)
+        transaction.on_commit(lambda: submit(delete_files, storage, names))
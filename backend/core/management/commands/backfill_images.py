@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.images import IMAGE_FIELDS, render_images, store_images
+
+
+class Command(BaseCommand):
+    help = 'Render missing responsive variants and image info (size, colour, placeholder) for existing media'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help=f"Models to backfill (default: all). Available: {', '.join(m._meta.model_name for m in IMAGE_FIELDS)}"
+        )
+        parser.add_argument('--force', action='store_true', help='Re-render images that are already processed')
+        parser.add_argument('--workers', type=int, default=4, help='Images decoded and encoded in parallel')
+
+    def handle(self, *args, **options):
+        by_name = {model._meta.model_name: model for model in IMAGE_FIELDS}
+        names = options['models'] or list(by_name)
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(unknown)}")
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        def render(instance):
+            try:
+                return instance, render_images(instance, force=options['force'])
+            finally:
+                # Saving variants can query the storage index; don't leave each worker's connection open
+                connection.close()
+
+        total = 0
+        # Workers download, decode, encode and upload; rows are written from this thread
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for name in names:
+                instances = by_name[name]._base_manager.order_by('pk')
+                for instance, (rendered, described) in executor.map(render, instances):
+                    if not (rendered or described):
+                        continue
+                    fields = store_images(type(instance), instance.pk, rendered, described)
+                    if fields:
+                        total += len(fields)
+                        self.stdout.write(f"{instance._meta.verbose_name} {instance.pk}: {', '.join(fields)}")
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} image(s)'))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks import SCENARIOS, seed_content
+
+
+class Command(BaseCommand):
+    help = 'Benchmark API scenarios against a throwaway, seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*',
+            help=f"Scenarios to run (default: all). Available: {', '.join(sorted(SCENARIOS))}"
+        )
+        parser.add_argument('--iterations', type=int, default=50, help='Runs per case')
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or sorted(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}")
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write('Seeding benchmark data...')
+            seed_content()
+            for name in names:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}: {SCENARIOS[name].__doc__}'))
+                self.stdout.write(
+                    f"  {'case':<44} {'median ms':>10} {'p95 ms':>10} {'cpu ms':>8} {'queries':>8} {'bytes':>9}"
+                )
+                for row in SCENARIOS[name](options['iterations']):
+                    self.stdout.write(
+                        f"  {row['case']:<44} {row['median_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+                        f"{row['cpu_ms']:>8.2f} {row['queries']:>8.1f} {row['bytes']:>9}"
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
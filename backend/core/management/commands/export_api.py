@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.snapshot import SnapshotExporter
+
+
+class Command(BaseCommand):
+    help = 'Export every public read endpoint to a static JSON snapshot (incremental by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=settings.API_SNAPSHOT_ROOT,
+            help=f'Snapshot directory (default: {settings.API_SNAPSHOT_ROOT})'
+        )
+        parser.add_argument('--host', help='Host used for absolute URLs (default: first ALLOWED_HOSTS entry)')
+        parser.add_argument('--secure', action='store_true', help='Build https:// URLs')
+        parser.add_argument('--full', action='store_true', help='Re-render every endpoint, ignoring stored ETags')
+
+    def handle(self, *args, **options):
+        exporter = SnapshotExporter(
+            options['output'], host=options['host'], full=options['full'], secure=options['secure']
+        )
+        stats = exporter.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot v{exporter.version} in {exporter.root}: "
+            f"{stats['written']} written, {stats['unchanged']} unchanged, "
+            f"{stats['not_modified']} not modified, {stats['removed']} removed, {stats['skipped']} skipped"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import PendingDeletion
+from utils.supabase_storage import SupabaseStorage
+
+
+class Command(BaseCommand):
+    help = 'Remove queued media deletions from Supabase Storage now (run from cron to retry failed batches)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true', help='Retry failed deletions straight away instead of after their backoff'
+        )
+
+    def handle(self, *args, **options):
+        storage = SupabaseStorage()
+        if not storage.configured:
+            raise CommandError('SUPABASE_URL and SUPABASE_KEY must be set')
+        if options['all']:
+            PendingDeletion.objects.filter(attempts__gt=0).update(next_attempt_at=timezone.now())
+        removed, failed = storage.flush_deletions()
+        waiting = PendingDeletion.objects.count()
+        self.stdout.write(f'Removed {removed} file(s), {failed} failed, {waiting} still queued')
+        if failed:
+            raise CommandError(f'{failed} deletion(s) failed; they stay queued and will be retried')
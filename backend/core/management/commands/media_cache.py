@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.media_cache import MediaCache
+
+
+class Command(BaseCommand):
+    help = 'Report the hit rate and size of the local media cache shared by every worker on this host'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help='Remove every cached copy and reset the counters')
+
+    def handle(self, *args, **options):
+        if not settings.MEDIA_CACHE_DIR:
+            raise CommandError('MEDIA_CACHE_DIR is not set')
+        cache = MediaCache(settings.MEDIA_CACHE_DIR, settings.MEDIA_CACHE_MAX_SIZE)
+        if options['clear']:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS(f'Cleared {settings.MEDIA_CACHE_DIR}'))
+            return
+        stats = cache.stats()
+        rate = 'n/a' if stats['hit_rate'] is None else f"{stats['hit_rate']:.1%}"
+        self.stdout.write(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {rate}")
+        self.stdout.write(
+            f"Files: {stats['files']}  Size: {stats['size'] / 1024 / 1024:.1f} of "
+            f"{settings.MEDIA_CACHE_MAX_SIZE / 1024 / 1024:.0f} MiB"
+        )
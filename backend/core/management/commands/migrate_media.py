@@ -0,0 +1,148 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.images import referenced_files
+from core.models import StoredFile
+from utils import supabase_client
+from utils.supabase_storage import SupabaseStorage
+
+# Single-part uploads get the MD5 of their content as ETag; multipart ones don't
+MD5_ETAG = re.compile(r'[0-9a-f]{32}')
+
+
+class Mismatch(Exception):
+    pass
+
+
+def checksums(path):
+    """(size, md5, sha256) of a local file, read in chunks"""
+    md5, sha256, size = hashlib.md5(), hashlib.sha256(), 0
+    with open(path, 'rb') as file:
+        while chunk := file.read(supabase_client.CHUNK_SIZE):
+            md5.update(chunk)
+            sha256.update(chunk)
+            size += len(chunk)
+    return size, md5.hexdigest(), sha256.hexdigest()
+
+
+def load_journal(path):
+    """name -> entry for every upload a previous run verified"""
+    done = {}
+    try:
+        with open(path) as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run
+                    continue
+                done[entry['name']] = entry
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class Command(BaseCommand):
+    help = 'Upload every image referenced in the database from the local MEDIA_ROOT to Supabase Storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', default=getattr(settings, 'MEDIA_ROOT', '') or os.path.join(settings.BASE_DIR, 'media'),
+            help='Local media directory (default: MEDIA_ROOT, or backend/media)'
+        )
+        parser.add_argument(
+            '--journal', default=os.path.join(settings.BASE_DIR, 'media_migration.jsonl'),
+            help='Progress journal; files it lists are not uploaded again'
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Files uploaded in parallel')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+        self.storage = SupabaseStorage()
+        if not self.storage.configured:
+            raise CommandError('SUPABASE_URL and SUPABASE_KEY must be set')
+        self.source = options['source']
+        done = load_journal(options['journal'])
+        names = sorted(referenced_files())
+
+        counts = {'uploaded': 0, 'present': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+        # Workers read, hash, upload and verify; the journal and index are written from this thread
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor, \
+                open(options['journal'], 'a') as journal:
+            futures = {executor.submit(self.migrate, name, done.get(name)): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    outcome, entry = future.result()
+                except Exception as e:
+                    counts['failed'] += 1
+                    self.stderr.write(f'{name}: {e}')
+                    continue
+                counts[outcome] += 1
+                if outcome in ('uploaded', 'present'):
+                    journal.write(json.dumps(entry) + '\n')
+                    journal.flush()
+                    StoredFile.objects.update_or_create(
+                        name=name, defaults={'size': entry['size'], 'content_type': entry['content_type']}
+                    )
+                    self.stdout.write(f'{name}: {outcome}')
+                elif outcome == 'missing':
+                    self.stderr.write(f'{name}: not found under {self.source}')
+
+        self.stdout.write(', '.join(f'{count} {outcome}' for outcome, count in counts.items()))
+        if counts['failed']:
+            raise CommandError(f"{counts['failed']} file(s) failed; run again to retry them")
+        self.stdout.write(self.style.SUCCESS(f'Migrated {len(names) - counts["missing"]} file(s)'))
+
+    def migrate(self, name, previous):
+        """Upload one file unless the journal already has this content; returns (outcome, journal entry)"""
+        path = os.path.join(self.source, *name.split('/'))
+        try:
+            size, md5, sha256 = checksums(path)
+        except FileNotFoundError:
+            return 'missing', None
+        if previous and previous['sha256'] == sha256:
+            return 'skipped', None
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        entry = {'name': name, 'size': size, 'sha256': sha256, 'content_type': content_type}
+
+        session, storage_url, bucket = self.storage.client.session, self.storage.storage_url, self.storage.bucket_name
+        outcome = 'uploaded'
+        try:
+            with open(path, 'rb') as file:
+                supabase_client.upload(session, storage_url, bucket, name, file, size, content_type)
+        except Exception as e:
+            if not supabase_client.is_duplicate(e):
+                raise
+            # Uploaded by an earlier, interrupted run, or by someone else
+            outcome = 'present'
+        self.verify(name, md5, sha256)
+        return outcome, entry
+
+    def verify(self, name, md5, sha256):
+        """Check the stored object against the local checksums"""
+        session, storage_url, bucket = self.storage.client.session, self.storage.storage_url, self.storage.bucket_name
+        etag = supabase_client.object_etag(session, storage_url, bucket, name)
+        if etag is None:
+            raise Mismatch('missing from the bucket after upload')
+        etag = etag.strip('"').removeprefix('W/').strip('"')
+        if MD5_ETAG.fullmatch(etag):
+            if etag != md5:
+                raise Mismatch(f'stored copy differs (ETag {etag}, local MD5 {md5})')
+            return
+        # No content hash to compare against: read the stored copy back
+        stream, _, _ = supabase_client.download(session, storage_url, bucket, name)
+        digest = hashlib.sha256()
+        with stream:
+            while chunk := stream.read(supabase_client.CHUNK_SIZE):
+                digest.update(chunk)
+        if digest.hexdigest() != sha256:
+            raise Mismatch('stored copy differs from the local file')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored category counters and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        drift = recount(apply=not options['dry_run'])
+        for obj, field, stored, actual in drift:
+            self.stdout.write(f'{obj._meta.verbose_name} "{obj}": {field} {stored} -> {actual}')
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('All counters are accurate'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} counter(s) drifted; run without --dry-run to fix'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drift)} counter(s)'))
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.images import image_directories, referenced_files
+from core.models import PendingDeletion
+from utils.supabase_storage import SupabaseStorage
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconcile the media bucket with the database: queue objects no ImageField (or variant) '
+        'refers to for deletion, and report referenced files the bucket is missing'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age', type=float, default=24,
+            help='Only remove orphans older than this many hours, so uploads whose rows '
+                 'are still being saved are left alone (default: 24)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report without queueing anything')
+
+    def handle(self, *args, **options):
+        storage = SupabaseStorage()
+        if not storage.configured:
+            raise CommandError('SUPABASE_URL and SUPABASE_KEY must be set')
+        cutoff = timezone.now() - timedelta(hours=options['min_age'])
+        # Read before listing: anything referenced by the time the listing ends is newer than the cutoff
+        referenced = referenced_files()
+        queued = set(PendingDeletion.objects.values_list('name', flat=True))
+
+        stored, orphans = set(), []
+        for directory in image_directories():
+            for name, size, updated_at in storage.list_objects(directory):
+                stored.add(name)
+                if name in referenced or name in queued:
+                    continue
+                if updated_at is None or updated_at > cutoff:
+                    continue
+                orphans.append((name, size))
+
+        missing = sorted(name for name in referenced if name not in stored)
+        for name in missing:
+            self.stderr.write(f'Missing from the bucket: {name}')
+        for name, size in orphans:
+            self.stdout.write(f'Orphaned: {name} ({size} bytes)')
+
+        if options['dry_run']:
+            self.stdout.write(f'{len(orphans)} orphaned, {len(missing)} missing (dry run, nothing queued)')
+            return
+        storage.queue_deletions([name for name, _ in orphans])
+        removed, failed = storage.flush_deletions()
+        self.stdout.write(f'{len(orphans)} orphaned, {len(missing)} missing')
+        if failed:
+            raise CommandError(f'{failed} deletion(s) failed; they stay queued and will be retried')
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} file(s)'))
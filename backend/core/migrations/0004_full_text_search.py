@@ -0,0 +1,86 @@
+"""
+Full-text search indexes
+PostgreSQL: a generated, weighted tsvector column with a GIN index.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+Neither is a Django model field; core.search queries them with raw SQL.
+"""
+
+from django.db import migrations
+
+
+# table -> ((column, weight), ...); weights rank title hits above body hits
+SEARCH_TABLES = {
+    'core_project': (('title', 'A'), ('description', 'B'), ('full_content', 'C')),
+    'core_work': (('title', 'A'), ('description', 'B'), ('full_content', 'C')),
+    'core_newsarticle': (('title', 'A'), ('excerpt', 'B'), ('content', 'C')),
+}
+
+
+def _postgresql_forwards(schema_editor, table, columns):
+    vector = ' || '.join(
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+        f'GENERATED ALWAYS AS ({vector}) STORED'
+    )
+    schema_editor.execute(f'CREATE INDEX {table}_search_gin ON {table} USING GIN (search_vector)')
+
+
+def _sqlite_forwards(schema_editor, table, columns):
+    names = [column for column, _ in columns]
+    fts = f'{table}_fts'
+    cols = ', '.join(names)
+    new_values = ', '.join(f'new.{name}' for name in names)
+    old_values = ', '.join(f'old.{name}' for name in names)
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', "
+        f"content_rowid='id', tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END'
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END'
+    )
+    schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, columns in SEARCH_TABLES.items():
+        if vendor == 'postgresql':
+            _postgresql_forwards(schema_editor, table, columns)
+        elif vendor == 'sqlite':
+            _sqlite_forwards(schema_editor, table, columns)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_gin')
+            schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+        elif vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_change_tracking'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
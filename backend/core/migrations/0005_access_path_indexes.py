@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-18 05:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_full_text_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collaboration',
+            index=models.Index(fields=['-submitted_at', 'id'], name='collab_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collaboration',
+            index=models.Index(fields=['reviewed', '-submitted_at'], name='collab_review_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heroslide',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', '-created_at'], name='heroslide_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-publish_date', '-created_at', 'id'], name='news_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['display_order', '-created_at', 'id'], name='project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['project_type', 'display_order', '-created_at'], name='project_type_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['display_order', '-created_at'], name='project_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', 'name'], name='teammember_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(fields=['display_order', '-created_at', 'id'], name='work_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(fields=['category', 'display_order', '-created_at'], name='work_category_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['display_order', '-created_at'], name='work_featured_idx'),
+        ),
+    ]
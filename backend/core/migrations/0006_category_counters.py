@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 05:48
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    Project = apps.get_model('core', 'Project')
+    WorkCategory = apps.get_model('core', 'WorkCategory')
+    Work = apps.get_model('core', 'Work')
+
+    def count_of(queryset):
+        counts = queryset.order_by().values('category').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counts), 0)
+
+    Category.objects.update(project_count=count_of(Project.objects.filter(category=OuterRef('pk'))))
+    works = Work.objects.filter(category=OuterRef('pk'))
+    WorkCategory.objects.update(
+        works_count=count_of(works),
+        unfeatured_works_count=count_of(works.filter(is_featured=False)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workcategory',
+            name='unfeatured_works_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workcategory',
+            name='works_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
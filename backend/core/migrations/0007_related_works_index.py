@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 05:50
+
+from django.db import migrations, models
+
+RELATED_WORKS_COUNT = 6
+
+
+def populate_related_works(apps, schema_editor):
+    Work = apps.get_model('core', 'Work')
+    Through = Work.related_works.through
+    members = {}
+    for pk, category_id in Work.objects.order_by('display_order', '-created_at', 'pk').values_list('pk', 'category_id'):
+        members.setdefault(category_id, []).append(pk)
+    rows = []
+    for ordered in members.values():
+        head = ordered[:RELATED_WORKS_COUNT + 1]
+        for pk in ordered:
+            related = [other for other in head if other != pk][:RELATED_WORKS_COUNT]
+            rows.extend(Through(from_work_id=pk, to_work_id=other) for other in related)
+    Through.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_category_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='work',
+            name='related_works',
+            field=models.ManyToManyField(blank=True, editable=False, to='core.work'),
+        ),
+        migrations.RunPython(populate_related_works, migrations.RunPython.noop),
+    ]
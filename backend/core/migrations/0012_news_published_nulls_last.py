@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 06:48
+
+import core.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_pending_deletions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_published_idx',
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=core.models.NullsLastIndex(models.OrderBy(models.F('publish_date'), descending=True, nulls_last=True), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), condition=models.Q(('published', True)), name='news_published_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_news_published_nulls_last'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='newsarticle',
+            options={'ordering': [models.OrderBy(models.F('publish_date'), descending=True, nulls_last=True), '-created_at', 'id']},
+        ),
+    ]
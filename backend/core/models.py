@@ -1,14 +1,40 @@
 from django.db import models
+from django.db.models import F, OrderBy
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .cache import singletons
+
+
+class NullsLastIndex(models.Index):
+    """
+    Index with DESC NULLS LAST columns that also builds where NULLS LAST can't be
+    indexed (SQLite, MySQL); those already sort NULLs last when descending
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if not schema_editor.connection.features.order_by_nulls_first:
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = self.clone()
+        index.expressions = tuple(
+            OrderBy(expression.expression, descending=True)
+            if isinstance(expression, OrderBy) and expression.descending and expression.nulls_last
+            else expression
+            for expression in self.expressions
+        )
+        return models.Index.create_sql(index, model, schema_editor, using=using, **kwargs)
+
 
 class Category(models.Model):
     """Category model for organizing projects"""
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True, blank=True)
     description = models.TextField(blank=True)
+    # Maintained by core.counters; repair drift with `manage.py recount_categories`
+    project_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name_plural = "Categories"
@@ -46,6 +72,10 @@ class Project(models.Model):
     image_2 = models.ImageField(upload_to='projects/gallery/', blank=True, null=True)
     image_3 = models.ImageField(upload_to='projects/gallery/', blank=True, null=True)
     image_4 = models.ImageField(upload_to='projects/gallery/', blank=True, null=True)
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     
     video_url = models.URLField(blank=True, help_text="YouTube or Vimeo URL")
     
@@ -59,6 +89,13 @@ class Project(models.Model):
     
     class Meta:
         ordering = ['display_order', '-created_at']
+        indexes = [
+            # Default list ordering, with id for keyset pagination
+            models.Index(fields=['display_order', '-created_at', 'id'], name='project_order_idx'),
+            models.Index(fields=['project_type', 'display_order', '-created_at'], name='project_type_order_idx'),
+            models.Index(fields=['display_order', '-created_at'], name='project_featured_idx',
+                         condition=models.Q(featured=True)),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -86,6 +123,10 @@ class NewsArticle(models.Model):
     excerpt = models.TextField(help_text="Short preview text", max_length=300)
     content = models.TextField(help_text="Full article content")
     featured_image = models.ImageField(upload_to='news/', blank=True, null=True)
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='articles')
     
@@ -96,7 +137,13 @@ class NewsArticle(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-publish_date', '-created_at']
+        # NULLS LAST, as keyset pagination orders it (PostgreSQL puts NULLs first in DESC),
+        # so every listing walks news_published_idx
+        ordering = [F('publish_date').desc(nulls_last=True), '-created_at', 'id']
+        indexes = [
+            NullsLastIndex(F('publish_date').desc(nulls_last=True), F('created_at').desc(), F('id'),
+                           name='news_published_idx', condition=models.Q(published=True)),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -138,6 +185,11 @@ class Collaboration(models.Model):
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at', 'id'], name='collab_submitted_idx'),
+            # Admin review queue: unreviewed first, newest first
+            models.Index(fields=['reviewed', '-submitted_at'], name='collab_review_queue_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.project_type}"
@@ -146,13 +198,22 @@ class Collaboration(models.Model):
 class HeroSlide(models.Model):
     """Dynamic hero images for homepage"""
     image = models.ImageField(upload_to='hero/', help_text="Hero image (recommended: 1920x1080)")
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=200, help_text="Short description/caption")
     is_active = models.BooleanField(default=True)
     display_order = models.IntegerField(default=0, help_text="Order of display (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['display_order', '-created_at']
+        indexes = [
+            models.Index(fields=['display_order', '-created_at'], name='heroslide_active_idx',
+                         condition=models.Q(is_active=True)),
+        ]
         verbose_name = "Hero Slide"
         verbose_name_plural = "Hero Slides"
     
@@ -174,9 +235,18 @@ class WorkCategory(models.Model):
     name = models.CharField(max_length=100, choices=CATEGORY_CHOICES, unique=True)
     display_name = models.CharField(max_length=100, help_text="Display name for the category")
     image = models.ImageField(upload_to='categories/', help_text="Category featured image")
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(help_text="Brief description of this category")
     is_active = models.BooleanField(default=True)
     display_order = models.IntegerField(default=0)
+    # Maintained by core.counters; the public listing counts non-featured works only
+    works_count = models.PositiveIntegerField(default=0, editable=False)
+    unfeatured_works_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['display_order', 'display_name']
@@ -201,15 +271,28 @@ class Work(models.Model):
     image_2 = models.ImageField(upload_to='works/gallery/', blank=True, null=True)
     image_3 = models.ImageField(upload_to='works/gallery/', blank=True, null=True)
     image_4 = models.ImageField(upload_to='works/gallery/', blank=True, null=True)
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     
     is_featured = models.BooleanField(default=False, help_text="Show in Featured Works section")
     display_order = models.IntegerField(default=0)
     
+    # Precomputed by core.related: the first few other works in the same category
+    related_works = models.ManyToManyField('self', symmetrical=False, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['display_order', '-created_at']
+        indexes = [
+            models.Index(fields=['display_order', '-created_at', 'id'], name='work_order_idx'),
+            models.Index(fields=['category', 'display_order', '-created_at'], name='work_category_order_idx'),
+            models.Index(fields=['display_order', '-created_at'], name='work_featured_idx',
+                         condition=models.Q(is_featured=True)),
+        ]
         verbose_name = "Work"
         verbose_name_plural = "Works"
     
@@ -238,6 +321,10 @@ class TeamMember(models.Model):
     role = models.CharField(max_length=100, help_text="Position/role in the team")
     bio = models.TextField(help_text="Member biography")
     image = models.ImageField(upload_to='team/', help_text="Member photo")
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
     
     # Social links (optional)
     email = models.EmailField(blank=True)
@@ -248,9 +335,14 @@ class TeamMember(models.Model):
     display_order = models.IntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['display_order', 'name']
+        indexes = [
+            models.Index(fields=['display_order', 'name'], name='teammember_active_idx',
+                         condition=models.Q(is_active=True)),
+        ]
         verbose_name = "Team Member"
         verbose_name_plural = "Team Members"
     
@@ -258,19 +350,11 @@ class TeamMember(models.Model):
         return f"{self.name} - {self.role}"
 
 
-class AboutSection(models.Model):
-    """About Us section content"""
-    title = models.CharField(max_length=200, default="About Us")
-    content = models.TextField(help_text="About us content (supports markdown)")
-    team_image = models.ImageField(upload_to='about/', blank=True, null=True, 
-                                    help_text="Group photo of the team")
-    team_caption = models.TextField(blank=True, help_text="Caption for team image")
-    
-    updated_at = models.DateTimeField(auto_now=True)
+class SingletonModel(models.Model):
+    """Base for single-row models, served from the per-worker singleton cache"""
     
     class Meta:
-        verbose_name = "About Section"
-        verbose_name_plural = "About Section"
+        abstract = True
     
     def save(self, *args, **kwargs):
         # Ensure only one instance exists
@@ -283,15 +367,33 @@ class AboutSection(models.Model):
     
     @classmethod
     def load(cls):
-        """Load the singleton instance"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+        """Load the singleton instance without touching the database when cached"""
+        return singletons.get(cls)
+
+
+class AboutSection(SingletonModel):
+    """About Us section content"""
+    title = models.CharField(max_length=200, default="About Us")
+    content = models.TextField(help_text="About us content (supports markdown)")
+    team_image = models.ImageField(upload_to='about/', blank=True, null=True, 
+                                    help_text="Group photo of the team")
+    # Resized copies of the images above, kept by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Size, dominant colour and placeholder of each image above, kept by core.images
+    image_info = models.JSONField(default=dict, blank=True, editable=False)
+    team_caption = models.TextField(blank=True, help_text="Caption for team image")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "About Section"
+        verbose_name_plural = "About Section"
     
     def __str__(self):
         return "About Section"
 
 
-class SloganSection(models.Model):
+class SloganSection(SingletonModel):
     """Slogan/Quote section for homepage"""
     text = models.TextField(default="…imagine the kind that has no limits, from which invisible ideas are turned into things people can touch, see, hear and feel…")
     is_active = models.BooleanField(default=True)
@@ -302,26 +404,11 @@ class SloganSection(models.Model):
         verbose_name = "Slogan Section"
         verbose_name_plural = "Slogan Section"
     
-    def save(self, *args, **kwargs):
-        # Ensure only one instance exists
-        self.pk = 1
-        super().save(*args, **kwargs)
-    
-    def delete(self, *args, **kwargs):
-        # Prevent deletion
-        pass
-    
-    @classmethod
-    def load(cls):
-        """Load the singleton instance"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
-    
     def __str__(self):
         return "Slogan Section"
 
 
-class SiteSettings(models.Model):
+class SiteSettings(SingletonModel):
     """Site-wide settings (singleton model)"""
     site_title = models.CharField(max_length=200, default="Atelier Spaces Nate")
     tagline = models.CharField(max_length=300, default="Research-led design studio")
@@ -348,20 +435,36 @@ class SiteSettings(models.Model):
         verbose_name = "Site Settings"
         verbose_name_plural = "Site Settings"
     
-    def save(self, *args, **kwargs):
-        # Ensure only one instance exists
-        self.pk = 1
-        super().save(*args, **kwargs)
+    def __str__(self):
+        return "Site Settings"
+
+
+class StoredFile(models.Model):
+    """Metadata index of objects in the media bucket, kept by utils.supabase_storage"""
+    name = models.CharField(max_length=1024, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
-    def delete(self, *args, **kwargs):
-        # Prevent deletion
-        pass
+    class Meta:
+        verbose_name = "Stored File"
+        verbose_name_plural = "Stored Files"
     
-    @classmethod
-    def load(cls):
-        """Load the singleton instance"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+    def __str__(self):
+        return self.name
+
+
+class PendingDeletion(models.Model):
+    """Object queued for removal from the media bucket, flushed in batches by utils.supabase_storage"""
+    name = models.CharField(max_length=1024, unique=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Pending Deletion"
+        verbose_name_plural = "Pending Deletions"
     
     def __str__(self):
-        return "Site Settings"
+        return self.name
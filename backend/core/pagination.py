@@ -0,0 +1,185 @@
+"""
+Pagination for the public API
+Page-number pagination stays the default. Passing `?cursor=` (empty for the
+first page) switches a list to keyset pagination over the queryset's full
+ordering, e.g. (display_order, -created_at, id) for projects: no COUNT(*)
+and no OFFSET, so deep pages cost the same as the first one.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Composite keyset pagination
+    The cursor carries the ordering values of the last row seen; the next
+    page is everything strictly after that tuple. NULLs always sort last.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+    reverse = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = self.get_ordering(queryset)
+        self.reverse, values = self.decode_cursor(request)
+
+        if values is not None:
+            queryset = queryset.filter(self.after(values))
+        queryset = queryset.order_by(*self.order_expressions())
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        # Arriving via a cursor means there is something on the other side
+        came_from_cursor = values is not None
+        self.has_next = has_more if not self.reverse else came_from_cursor
+        self.has_previous = came_from_cursor if not self.reverse else has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, queryset):
+        """[(field, descending), ...] from the queryset ordering, with pk as tiebreaker"""
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering)
+        fields = []
+        for item in ordering:
+            if isinstance(item, OrderBy) and isinstance(item.expression, F):
+                # e.g. F('publish_date').desc(nulls_last=True); NULLs go last regardless
+                item = f"{'-' if item.descending else ''}{item.expression.name}"
+            if not isinstance(item, str):
+                raise ValidationError({self.cursor_query_param: 'Cursor pagination is not available for this ordering.'})
+            name = item.lstrip('-')
+            name = model._meta.pk.name if name == 'pk' else name
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ValidationError({self.cursor_query_param: 'Cursor pagination is not available for this ordering.'})
+            fields.append((field, item.startswith('-')))
+        if not any(field.primary_key for field, _ in fields):
+            fields.append((model._meta.pk, False))
+        return fields
+
+    def order_expressions(self):
+        nulls = {'nulls_first': True} if self.reverse else {'nulls_last': True}
+        expressions = []
+        for field, descending in self.fields:
+            expression = F(field.name)
+            if not field.null:
+                # Plain ASC/DESC keeps the ordering index-compatible
+                expressions.append(expression.desc() if descending != self.reverse else expression.asc())
+                continue
+            if descending != self.reverse:
+                expressions.append(expression.desc(**nulls))
+            else:
+                expressions.append(expression.asc(**nulls))
+        return expressions
+
+    def after(self, values):
+        """Q for rows strictly after `values` in the current direction"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(self.fields, values):
+            condition |= equal & self.beyond(field, descending, value)
+            equal &= Q(**{f'{field.name}__isnull': True}) if value is None else Q(**{field.name: value})
+        return condition
+
+    def beyond(self, field, descending, value):
+        """Q for rows past `value` on a single field, NULLs last going forward"""
+        if not self.reverse:
+            if value is None:
+                return Q(pk__in=[])
+            strict = Q(**{f'{field.name}__{"lt" if descending else "gt"}': value})
+            return strict | Q(**{f'{field.name}__isnull': True}) if field.null else strict
+        if value is None:
+            return Q(**{f'{field.name}__isnull': False})
+        return Q(**{f'{field.name}__{"gt" if descending else "lt"}': value})
+
+    def encode_cursor(self, row, reverse):
+        if isinstance(row, dict):
+            # A `.values()` row (see core.projection), keyed by field name
+            row = SimpleNamespace(**{field.attname: row[field.name] for field, _ in self.fields})
+        values = [field.value_to_string(row) if getattr(row, field.attname) is not None else None
+                  for field, _ in self.fields]
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param, '')
+        if not token:
+            return False, None
+        try:
+            payload = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            raw_values = payload['v']
+            if len(raw_values) != len(self.fields):
+                raise ValueError
+            values = [None if raw is None else field.to_python(raw)
+                      for (field, _), raw in zip(self.fields, raw_values)]
+            return bool(payload.get('r')), values
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Empty page: restart from the first keyset page
+            return replace_query_param(self.base_url, self.cursor_query_param, '')
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """Page numbers by default; keyset pagination when `?cursor=` is present"""
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,142 @@
+"""
+Projection fast path for list endpoints
+List pages are read with `.values()` and represented straight from the row
+dicts, skipping model instantiation. Every field still goes through its
+serializer field's `to_representation`, and null relations are handled the
+way DRF's `get_attribute` handles them, so responses are identical to the
+instance path. Serializers whose fields can't all be read from columns
+(nested or expanded serializers, method fields) fall back to it.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import FileField
+from rest_framework import serializers
+from rest_framework.fields import SkipField, empty
+from rest_framework.response import Response
+
+
+class ValuesProjectionMixin:
+    """
+    Serializer side: represents `.values()` rows
+    `Meta.values_sources` maps fields whose source is a method to the columns
+    it reads and a function computing the value from them, e.g.
+    `{'author_name': (['author__first_name', 'author__last_name'], full_name)}`.
+    """
+
+    def get_values_plan(self):
+        """[(name, field, paths, compute, guard), ...], or None if some field needs an instance"""
+        model = self.Meta.model
+        declared = getattr(self.Meta, 'values_sources', {})
+        plan = []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in declared:
+                paths, compute = declared[name]
+                plan.append((name, field, list(paths), compute, _null_guard(model, paths[0])))
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.RelatedField,
+                                  serializers.ManyRelatedField, serializers.SerializerMethodField)):
+                return None
+            column = _column(model, field.source_attrs)
+            if column is None:
+                return None
+            path, model_field = column
+            compute = None
+            if isinstance(model_field, FileField):
+                compute = _file_wrapper(model_field)
+            plan.append((name, field, [path], compute, _null_guard(model, path)))
+        return plan
+
+    def get_values_paths(self, plan):
+        paths = []
+        for _, _, field_paths, _, guard in plan:
+            paths.extend(field_paths)
+            if guard:
+                paths.append(guard)
+        return list(dict.fromkeys(paths))
+
+    def to_representation_values(self, row, plan):
+        ret = {}
+        for name, field, paths, compute, guard in plan:
+            if guard and row[guard] is None:
+                # Mirrors Field.get_attribute on an AttributeError from a null relation
+                if field.default is not empty:
+                    try:
+                        value = field.get_default()
+                    except SkipField:
+                        continue
+                elif field.allow_null:
+                    value = None
+                else:
+                    continue
+            elif compute is not None:
+                value = compute(*(row[path] for path in paths))
+            else:
+                value = row[paths[0]]
+            ret[name] = None if value is None else field.to_representation(value)
+        return ret
+
+
+def _column(model, attrs):
+    """(values path, model field) for a chain of forward relations ending in a column, else None"""
+    parts = []
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        parts.append(field.name)
+        if not field.is_relation:
+            return '__'.join(parts), field
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return None
+        model = field.related_model
+    # The source ends on a relation: its representation needs the object
+    return None
+
+
+def _null_guard(model, path):
+    """The nullable foreign key on `path` whose id tells a null relation from a null column"""
+    parts = path.split('__')
+    for depth, part in enumerate(parts[:-1], start=1):
+        field = model._meta.get_field(part)
+        if field.null:
+            return '__'.join(parts[:depth])
+        model = field.related_model
+    return None
+
+
+def _file_wrapper(model_field):
+    # FieldFile gives the field's storage URL exactly as the instance attribute would
+    return lambda name: model_field.attr_class(None, model_field, name)
+
+
+class ValuesListMixin:
+    """
+    Viewset side: serves `list` from `.values()` rows when the serializer allows it
+    Ordering columns are always fetched so keyset cursors can be built.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        plan = serializer.get_values_plan() if hasattr(serializer, 'get_values_plan') else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        paths = [model._meta.pk.name, *serializer.get_values_paths(plan)]
+        for item in queryset.query.order_by or model._meta.ordering:
+            if isinstance(item, str):
+                try:
+                    paths.append(model._meta.get_field(item.lstrip('-')).name)
+                except FieldDoesNotExist:
+                    pass
+        rows = queryset.values(*dict.fromkeys(paths))
+
+        page = self.paginate_queryset(rows)
+        data = [serializer.to_representation_values(row, plan) for row in (rows if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,86 @@
+"""
+Precomputed related works
+Each work's `related_works` holds the first RELATED_WORKS_COUNT other works
+of its category in display order, so the detail page reads them with one
+primary-key join instead of scanning the category per request. Lists are
+rebuilt per category when a work joins, leaves or moves within one; only
+the rows that actually change are written.
+"""
+
+from .models import Work
+
+
+RELATED_WORKS_COUNT = 6
+
+# Display order with a tiebreaker, so rebuilds and reads agree
+RELATED_ORDERING = (*Work._meta.ordering, 'pk')
+
+
+def get_related_works(work):
+    """`work`'s precomputed related works, in display order"""
+    related = list(work.related_works.order_by(*RELATED_ORDERING))
+    for other in related:
+        # Same category by construction; share the loaded instance like a reverse FK would
+        if other.category_id == work.category_id:
+            other.category = work.category
+    return related
+
+
+def rebuild_related_works(category_ids=None):
+    """Recompute related works for every work in `category_ids` (default: all categories)"""
+    Through = Work.related_works.through
+    works = Work.objects.all()
+    if category_ids is not None:
+        works = works.filter(category_id__in=[pk for pk in category_ids if pk is not None])
+
+    members = {}
+    for pk, category_id in works.order_by(*RELATED_ORDERING).values_list('pk', 'category_id'):
+        members.setdefault(category_id, []).append(pk)
+
+    wanted = set()
+    for ordered in members.values():
+        # Every list comes from the category head: the first N, skipping the work itself
+        head = ordered[:RELATED_WORKS_COUNT + 1]
+        for pk in ordered:
+            related = [other for other in head if other != pk][:RELATED_WORKS_COUNT]
+            wanted.update((pk, other) for other in related)
+
+    existing = {
+        (src, dst): pk for pk, src, dst in
+        Through.objects.filter(from_work__in=works).values_list('pk', 'from_work_id', 'to_work_id')
+    }
+    stale = [pk for pair, pk in existing.items() if pair not in wanted]
+    if stale:
+        Through.objects.filter(pk__in=stale).delete()
+    missing = wanted - existing.keys()
+    if missing:
+        # A concurrent rebuild may have added some of these since we read them
+        Through.objects.bulk_create(
+            [Through(from_work_id=src, to_work_id=dst) for src, dst in missing], ignore_conflicts=True
+        )
+
+
+def capture_previous_position(sender, instance, raw=False, **kwargs):
+    """pre_save: remember where the work sat before this save"""
+    if raw or instance._state.adding:
+        instance._previous_position = None
+        return
+    instance._previous_position = Work._base_manager.filter(pk=instance.pk).values_list(
+        'category_id', 'display_order'
+    ).first()
+
+
+def update_for_saved_work(sender, instance, created, raw=False, **kwargs):
+    """post_save: rebuild the categories whose ordering this save could change"""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_position', None)
+    if not created and previous == (instance.category_id, instance.display_order):
+        # Edits that keep the position leave every list as it was
+        return
+    rebuild_related_works({instance.category_id, previous[0] if previous else None})
+
+
+def update_for_deleted_work(sender, instance, **kwargs):
+    """post_delete: the work's own rows cascade away; refill its category"""
+    rebuild_related_works({instance.category_id})
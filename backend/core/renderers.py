@@ -0,0 +1,42 @@
+"""
+Fast JSON rendering
+`FastJSONRenderer` encodes with orjson when it is installed and falls back
+to DRF's `JSONRenderer` when it isn't. The output is byte-for-byte what
+`JSONRenderer` produces with the default COMPACT_JSON / UNICODE_JSON
+settings: compact separators, raw UTF-8, \\u2028 / \\u2029 escaped, and
+dates, decimals, lazy strings and anything else orjson doesn't know
+encoded by DRF's own encoder. Indented output (`; indent=4`) and data
+orjson refuses (integers beyond 64 bits) also go through `JSONRenderer`.
+Floats are the one gap: orjson writes `1e16` where repr() writes `1e+16`
+and NaN as null where STRICT_JSON raises; no field in this API is a float.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer with a C-accelerated encoder for the common compact case"""
+
+    if orjson is not None:
+        options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safety escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,90 @@
+"""
+Shared response cache for the read API
+Anonymous GET responses are stored, fully rendered, in Django's cache
+framework. Keys combine the path, the normalized query string, the
+negotiated media type and the version stamp of every model the response
+renders; saving or deleting any of those rows bumps its stamp, so stale
+entries are simply never looked up again and age out on their own.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, urlencode
+
+from .cache import get_model_version
+
+
+def normalize_query(query_dict):
+    """Query string with keys and repeated values sorted, so ?a=1&b=2 == ?b=2&a=1"""
+    return urlencode(sorted((key, sorted(values)) for key, values in query_dict.lists()), doseq=True)
+
+
+class ResponseCacheMixin:
+    """
+    Serves repeat anonymous GETs from the shared cache
+    The model versions folded into the key are the viewset's own model plus
+    `conditional_dependencies` and `response_cache_dependencies` (models that
+    are rendered but have no `updated_at` to build validators from).
+    Authentication, permissions and throttling still run on every request.
+    """
+    response_cache_dependencies = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = self.get_response_cache_key(request)
+        if self.response_cache_key is None:
+            return
+        cached = cache.get(self.response_cache_key)
+        if cached is not None:
+            # Skip the handler entirely; finalize_response still runs
+            self.get = lambda *args, **kwargs: self.cached_response(request, cached)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if key is not None and response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(lambda rendered: self.store_response(key, rendered))
+        return response
+
+    def get_response_cache_key(self, request):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return None
+        models = [self.get_queryset_model(), *self.conditional_dependencies, *self.response_cache_dependencies]
+        versions = [f'{model._meta.label_lower}={get_model_version(model)}' for model in dict.fromkeys(models)]
+        # Media URLs and pagination links are absolute, so the host is part of the key
+        seed = '|'.join([
+            request._request.build_absolute_uri(request._request.path), normalize_query(request.query_params),
+            request.META.get('HTTP_ACCEPT', ''), *versions,
+        ])
+        return f'core:response:{hashlib.md5(seed.encode()).hexdigest()}'
+
+    def get_queryset_model(self):
+        queryset = self.queryset if self.queryset is not None else self.get_queryset()
+        return queryset.model
+
+    def store_response(self, key, response):
+        cache.set(key, {
+            'content': response.content,
+            'status': response.status_code,
+            'headers': dict(response.items()),
+        }, timeout=settings.API_RESPONSE_CACHE_TIMEOUT)
+
+    def cached_response(self, request, cached):
+        headers = cached['headers']
+        last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+        response = get_conditional_response(
+            request._request, etag=headers.get('ETag'), last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(cached['content'], status=cached['status'])
+            for header, value in headers.items():
+                response[header] = value
+        else:
+            for header in ('ETag', 'Last-Modified'):
+                if header in headers:
+                    response[header] = headers[header]
+        return response
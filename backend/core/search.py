@@ -0,0 +1,117 @@
+"""
+Full-text search for projects, works and news
+Uses the tsvector/GIN column on PostgreSQL and the FTS5 tables on SQLite
+(see migration 0004). Results are relevance-ranked: higher `search_rank`
+is a better match on both backends. Other databases fall back to
+icontains matching without ranking.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+
+# table -> ((column, weight), ...); mirrors migration 0004
+SEARCH_TABLES = {
+    'core_project': (('title', 'A'), ('description', 'B'), ('full_content', 'C')),
+    'core_work': (('title', 'A'), ('description', 'B'), ('full_content', 'C')),
+    'core_newsarticle': (('title', 'A'), ('excerpt', 'B'), ('content', 'C')),
+}
+
+# bm25 column weights matching the A/B/C tsvector weights
+SQLITE_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 1.0}
+
+
+def _sqlite_match_expression(query):
+    """Turn free text into a safe FTS5 query: every word, prefix-matched"""
+    terms = re.findall(r'\w+', query)
+    return ' AND '.join('"{}"*'.format(term) for term in terms)
+
+
+def search(queryset, query):
+    """Filter `queryset` to rows matching `query`, best matches first"""
+    table = queryset.model._meta.db_table
+    columns = SEARCH_TABLES[table]
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        matches = RawSQL(f'{table}.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        rank = RawSQL(f'ts_rank({table}.search_vector, {tsquery})', [query], output_field=FloatField())
+        return queryset.filter(matches).annotate(search_rank=rank).order_by('-search_rank', 'pk')
+
+    if vendor == 'sqlite':
+        expression = _sqlite_match_expression(query)
+        if not expression:
+            return queryset.none()
+        fts = f'{table}_fts'
+        weights = ', '.join(str(SQLITE_WEIGHTS[weight]) for _, weight in columns)
+        # Join the FTS table once so bm25 is computed in the same MATCH scan;
+        # bm25 is lower-is-better, negate it so both backends sort descending
+        return queryset.extra(
+            tables=[fts],
+            where=[f'{fts}.rowid = {table}.id', f'{fts} MATCH %s'],
+            params=[expression],
+            select={'search_rank': f'-bm25({fts}, {weights})'},
+        ).order_by('-search_rank', 'pk')
+
+    condition = Q()
+    for column, _ in columns:
+        condition |= Q(**{f'{column}__icontains': query})
+    return queryset.filter(condition)
+
+
+def _sqlite_trigger_statements(table, columns):
+    fts = f'{table}_fts'
+    names = [column for column, _ in columns]
+    cols = ', '.join(names)
+    new_values = ', '.join(f'new.{name}' for name in names)
+    old_values = ', '.join(f'old.{name}' for name in names)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});'
+    return [
+        f'DROP TRIGGER IF EXISTS {fts}_ai',
+        f'DROP TRIGGER IF EXISTS {fts}_ad',
+        f'DROP TRIGGER IF EXISTS {fts}_au',
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END',
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN {delete_old} {insert_new} END',
+    ]
+
+
+def repair_sqlite_search_triggers(using='default', **kwargs):
+    """
+    Reinstall FTS5 sync triggers after migrations
+    SQLite schema changes rebuild tables by copy-and-rename, which silently
+    drops their triggers; the index is rebuilt whenever that happened.
+    """
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        for table, columns in SEARCH_TABLES.items():
+            fts = f'{table}_fts'
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                [f'{fts}%']
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if fts not in existing or {f'{fts}_ai', f'{fts}_ad', f'{fts}_au'} <= existing:
+                continue
+            for statement in _sqlite_trigger_statements(table, columns):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Relevance-ranked full-text search via `?q=`"""
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search(queryset, query)
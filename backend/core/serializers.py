@@ -5,31 +5,79 @@ from .models import (
 )
 from django.contrib.auth.models import User
 
+from .projection import ValuesProjectionMixin
+from .related import get_related_works
+from .sparse import SparseFieldsMixin
 
-class CategorySerializer(serializers.ModelSerializer):
-    project_count = serializers.SerializerMethodField()
-    
+
+class ImageVariantsField(serializers.Field):
+    """
+    `image_variants` as srcset strings, per image field and format:
+    {'featured_image': {'avif': '<url> 320w, <url> 640w', 'webp': ..., 'jpeg': ...}}
+    Reads the column only, so list pages can serve it from `.values()` rows.
+    `images` limits the output to the image fields a serializer shows.
+    """
+
+    def __init__(self, images=None, **kwargs):
+        self.images = images
+        super().__init__(read_only=True, **kwargs)
+
+    def to_representation(self, value):
+        model = self.parent.Meta.model
+        ret = {}
+        for field, entry in value.items():
+            if self.images is not None and field not in self.images:
+                continue
+            storage = model._meta.get_field(field).storage
+            ret[field] = {
+                fmt: ', '.join(f'{storage.url(name)} {width}w' for width, name in variants.items())
+                for fmt, variants in entry['formats'].items()
+            }
+        return ret
+
+
+class ImageInfoField(serializers.Field):
+    """
+    `image_info` per image field: {'featured_image': {'width', 'height', 'color', 'placeholder'}}
+    Lets clients reserve layout space and paint a placeholder before any image loads.
+    """
+
+    def __init__(self, images=None, **kwargs):
+        self.images = images
+        super().__init__(read_only=True, **kwargs)
+
+    def to_representation(self, value):
+        return {
+            field: {key: item for key, item in entry.items() if key != 'source'}
+            for field, entry in value.items()
+            if self.images is None or field in self.images
+        }
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'project_count']
-    
-    def get_project_count(self, obj):
-        return obj.projects.count()
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(ValuesProjectionMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField(images=['featured_image'])
+    image_info = ImageInfoField(images=['featured_image'])
     category_name = serializers.CharField(source='category.name', read_only=True)
     
     class Meta:
         model = Project
         fields = [
             'id', 'title', 'slug', 'description', 'project_type',
-            'category_name', 'featured_image', 'featured', 
+            'category_name', 'featured_image', 'image_variants', 'image_info', 'featured',
             'display_order', 'created_at'
         ]
+        expandable_fields = {'category': (CategorySerializer, {'read_only': True})}
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(), source='category', write_only=True
@@ -41,37 +89,49 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'slug', 'description', 'full_content',
             'project_type', 'category', 'category_id', 'featured_image',
-            'image_1', 'image_2', 'image_3', 'image_4', 'gallery_images',
+            'image_1', 'image_2', 'image_3', 'image_4', 'gallery_images', 'image_variants', 'image_info',
             'video_url', 'featured', 'display_order', 'created_at', 'updated_at'
         ]
+        field_sources = {'gallery_images': ['image_1', 'image_2', 'image_3', 'image_4']}
     
     def get_gallery_images(self, obj):
         return obj.gallery_images
 
 
-class NewsArticleListSerializer(serializers.ModelSerializer):
+class NewsArticleListSerializer(ValuesProjectionMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField(images=['featured_image'])
+    image_info = ImageInfoField(images=['featured_image'])
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     
     class Meta:
         model = NewsArticle
         fields = [
-            'id', 'title', 'slug', 'excerpt', 'featured_image',
+            'id', 'title', 'slug', 'excerpt', 'featured_image', 'image_variants', 'image_info',
             'author_name', 'publish_date', 'created_at'
         ]
+        # Same as User.get_full_name(), for list pages read with .values()
+        values_sources = {
+            'author_name': (
+                ['author__first_name', 'author__last_name'],
+                lambda first_name, last_name: f'{first_name} {last_name}'.strip()
+            ),
+        }
 
 
-class NewsArticleDetailSerializer(serializers.ModelSerializer):
+class NewsArticleDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     author = serializers.StringRelatedField(read_only=True)
     
     class Meta:
         model = NewsArticle
         fields = [
-            'id', 'title', 'slug', 'excerpt', 'content', 'featured_image',
+            'id', 'title', 'slug', 'excerpt', 'content', 'featured_image', 'image_variants', 'image_info',
             'author', 'published', 'publish_date', 'created_at', 'updated_at'
         ]
 
 
-class CollaborationSerializer(serializers.ModelSerializer):
+class CollaborationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     
     class Meta:
         model = Collaboration
@@ -94,7 +154,7 @@ class CollaborationSerializer(serializers.ModelSerializer):
         return value
 
 
-class SiteSettingsSerializer(serializers.ModelSerializer):
+class SiteSettingsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     social_links = serializers.SerializerMethodField()
     
     class Meta:
@@ -105,6 +165,7 @@ class SiteSettingsSerializer(serializers.ModelSerializer):
             'linkedin_url', 'facebook_url', 'meta_description',
             'meta_keywords', 'social_links', 'updated_at'
         ]
+        field_sources = {'social_links': ['instagram_url', 'twitter_url', 'linkedin_url', 'facebook_url']}
     
     def get_social_links(self, obj):
         """Return dictionary of social media links"""
@@ -116,35 +177,42 @@ class SiteSettingsSerializer(serializers.ModelSerializer):
         }
 
 
-class HeroSlideSerializer(serializers.ModelSerializer):
+class HeroSlideSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     class Meta:
         model = HeroSlide
-        fields = ['id', 'image', 'caption', 'is_active', 'display_order', 'created_at']
+        fields = ['id', 'image', 'image_variants', 'image_info', 'caption', 'is_active',
+                  'display_order', 'created_at']
 
 
-class WorkCategorySerializer(serializers.ModelSerializer):
-    works_count = serializers.SerializerMethodField()
+class WorkCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
+    works_count = serializers.IntegerField(source='unfeatured_works_count', read_only=True)
     
     class Meta:
         model = WorkCategory
-        fields = ['id', 'name', 'display_name', 'image', 'description', 
+        fields = ['id', 'name', 'display_name', 'image', 'image_variants', 'image_info', 'description',
                   'is_active', 'display_order', 'works_count']
-    
-    def get_works_count(self, obj):
-        return obj.works.filter(is_featured=False).count()
 
 
-class WorkListSerializer(serializers.ModelSerializer):
+class WorkListSerializer(ValuesProjectionMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField(images=['featured_image'])
+    image_info = ImageInfoField(images=['featured_image'])
     category_name = serializers.CharField(source='category.display_name', read_only=True)
     category_slug = serializers.CharField(source='category.name', read_only=True)
     
     class Meta:
         model = Work
         fields = ['id', 'title', 'slug', 'category_name', 'category_slug',
-                  'featured_image', 'description', 'is_featured', 'created_at']
+                  'featured_image', 'image_variants', 'image_info', 'description', 'is_featured', 'created_at']
+        expandable_fields = {'category': (WorkCategorySerializer, {'read_only': True})}
 
 
-class WorkDetailSerializer(serializers.ModelSerializer):
+class WorkDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     category = WorkCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=WorkCategory.objects.all(), source='category', write_only=True
@@ -156,33 +224,41 @@ class WorkDetailSerializer(serializers.ModelSerializer):
         model = Work
         fields = ['id', 'title', 'slug', 'category', 'category_id', 
                   'featured_image', 'description', 'full_content',
-                  'image_1', 'image_2', 'image_3', 'image_4', 'gallery_images',
+                  'image_1', 'image_2', 'image_3', 'image_4', 'gallery_images', 'image_variants', 'image_info',
                   'is_featured', 'display_order', 'related_works',
                   'created_at', 'updated_at']
+        field_sources = {
+            'gallery_images': ['image_1', 'image_2', 'image_3', 'image_4'],
+            # Related works share the work's loaded category
+            'related_works': ['category'],
+        }
     
     def get_gallery_images(self, obj):
         return obj.gallery_images
     
     def get_related_works(self, obj):
-        # Get other works in the same category
-        related = obj.category.works.exclude(id=obj.id)[:6]
-        return WorkListSerializer(related, many=True).data
+        return WorkListSerializer(get_related_works(obj), many=True).data
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     class Meta:
         model = TeamMember
-        fields = ['id', 'name', 'role', 'bio', 'image', 'email', 
+        fields = ['id', 'name', 'role', 'bio', 'image', 'image_variants', 'image_info', 'email',
                   'linkedin_url', 'website_url', 'is_active', 'display_order']
 
 
-class AboutSectionSerializer(serializers.ModelSerializer):
+class AboutSectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+    image_info = ImageInfoField()
     class Meta:
         model = AboutSection
-        fields = ['id', 'title', 'content', 'team_image', 'team_caption', 'updated_at']
+        fields = ['id', 'title', 'content', 'team_image', 'image_variants', 'image_info',
+                  'team_caption', 'updated_at']
 
 
-class SloganSectionSerializer(serializers.ModelSerializer):
+class SloganSectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SloganSection
         fields = ['id', 'text', 'is_active', 'updated_at']
@@ -0,0 +1,84 @@
+"""
+Signal receivers for the core app
+Keep derived data (cached payloads, responses, singleton copies) in step with admin edits
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from . import counters, images, related
+from .cache import bump_model_version
+from .homepage import invalidate_home_payload
+from .models import (
+    Category, Project, NewsArticle, Collaboration, SiteSettings, HeroSlide,
+    WorkCategory, Work, TeamMember, AboutSection, SloganSection
+)
+
+
+# Models whose rows end up in the homepage payload
+HOME_PAYLOAD_MODELS = (
+    HeroSlide, SloganSection, Work, WorkCategory, Project, Category,
+    NewsArticle, SiteSettings,
+)
+
+
+def _invalidate_home(sender, **kwargs):
+    invalidate_home_payload()
+
+
+for model in HOME_PAYLOAD_MODELS:
+    post_save.connect(_invalidate_home, sender=model, dispatch_uid=f'home_payload_save_{model.__name__}')
+    post_delete.connect(_invalidate_home, sender=model, dispatch_uid=f'home_payload_delete_{model.__name__}')
+
+
+@receiver(post_save, sender=User, dispatch_uid='home_payload_save_User')
+def invalidate_home_on_author_change(sender, instance, update_fields=None, **kwargs):
+    """Article cards show the author's name; ignore last_login bumps on sign-in"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_home_payload()
+    bump_model_version(User)
+
+
+@receiver(post_delete, sender=User, dispatch_uid='model_version_delete_User')
+def bump_on_author_delete(sender, **kwargs):
+    bump_model_version(User)
+
+
+# Version stamps key the per-worker singleton copies and the API response
+# cache; bumping one invalidates every worker's entries for that model
+VERSIONED_MODELS = (
+    Category, Project, NewsArticle, Collaboration, SiteSettings, HeroSlide,
+    WorkCategory, Work, TeamMember, AboutSection, SloganSection,
+)
+
+
+def _bump_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(_bump_version, sender=model, dispatch_uid=f'model_version_save_{model.__name__}')
+    post_delete.connect(_bump_version, sender=model, dispatch_uid=f'model_version_delete_{model.__name__}')
+
+
+# Stored category counters follow every project/work write
+for model in counters.TRACKED_FIELDS:
+    post_init.connect(counters.remember_state, sender=model, dispatch_uid=f'counters_init_{model.__name__}')
+    pre_save.connect(counters.capture_previous_state, sender=model, dispatch_uid=f'counters_pre_save_{model.__name__}')
+    post_save.connect(counters.count_saved, sender=model, dispatch_uid=f'counters_save_{model.__name__}')
+    post_delete.connect(counters.count_deleted, sender=model, dispatch_uid=f'counters_delete_{model.__name__}')
+
+
+# Precomputed related-works lists follow changes to category membership and order
+pre_save.connect(related.capture_previous_position, sender=Work, dispatch_uid='related_works_pre_save')
+post_save.connect(related.update_for_saved_work, sender=Work, dispatch_uid='related_works_save')
+post_delete.connect(related.update_for_deleted_work, sender=Work, dispatch_uid='related_works_delete')
+
+
+# Responsive image variants and image info follow uploads, replacements and deletions
+for model in images.IMAGE_FIELDS:
+    pre_save.connect(images.capture_stored_images, sender=model, dispatch_uid=f'images_pre_save_{model.__name__}')
+    post_save.connect(images.schedule_for_saved, sender=model, dispatch_uid=f'images_save_{model.__name__}')
+    post_delete.connect(images.delete_for_deleted, sender=model, dispatch_uid=f'images_delete_{model.__name__}')
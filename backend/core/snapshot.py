@@ -0,0 +1,187 @@
+"""
+Static JSON snapshot of the public API
+Renders every anonymous GET endpoint on the router (every list page, every
+detail object and the parameterless actions such as `featured` and
+`current`) plus /api/home/ into `<root>/<url path>/index.json`, so a static
+host can answer reads without a Django worker. With WhiteNoise:
+
+    WHITENOISE_ROOT = API_SNAPSHOT_ROOT
+    WHITENOISE_INDEX_FILE = 'index.json'
+
+`manifest.json` records every file with its ETag, content hash and the
+snapshot version that last wrote it. Re-exports send the stored ETag as
+If-None-Match, so unchanged endpoints answer 304 and are skipped; files
+whose bytes did not change are not rewritten, and files for objects that
+disappeared are removed. Every write is atomic (temp file + rename).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.urls import router
+
+
+MANIFEST_NAME = 'manifest.json'
+FILE_NAME = 'index.json'
+
+
+def default_host():
+    """First concrete host in ALLOWED_HOSTS, used to build absolute media URLs"""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.strip()
+        if host and host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def atomic_write(path, content):
+    """Replace `path` with `content` without readers ever seeing a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class SnapshotExporter:
+    """
+    One export run over the public API
+    `full=True` ignores stored ETags and re-renders everything.
+    """
+
+    def __init__(self, root, host=None, full=False, secure=False):
+        self.root = Path(root)
+        self.host = host or default_host()
+        self.full = full
+        self.factory = RequestFactory(HTTP_HOST=self.host, HTTP_ACCEPT='application/json')
+        self.secure = secure
+        self.previous = self.load_manifest()
+        self.version = self.previous.get('version', 0) + 1
+        self.entries = {}
+        self.stats = {'rendered': 0, 'not_modified': 0, 'written': 0, 'unchanged': 0, 'removed': 0, 'skipped': 0}
+
+    def load_manifest(self):
+        try:
+            return json.loads((self.root / MANIFEST_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def run(self):
+        self.export('/api/home/')
+        for prefix, viewset, basename in router.registry:
+            self.export_viewset(viewset, basename)
+        self.remove_stale()
+        generated_at = timezone.now().isoformat()
+        if self.previous and not (self.stats['written'] or self.stats['removed']):
+            # Nothing changed: keep the version so caches keyed on it stay valid
+            self.version, generated_at = self.previous['version'], self.previous['generated_at']
+        manifest = {'version': self.version, 'generated_at': generated_at, 'files': self.entries}
+        atomic_write(self.root / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+        return self.stats
+
+    def export_viewset(self, viewset, basename):
+        list_path = reverse(f'{basename}-list')
+        if not self.export_list(list_path):
+            # Not readable anonymously (e.g. collaborations)
+            return
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        for value in self.lookup_values(viewset, list_path):
+            self.export(reverse(f'{basename}-detail', kwargs={lookup_url_kwarg: value}))
+        for action in viewset.get_extra_actions():
+            if not action.detail and 'get' in action.mapping:
+                # Actions that need query parameters (by_type, by_category) answer 400 and are skipped
+                self.export(reverse(f'{basename}-{action.url_name}'))
+
+    def lookup_values(self, viewset, list_path):
+        """Detail lookups for every object an anonymous client can see"""
+        view = viewset(action_map={'get': 'list'}, format_kwarg=None, args=(), kwargs={})
+        view.request = view.initialize_request(self.factory.get(list_path))
+        return view.get_queryset().order_by('pk').values_list(viewset.lookup_field, flat=True)
+
+    def export_list(self, path):
+        """Export every page of a list; False if the list isn't public"""
+        page = 1
+        while True:
+            page_path = path if page == 1 else f'{path}page/{page}/'
+            entry = self.export(page_path, query={'page': page} if page > 1 else None, list_root=path)
+            if entry is None:
+                return page > 1
+            if not entry['has_next']:
+                return True
+            page += 1
+
+    def export(self, path, query=None, list_root=None):
+        """Render `path` into the snapshot, returning its manifest entry (None when skipped)"""
+        previous = self.previous.get('files', {}).get(path)
+        headers = {}
+        if previous and not self.full:
+            headers['HTTP_IF_NONE_MATCH'] = previous['etag']
+        request_path = list_root or path
+        request = self.factory.get(request_path, data=query or {}, secure=self.secure, **headers)
+        match = resolve(request_path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+
+        if response.status_code == 304 and previous and (self.root / previous['file']).exists():
+            self.stats['not_modified'] += 1
+            self.entries[path] = previous
+            return previous
+        if response.status_code != 200:
+            self.stats['skipped'] += 1
+            return None
+
+        self.stats['rendered'] += 1
+        content = response.content
+        entry = {'file': f'{path.lstrip("/")}{FILE_NAME}', 'etag': response.get('ETag', '')}
+        if list_root is not None:
+            data = json.loads(content)
+            entry['has_next'] = bool(isinstance(data, dict) and data.get('next'))
+            if isinstance(data, dict) and 'next' in data:
+                # Point page links at the snapshot's own page files
+                page = (query or {}).get('page', 1)
+                data['next'] = f'{list_root}page/{page + 1}/' if data['next'] else None
+                data['previous'] = (list_root if page == 2 else f'{list_root}page/{page - 1}/') \
+                    if data.get('previous') else None
+                content = json.dumps(data, ensure_ascii=False, separators=(',', ':'), cls=JSONEncoder).encode()
+
+        entry['sha256'] = hashlib.sha256(content).hexdigest()
+        target = self.root / entry['file']
+        if previous and previous['sha256'] == entry['sha256'] and target.exists():
+            entry['version'] = previous['version']
+            self.stats['unchanged'] += 1
+        else:
+            atomic_write(target, content)
+            entry['version'] = self.version
+            self.stats['written'] += 1
+        self.entries[path] = entry
+        return entry
+
+    def remove_stale(self):
+        for path, entry in self.previous.get('files', {}).items():
+            if path in self.entries:
+                continue
+            target = self.root / entry['file']
+            if target.exists():
+                target.unlink()
+            self.stats['removed'] += 1
+            # Prune directories left empty, stopping at the snapshot root
+            parent = target.parent
+            while parent != self.root and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
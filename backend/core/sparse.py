@@ -0,0 +1,121 @@
+"""
+Sparse fieldsets and on-demand expansion
+`?fields=title,slug` trims a response to the named fields; `?expand=category`
+adds the nested representations a serializer lists in
+`Meta.expandable_fields`. Trimmed fields cost nothing: method fields are
+never called, and viewsets defer every column (and drop every join) that no
+remaining field reads.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+
+
+def _param_set(request, name):
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    Serializer side: applies `?fields=` / `?expand=` from the request in context
+    Only the serializer a view builds for the response is trimmed; nested
+    serializers render in full. `Meta.field_sources` names the model paths
+    that method fields and properties read, so views can defer the rest.
+    """
+
+    def is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_response_root():
+            return fields
+        request = self.context.get('request')
+        expand = _param_set(request, 'expand') or set()
+        for name, (serializer_class, kwargs) in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name in expand:
+                fields[name] = serializer_class(**kwargs)
+        only = _param_set(request, 'fields')
+        if only:
+            for name in list(fields):
+                if name not in only and not fields[name].write_only:
+                    fields.pop(name)
+        return fields
+
+    def get_model_paths(self):
+        """
+        ORM paths the readable fields need, e.g. ['title', 'category__name'],
+        or None when some field's needs are unknown and nothing may be deferred
+        """
+        model = self.Meta.model
+        declared = getattr(self.Meta, 'field_sources', {})
+        paths = []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in declared:
+                paths.extend(declared[name])
+                continue
+            if field.source == '*':
+                return None
+            path = _model_path(model, field.source_attrs)
+            if path is None:
+                return None
+            paths.append(path)
+        return paths
+
+
+def _model_path(model, attrs):
+    """Follow `attrs` through model fields; stop at the first non-field (a method or property)"""
+    parts = []
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            # A method on a related object needs that whole object; on the model itself it's opaque
+            return '__'.join(parts) if parts else None
+        parts.append(field.name)
+        if not field.is_relation:
+            break
+        if field.many_to_many or field.one_to_many:
+            return None
+        model = field.related_model
+    return '__'.join(parts)
+
+
+class SparseQuerysetMixin:
+    """
+    Viewset side: defers the columns and joins a trimmed response doesn't read
+    Applies to `list` and `retrieve` when `?fields=` is given.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve') or not _param_set(self.request, 'fields'):
+            return queryset
+        serializer = self.get_serializer()
+        paths = serializer.get_model_paths() if hasattr(serializer, 'get_model_paths') else None
+        if paths is None:
+            return queryset
+        model = queryset.model
+        # Ordering columns stay loaded: keyset cursors are built from them
+        for item in queryset.query.order_by or model._meta.ordering:
+            if isinstance(item, str):
+                name = item.lstrip('-')
+                try:
+                    paths.append(model._meta.get_field(name).name)
+                except FieldDoesNotExist:
+                    pass
+        relations = sorted({
+            path.split('__')[0] for path in paths
+            if model._meta.get_field(path.split('__')[0]).is_relation
+        })
+        return queryset.select_related(None).select_related(*relations).only(model._meta.pk.name, *paths)
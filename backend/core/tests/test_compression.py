@@ -0,0 +1,81 @@
+import gzip
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from core import compression
+from core.cache import singletons
+from core.compression import negotiate_encoding
+from core.models import Project
+
+
+class NegotiationTests(SimpleTestCase):
+    """Accept-Encoding parsing follows q-values and the server's preference"""
+
+    @skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_negotiation(self):
+        cases = [
+            ('gzip, deflate, br', 'br'),
+            ('gzip', 'gzip'),
+            ('br;q=0.5, gzip', 'gzip'),
+            ('br;q=0, gzip;q=0.1', 'gzip'),
+            ('*', 'br'),
+            ('*;q=0, gzip', 'gzip'),
+            ('identity', None),
+            ('', None),
+            ('gzip;q=bogus', None),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_encoding(header), expected)
+
+    def test_without_brotli(self):
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(negotiate_encoding('br, gzip'), 'gzip')
+            self.assertIsNone(negotiate_encoding('br'))
+
+
+class CompressionMiddlewareTests(TestCase):
+    """/api/ responses are compressed once per payload and negotiated per request"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        for i in range(6):
+            Project.objects.create(title=f'Project {i}', description='Summary ' * 20, full_content='Body',
+                                   project_type='design')
+
+    def test_gzip_and_brotli_bodies_decode_to_the_plain_response(self):
+        plain = self.client.get('/api/projects/')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain['Vary'].split(', ')[-1], 'Accept-Encoding')
+        codings = [('gzip', gzip.decompress)]
+        if compression.brotli is not None:
+            codings.append(('br', compression.brotli.decompress))
+        for coding, decompress in codings:
+            response = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING=coding)
+            self.assertEqual(response['Content-Encoding'], coding)
+            self.assertEqual(int(response['Content-Length']), len(response.content))
+            self.assertEqual(decompress(response.content), plain.content)
+
+    def test_compressed_bodies_are_cached(self):
+        with mock.patch.object(compression, 'compress_string', wraps=compression.compress_string) as compress:
+            first = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_etag_is_weakened_and_still_validates(self):
+        response = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        again = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_small_and_non_api_responses_are_left_alone(self):
+        response = self.client.get('/api/projects/?featured=true', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
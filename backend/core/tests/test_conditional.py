@@ -0,0 +1,118 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import Category, HeroSlide, NewsArticle, Project
+from core.serializers import ProjectDetailSerializer
+
+
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified validators and 304 revalidation"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        self.project = Project.objects.create(
+            title='Pavilion', description='Summary', full_content='Body',
+            project_type='architecture', featured=True
+        )
+
+    def assertRevalidates(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        revalidated = self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        return response['ETag']
+
+    def test_list_detail_and_actions_revalidate(self):
+        for path in ['/api/projects/', '/api/projects/pavilion/', '/api/projects/featured/',
+                     '/api/projects/by_type/?type=architecture', '/api/news/latest/',
+                     '/api/hero-slides/', '/api/categories/', '/api/work-categories/',
+                     '/api/works/featured/', '/api/team-members/', '/api/settings/current/',
+                     '/api/about/current/', '/api/slogan/current/', '/api/home/']:
+            with self.subTest(path=path):
+                self.assertRevalidates(path)
+
+    def test_not_modified_skips_serialization(self):
+        etag = self.client.get('/api/projects/pavilion/')['ETag']
+        with mock.patch.object(ProjectDetailSerializer, 'to_representation') as to_representation:
+            response = self.client.get('/api/projects/pavilion/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        to_representation.assert_not_called()
+
+    def test_last_modified_revalidates(self):
+        slide = HeroSlide.objects.create(image='hero/one.jpg', caption='Slide')
+        path = f'/api/hero-slides/{slide.pk}/'
+        response = self.client.get(path)
+        revalidated = self.client.get(path, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_only_self_contained_rows_send_last_modified(self):
+        # A collection's max(updated_at) misses deletions; dependencies aren't in a row's updated_at
+        for path in ['/api/projects/', '/api/projects/pavilion/', '/api/hero-slides/']:
+            with self.subTest(path=path):
+                self.assertNotIn('Last-Modified', self.client.get(path))
+
+    def test_deleting_an_older_row_defeats_if_modified_since(self):
+        older = HeroSlide.objects.create(image='hero/one.jpg', caption='Older')
+        HeroSlide.objects.filter(pk=older.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        HeroSlide.objects.create(image='hero/two.jpg', caption='Newer')
+        since = http_date(time.time() + 60)
+        older.delete()
+        response = self.client.get('/api/hero-slides/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_renaming_an_author_produces_new_news_validators(self):
+        author = User.objects.create(username='writer', first_name='Ada')
+        NewsArticle.objects.create(title='Opening', content='Body', excerpt='Summary', author=author, published=True)
+        etag = self.assertRevalidates('/api/news/')
+        author.first_name = 'Grace'
+        author.save()
+        self.assertEqual(self.client.get('/api/news/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_changes_produce_new_validators(self):
+        list_etag = self.assertRevalidates('/api/projects/')
+        detail_etag = self.assertRevalidates('/api/projects/pavilion/')
+
+        self.project.title = 'Renamed pavilion'
+        self.project.save()
+
+        self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+        self.assertEqual(
+            self.client.get('/api/projects/pavilion/', HTTP_IF_NONE_MATCH=detail_etag).status_code, 200
+        )
+
+    def test_related_model_change_produces_new_validators(self):
+        category = Category.objects.create(name='Civic')
+        self.project.category = category
+        self.project.save()
+        etag = self.assertRevalidates('/api/projects/')
+
+        category.name = 'Civic buildings'
+        category.save()
+
+        self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_deletion_produces_new_list_validator(self):
+        Project.objects.create(
+            title='Second', description='Summary', full_content='Body', project_type='art'
+        )
+        etag = self.assertRevalidates('/api/projects/')
+        Project.objects.get(slug='second').delete()
+        self.assertEqual(self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_object_still_404s(self):
+        self.assertEqual(self.client.get('/api/projects/missing/').status_code, 404)
@@ -0,0 +1,126 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.counters import recount
+from core.models import Category, Project, WorkCategory, Work
+
+
+class CategoryCounterTests(TestCase):
+    """Stored counters follow project and work writes without recounting"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.civic = Category.objects.create(name='Civic')
+        self.housing = Category.objects.create(name='Housing')
+        self.design = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/design.jpg', description='Design'
+        )
+        self.art = WorkCategory.objects.create(
+            name='art_projects', display_name='Art', image='categories/art.jpg', description='Art'
+        )
+
+    def add_project(self, category, title='Pavilion'):
+        return Project.objects.create(
+            title=title, description='Summary', full_content='Body',
+            project_type='architecture', category=category
+        )
+
+    def add_work(self, category, title='Stool', featured=False):
+        return Work.objects.create(
+            title=title, category=category, featured_image='works/w.jpg',
+            description='Description', is_featured=featured
+        )
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({field: getattr(obj, field) for field in expected}, expected)
+
+    def test_project_create_move_and_delete(self):
+        project = self.add_project(self.civic)
+        self.add_project(self.civic, title='Library')
+        self.assertCounts(self.civic, project_count=2)
+
+        project.category = self.housing
+        project.save()
+        self.assertCounts(self.civic, project_count=1)
+        self.assertCounts(self.housing, project_count=1)
+
+        project.category = None
+        project.save()
+        self.assertCounts(self.housing, project_count=0)
+
+        Project.objects.get(slug='library').delete()
+        self.assertCounts(self.civic, project_count=0)
+
+    def test_unchanged_save_does_not_touch_counters(self):
+        project = self.add_project(self.civic)
+        project.title = 'Renamed'
+        with CaptureQueriesContext(connection) as ctx:
+            project.save()
+        self.assertFalse(any('core_category' in query['sql'] for query in ctx.captured_queries))
+        self.assertCounts(self.civic, project_count=1)
+
+    def test_deferred_instances_are_counted_correctly(self):
+        self.add_project(self.civic)
+        project = Project.objects.only('title').get()
+        project.category = self.housing
+        project.save()
+        self.assertCounts(self.civic, project_count=0)
+        self.assertCounts(self.housing, project_count=1)
+
+    def test_work_counters_track_featuring_and_moves(self):
+        work = self.add_work(self.design)
+        self.add_work(self.design, title='Lamp', featured=True)
+        self.assertCounts(self.design, works_count=2, unfeatured_works_count=1)
+
+        work.is_featured = True
+        work.save()
+        self.assertCounts(self.design, works_count=2, unfeatured_works_count=0)
+
+        work.category = self.art
+        work.is_featured = False
+        work.save()
+        self.assertCounts(self.design, works_count=1, unfeatured_works_count=0)
+        self.assertCounts(self.art, works_count=1, unfeatured_works_count=1)
+
+        work.delete()
+        self.assertCounts(self.art, works_count=0, unfeatured_works_count=0)
+
+    def test_listings_read_counters_from_a_single_table(self):
+        self.add_project(self.civic)
+        self.add_work(self.design)
+        self.add_work(self.design, title='Lamp', featured=True)
+        client = APIClient()
+        with CaptureQueriesContext(connection) as ctx:
+            categories = client.get('/api/categories/').json()['results']
+            work_categories = client.get('/api/work-categories/').json()['results']
+        self.assertFalse(any('JOIN' in query['sql'] for query in ctx.captured_queries))
+        self.assertEqual({c['name']: c['project_count'] for c in categories}, {'Civic': 1, 'Housing': 0})
+        self.assertEqual({c['name']: c['works_count'] for c in work_categories}, {'design': 1, 'art_projects': 0})
+
+    def test_recount_repairs_drift(self):
+        self.add_project(self.civic)
+        self.add_work(self.design)
+        Project.objects.bulk_create([
+            Project(title='Bulk', slug='bulk', description='Summary', full_content='Body',
+                    project_type='art', category=self.housing)
+        ])
+        WorkCategory.objects.filter(pk=self.design.pk).update(unfeatured_works_count=7)
+
+        out = StringIO()
+        call_command('recount_categories', '--dry-run', stdout=out)
+        self.assertIn('2 counter(s) drifted', out.getvalue())
+        self.assertCounts(self.housing, project_count=0)
+
+        call_command('recount_categories', stdout=StringIO())
+        self.assertCounts(self.housing, project_count=1)
+        self.assertCounts(self.design, works_count=1, unfeatured_works_count=1)
+        self.assertEqual(recount(), [])
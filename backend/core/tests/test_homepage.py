@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import Project, HeroSlide, SiteSettings
+
+
+class HomeEndpointTests(TestCase):
+    """Aggregated /api/home/ payload and its cache invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        HeroSlide.objects.create(image='hero/one.jpg', caption='First slide')
+        Project.objects.create(
+            title='Featured', description='Summary', full_content='Body',
+            project_type='design', featured=True
+        )
+
+    def test_payload_contains_every_homepage_section(self):
+        response = self.client.get('/api/home/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data),
+            {'hero_slides', 'slogan', 'featured_works', 'featured_projects',
+             'latest_news', 'settings'}
+        )
+        self.assertEqual([p['title'] for p in response.data['featured_projects']], ['Featured'])
+
+    @override_settings(MEDIA_URL='/media/')
+    def test_media_urls_are_absolute_like_the_list_endpoints(self):
+        image = self.client.get('/api/home/').data['hero_slides'][0]['image']
+        self.assertEqual(image, 'http://testserver/media/hero/one.jpg')
+        self.assertEqual(self.client.get('/api/hero-slides/').json()['results'][0]['image'], image)
+        # Each host gets its own URLs, from the same cache entry
+        other = self.client.get('/api/home/', HTTP_HOST='localhost').data['hero_slides'][0]['image']
+        self.assertEqual(other, 'http://localhost/media/hero/one.jpg')
+
+    def test_warm_request_runs_no_queries(self):
+        self.client.get('/api/home/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/home/')
+
+    def test_saving_a_feeding_model_rebuilds_payload(self):
+        self.client.get('/api/home/')
+        Project.objects.create(
+            title='Another', description='Summary', full_content='Body',
+            project_type='art', featured=True
+        )
+        settings = SiteSettings.load()
+        settings.tagline = 'Updated tagline'
+        settings.save()
+
+        response = self.client.get('/api/home/')
+        self.assertEqual(len(response.data['featured_projects']), 2)
+        self.assertEqual(response.data['settings']['tagline'], 'Updated tagline')
+
+    def test_deleting_a_feeding_model_rebuilds_payload(self):
+        self.client.get('/api/home/')
+        HeroSlide.objects.all().delete()
+        response = self.client.get('/api/home/')
+        self.assertEqual(response.data['hero_slides'], [])
@@ -0,0 +1,200 @@
+import shutil
+import tempfile
+import threading
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import ExifTags, Image
+from rest_framework.test import APIClient
+
+from core import images
+from core.cache import singletons
+from core.models import HeroSlide, Project
+
+
+def upload(name='slide.jpg', size=(1000, 500), fmt='JPEG', color=(200, 120, 40), **save_options):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, fmt, **save_options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class MediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        singletons.clear()
+        self.media_root = tempfile.mkdtemp()
+        settings = override_settings(MEDIA_ROOT=self.media_root, IMAGE_VARIANTS_IN_BACKGROUND=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+
+class ImageVariantTests(MediaRootMixin, TestCase):
+    """Resized variants are rendered after commit and follow image changes"""
+
+    def create_slide(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            slide = HeroSlide.objects.create(image=upload(**kwargs), caption='Slide')
+        slide.refresh_from_db()
+        return slide
+
+    def test_widths_stop_at_the_original(self):
+        self.assertEqual(images.variant_widths(200), [200])
+        self.assertEqual(images.variant_widths(1000), [320, 640, 960, 1000])
+        self.assertEqual(images.variant_widths(4000), [320, 640, 960, 1280, 1920])
+
+    def test_upload_renders_every_width_in_every_format(self):
+        slide = self.create_slide()
+        entry = slide.image_variants['image']
+        self.assertEqual(entry['source'], slide.image.name)
+        self.assertEqual(list(entry['formats']), images.available_formats())
+        self.assertIn('jpeg', entry['formats'])
+        for variants in entry['formats'].values():
+            self.assertEqual(list(variants), ['320', '640', '960', '1000'])
+            for width, name in variants.items():
+                with default_storage.open(name) as file, Image.open(file) as image:
+                    self.assertEqual(image.size, (int(width), int(width) // 2))
+
+    def test_api_exposes_srcset_strings(self):
+        slide = self.create_slide()
+        response = APIClient().get(f'/api/hero-slides/{slide.pk}/')
+        srcset = response.json()['image_variants']['image']['webp']
+        names = slide.image_variants['image']['formats']['webp']
+        self.assertEqual(srcset, ', '.join(f'{default_storage.url(name)} {width}w' for width, name in names.items()))
+
+    def test_storing_variants_changes_the_etag(self):
+        client = APIClient()
+        with self.captureOnCommitCallbacks() as callbacks:
+            HeroSlide.objects.create(image=upload(), caption='Slide')
+        before = client.get('/api/hero-slides/')
+        for callback in callbacks:
+            callback()
+        after = client.get('/api/hero-slides/', HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertTrue(after.json()['results'][0]['image_variants'])
+
+    def test_replacing_an_image_drops_stale_variants_before_rendering(self):
+        slide = self.create_slide()
+        old = images.variant_names(slide.image_variants['image'])
+        slide.image = upload('other.jpg', size=(500, 250))
+        with self.captureOnCommitCallbacks() as callbacks:
+            slide.save()
+        # Until the new variants exist, none are served
+        self.assertEqual(HeroSlide.objects.get(pk=slide.pk).image_variants, {})
+        for callback in callbacks:
+            callback()
+        slide.refresh_from_db()
+        self.assertEqual(list(slide.image_variants['image']['formats']['jpeg']), ['320', '500'])
+        self.assertFalse(any(default_storage.exists(name) for name in old))
+
+    def test_unrelated_save_keeps_variants_rendered_since_load(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            slide = HeroSlide.objects.create(image=upload(), caption='Slide')
+        rendered = HeroSlide.objects.get(pk=slide.pk).image_variants
+        # This instance predates the rendered variants
+        self.assertEqual(slide.image_variants, {})
+        slide.caption = 'Edited'
+        with self.captureOnCommitCallbacks(execute=True):
+            slide.save()
+        self.assertEqual(HeroSlide.objects.get(pk=slide.pk).image_variants, rendered)
+        self.assertTrue(all(default_storage.exists(name) for name in images.variant_names(rendered['image'])))
+
+    def test_deleting_a_row_removes_its_variants(self):
+        slide = self.create_slide()
+        names = images.variant_names(slide.image_variants['image'])
+        with self.captureOnCommitCallbacks(execute=True):
+            slide.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+
+    def test_backfill_renders_missing_variants_and_info(self):
+        name = default_storage.save('hero/existing.png', upload(size=(700, 350), fmt='PNG'))
+        HeroSlide.objects.bulk_create([HeroSlide(image=name, caption='Existing')])
+        out = StringIO()
+        call_command('backfill_images', 'heroslide', workers=1, stdout=out)
+        slide = HeroSlide.objects.get()
+        self.assertEqual(list(slide.image_variants['image']['formats']['webp']), ['320', '640', '700'])
+        self.assertEqual((slide.image_info['image']['width'], slide.image_info['image']['height']), (700, 350))
+        self.assertIn('Processed 1 image(s)', out.getvalue())
+        # Nothing left to do on a second run
+        call_command('backfill_images', workers=1, stdout=out)
+        self.assertIn('Processed 0 image(s)', out.getvalue())
+
+    @override_settings(IMAGE_VARIANTS_IN_BACKGROUND=True)
+    def test_jobs_run_off_the_calling_thread(self):
+        future = images.submit(threading.current_thread)
+        worker = future.result(timeout=5)
+        self.assertIsNot(worker, threading.current_thread())
+        self.assertTrue(worker.name.startswith('image-variants'))
+
+
+class ImageInfoTests(MediaRootMixin, TestCase):
+    """Size, colour and placeholder are stored with the upload and served on list pages"""
+
+    def test_upload_is_described_during_the_save(self):
+        # On-commit callbacks (the background job) never run here
+        with self.captureOnCommitCallbacks():
+            slide = HeroSlide.objects.create(image=upload(size=(1200, 800), color=(30, 90, 160)), caption='Slide')
+        info = HeroSlide.objects.get(pk=slide.pk).image_info['image']
+        self.assertEqual(info['source'], slide.image.name)
+        self.assertEqual((info['width'], info['height']), (1200, 800))
+        red, green, blue = (int(info['color'][i:i + 2], 16) for i in (1, 3, 5))
+        self.assertLess(max(abs(red - 30), abs(green - 90), abs(blue - 160)), 8)
+        self.assertTrue(info['placeholder'].startswith('data:image/'))
+        self.assertLess(len(info['placeholder']), 400)
+
+    def test_exif_rotation_swaps_the_reported_size(self):
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        with self.captureOnCommitCallbacks():
+            slide = HeroSlide.objects.create(image=upload(size=(600, 400), exif=exif), caption='Slide')
+        info = HeroSlide.objects.get(pk=slide.pk).image_info['image']
+        self.assertEqual((info['width'], info['height']), (400, 600))
+
+    def test_replacing_an_image_replaces_its_info(self):
+        with self.captureOnCommitCallbacks():
+            slide = HeroSlide.objects.create(image=upload(size=(600, 400)), caption='Slide')
+        slide.image = upload('other.jpg', size=(300, 300))
+        with self.captureOnCommitCallbacks():
+            slide.save()
+        info = HeroSlide.objects.get(pk=slide.pk).image_info['image']
+        self.assertEqual((info['source'], info['width']), (slide.image.name, 300))
+
+    def test_list_pages_report_the_featured_image_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(
+                title='Pavilion', description='Summary', full_content='Body', project_type='architecture',
+                featured_image=upload('featured.jpg', size=(800, 600)), image_1=upload('gallery.jpg'),
+            )
+        item = APIClient().get('/api/projects/').json()['results'][0]
+        self.assertEqual(list(item['image_info']), ['featured_image'])
+        self.assertEqual(item['image_info']['featured_image']['width'], 800)
+        self.assertNotIn('source', item['image_info']['featured_image'])
+        self.assertEqual(list(item['image_variants']), ['featured_image'])
+
+
+class ParallelBackfillTests(MediaRootMixin, TestCase):
+    """The backfill command spreads rows over worker threads"""
+
+    def test_workers_process_every_row(self):
+        names = [default_storage.save(f'hero/{i}.jpg', upload(size=(400, 200))) for i in range(6)]
+        HeroSlide.objects.bulk_create([HeroSlide(image=name, caption=name) for name in names])
+        out = StringIO()
+        call_command('backfill_images', 'heroslide', workers=3, stdout=out)
+        self.assertIn('Processed 6 image(s)', out.getvalue())
+        for slide in HeroSlide.objects.all():
+            self.assertEqual(slide.image_info['image']['width'], 400)
+            self.assertEqual(list(slide.image_variants['image']['formats']['jpeg']), ['320', '400'])
+
+    def test_workers_close_their_connections(self):
+        names = [default_storage.save(f'hero/{i}.jpg', upload(size=(400, 200))) for i in range(4)]
+        HeroSlide.objects.bulk_create([HeroSlide(image=name, caption=name) for name in names])
+        with mock.patch('core.management.commands.backfill_images.connection') as connection:
+            call_command('backfill_images', 'heroslide', workers=2, stdout=StringIO())
+        self.assertEqual(connection.close.call_count, 4)
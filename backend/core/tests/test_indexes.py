@@ -0,0 +1,142 @@
+import re
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.admin import CollaborationAdmin
+from core.models import Project, NewsArticle, Collaboration, HeroSlide, WorkCategory, Work, TeamMember
+from core.pagination import KeysetPagination
+
+
+class AccessPathIndexTests(TestCase):
+    """EXPLAIN each endpoint's main query and check it is served by its index"""
+
+    # path -> (table, index expected in the plan)
+    ENDPOINTS = {
+        '/api/projects/': ('core_project', 'project_order_idx'),
+        '/api/projects/?cursor=': ('core_project', 'project_order_idx'),
+        '/api/projects/featured/': ('core_project', 'project_featured_idx'),
+        '/api/projects/by_type/?type=design': ('core_project', 'project_type_order_idx'),
+        '/api/news/': ('core_newsarticle', 'news_published_idx'),
+        '/api/news/latest/': ('core_newsarticle', 'news_published_idx'),
+        '/api/works/': ('core_work', 'work_order_idx'),
+        '/api/works/featured/': ('core_work', 'work_featured_idx'),
+        '/api/works/by_category/?category=design': ('core_work', 'work_category_order_idx'),
+        '/api/hero-slides/': ('core_heroslide', 'heroslide_active_idx'),
+        '/api/team-members/': ('core_teammember', 'teammember_active_idx'),
+        '/api/collaborations/': ('core_collaboration', 'collab_submitted_idx'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('writer')
+        cls.staff = User.objects.create_user('staff', is_staff=True)
+        category = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/d.jpg', description='Design'
+        )
+        for i in range(3):
+            Project.objects.create(
+                title=f'Project {i}', description='Summary', full_content='Body',
+                project_type='design', featured=i == 0
+            )
+            Work.objects.create(
+                title=f'Work {i}', category=category, featured_image='works/w.jpg',
+                description='Description', is_featured=i == 0
+            )
+            NewsArticle.objects.create(
+                title=f'Article {i}', excerpt='Excerpt', content='Body', author=author, published=True
+            )
+            Collaboration.objects.create(
+                name='Visitor', email='v@example.com', project_type='design',
+                message='I would love to collaborate on something.'
+            )
+            HeroSlide.objects.create(image='hero/h.jpg', caption='Slide')
+            TeamMember.objects.create(name=f'Member {i}', role='Designer', bio='Bio', image='team/t.jpg')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def main_query(self, path, table):
+        # Collaborations are staff-only; everything else is read anonymously
+        self.client.force_authenticate(self.staff if table == 'core_collaboration' else None)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if sql.startswith(f'SELECT "{table}"."id"') and 'ORDER BY' in sql:
+                return sql
+        self.fail(f'No ordered SELECT on {table} for {path}')
+
+    def order_by(self, sql):
+        """A query's ORDER BY terms, with positional ones (from .values()) resolved to their column"""
+        columns = [column.split(' AS ')[0] for column in sql[len('SELECT '):sql.index(' FROM ')].split(', ')]
+        clause = re.search(r' ORDER BY (.*?)(?: LIMIT | OFFSET |$)', sql).group(1)
+        terms = []
+        for term in clause.split(', '):
+            expression, _, direction = term.partition(' ')
+            if expression.isdigit():
+                expression = columns[int(expression) - 1]
+            terms.append(f'{expression} {direction}')
+        return terms
+
+    def explain(self, sql):
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+
+    def test_endpoint_queries_use_their_index(self):
+        for path, (table, index) in self.ENDPOINTS.items():
+            with self.subTest(path=path):
+                plan = self.explain(self.main_query(path, table))
+                self.assertIn(index, plan)
+                if connection.vendor == 'sqlite':
+                    self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_keyset_follow_up_pages_use_the_index(self):
+        keyset = KeysetPagination()
+        keyset.fields = keyset.get_ordering(Project.objects.all())
+        keyset.base_url = 'http://testserver/api/projects/?cursor='
+        url = keyset.encode_cursor(Project.objects.first(), reverse=False)
+        plan = self.explain(self.main_query(url, 'core_project'))
+        self.assertIn('project_order_idx', plan)
+
+    def test_admin_review_queue_uses_its_index(self):
+        request = RequestFactory().get('/admin/core/collaboration/')
+        request.user = self.staff
+        queryset = CollaborationAdmin(Collaboration, admin.site).get_queryset(request)
+        plan = self.explain(str(queryset[:100].query))
+        self.assertIn('collab_review_queue_idx', plan)
+
+    def test_news_listings_order_the_way_the_index_does(self):
+        # A plain DESC also finds the index in this plan, but sorts NULLs first on PostgreSQL
+        expected = [
+            '"core_newsarticle"."publish_date" DESC NULLS LAST',
+            '"core_newsarticle"."created_at" DESC',
+            '"core_newsarticle"."id" ASC',
+        ]
+        for path in ('/api/news/', '/api/news/?cursor=', '/api/news/latest/', '/api/home/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.order_by(self.main_query(path, 'core_newsarticle')), expected)
+
+    def test_news_index_sorts_nulls_last_like_the_pagination(self):
+        index = next(i for i in NewsArticle._meta.indexes if i.name == 'news_published_idx')
+        # Only rendering the statement; SQLite won't open a schema editor inside a test transaction
+        editor = connection.schema_editor(collect_sql=True)
+        # PostgreSQL: DESC puts NULLs first unless told otherwise
+        with mock.patch.object(connection.features, 'order_by_nulls_first', False):
+            self.assertIn('"publish_date" DESC NULLS LAST', str(index.create_sql(NewsArticle, editor)))
+        if connection.features.order_by_nulls_first:
+            self.assertNotIn('NULLS LAST', str(index.create_sql(NewsArticle, editor)))
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from core.models import HeroSlide, StoredFile
+from utils.fake_storage import FakeStorageServer
+from utils.supabase_client import close_clients
+
+
+@override_settings(MEDIA_CACHE_DIR='')
+class MigrateMediaTests(TestCase):
+    """migrate_media copies referenced local files to the bucket, once, verified"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        self.source = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.journal = os.path.join(self.source, 'journal.jsonl')
+        self.files = {
+            'hero/a.jpg': b'first slide',
+            'hero/b.jpg': b'second slide',
+            'hero/b.320w.webp': b'second slide, small',
+        }
+        for name, data in self.files.items():
+            os.makedirs(os.path.join(self.source, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(self.source, name), 'wb') as file:
+                file.write(data)
+        HeroSlide.objects.bulk_create([
+            HeroSlide(image='hero/a.jpg', caption='A'),
+            HeroSlide(image='hero/b.jpg', caption='B', image_variants={
+                'image': {'source': 'hero/b.jpg', 'formats': {'webp': {'320': 'hero/b.320w.webp'}}},
+            }),
+        ])
+
+    def migrate(self, **options):
+        out = StringIO()
+        call_command(
+            'migrate_media', source=self.source, journal=self.journal, workers=2, stdout=out, stderr=out, **options
+        )
+        return out.getvalue()
+
+    def journaled(self):
+        with open(self.journal) as journal:
+            return sorted(json.loads(line)['name'] for line in journal)
+
+    def test_referenced_files_and_variants_are_uploaded_once(self):
+        output = self.migrate()
+        self.assertIn('3 uploaded', output)
+        self.assertEqual({name: data for name, (_, data) in self.server.objects.items()}, self.files)
+        self.assertEqual(self.server.objects['hero/b.320w.webp'][0], 'image/webp')
+        self.assertEqual(self.journaled(), sorted(self.files))
+        self.assertEqual(StoredFile.objects.get(name='hero/a.jpg').size, len(b'first slide'))
+
+        self.server.requests.clear()
+        self.assertIn('3 skipped', self.migrate())
+        self.assertEqual(self.server.requests, [])
+
+    def test_an_interrupted_run_resumes_with_what_is_left(self):
+        self.server.failures = [('POST', 500)]
+        with self.assertRaisesMessage(CommandError, '1 file(s) failed'):
+            self.migrate()
+        self.assertEqual(len(self.journaled()), 2)
+
+        self.server.requests.clear()
+        output = self.migrate()
+        self.assertIn('1 uploaded, 0 present, 2 skipped', output)
+        self.assertEqual(len(self.server.calls('POST')), 1)
+        self.assertEqual(self.journaled(), sorted(self.files))
+
+    def test_objects_already_in_the_bucket_are_checked_not_overwritten(self):
+        # Uploaded before an interruption, but never journaled
+        self.server.store('hero/a.jpg', 'image/jpeg', b'first slide')
+        self.server.store('hero/b.jpg', 'image/jpeg', b'something else')
+        with self.assertRaisesMessage(CommandError, '1 file(s) failed'):
+            self.migrate()
+        self.assertEqual(self.server.objects['hero/b.jpg'][1], b'something else')
+        self.assertEqual(self.journaled(), ['hero/a.jpg', 'hero/b.320w.webp'])
+
+    def test_stored_copies_without_an_md5_etag_are_read_back(self):
+        # Multipart uploads' ETags aren't content hashes
+        with mock.patch.object(FakeStorageServer, 'etag', lambda server, name: '"abc123-2"'):
+            self.migrate()
+        self.assertEqual(len(self.server.calls('GET')), 3)
+        self.assertEqual(self.journaled(), sorted(self.files))
+
+    def test_missing_local_files_are_reported(self):
+        os.remove(os.path.join(self.source, 'hero/a.jpg'))
+        output = self.migrate()
+        self.assertIn('hero/a.jpg: not found', output)
+        self.assertIn('2 uploaded, 0 present, 0 skipped, 1 missing', output)
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Project, NewsArticle
+
+
+class KeysetPaginationTests(TestCase):
+    """Opt-in ?cursor= pagination walks the full ordering without COUNT or OFFSET"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        # Few distinct display_order values, so most rows tie on the first key
+        for i in range(30):
+            Project.objects.create(
+                title=f'Project {i}', description='Summary', full_content='Body',
+                project_type='design', display_order=i % 3
+            )
+        author = User.objects.create_user('writer')
+        now = timezone.now()
+        for i in range(27):
+            NewsArticle.objects.create(
+                title=f'Article {i}', excerpt='Excerpt', content='Body', author=author,
+                published=True, publish_date=None if i % 4 == 0 else now - timedelta(days=i % 5)
+            )
+
+    def walk(self, url):
+        """Follow `next` links, returning (slugs, query counts per page)"""
+        slugs, queries = [], []
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            slugs.extend(row['slug'] for row in response.data['results'])
+            queries.append(ctx.captured_queries)
+            url = response.data['next']
+        return slugs, queries
+
+    def test_forward_walk_matches_default_ordering(self):
+        for path, model in (('/api/projects/?cursor=', Project), ('/api/news/?cursor=', NewsArticle)):
+            with self.subTest(path=path):
+                slugs, _ = self.walk(path)
+                expected = list(model.objects.values_list('slug', flat=True))
+                if model is NewsArticle:
+                    # NULL publish dates sort last on every backend
+                    dated = list(model.objects.filter(publish_date__isnull=False).values_list('slug', flat=True))
+                    undated = list(model.objects.filter(publish_date__isnull=True).values_list('slug', flat=True))
+                    expected = dated + undated
+                self.assertEqual(slugs, expected)
+
+    def test_pages_skip_count_and_offset(self):
+        for path in ('/api/projects/?cursor=', '/api/news/?cursor='):
+            with self.subTest(path=path):
+                _, pages = self.walk(path)
+                self.assertEqual(len(pages), 3)
+                for captured in pages:
+                    sql = ' '.join(query['sql'] for query in captured).upper()
+                    # Neither the paginator nor the ETag validators count rows
+                    self.assertNotIn('COUNT(', sql)
+                    self.assertNotIn('OFFSET', sql)
+                self.assertEqual(len({len(captured) for captured in pages}), 1)
+
+    def test_pages_revalidate_until_a_write(self):
+        first = self.client.get('/api/projects/?cursor=')
+        self.assertEqual(self.client.get('/api/projects/?cursor=', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        Project.objects.order_by('pk').last().delete()
+        response = self.client.get('/api/projects/?cursor=', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_previous_links_walk_back(self):
+        forward, _ = self.walk('/api/news/?cursor=')
+        page = self.client.get('/api/news/?cursor=').json()
+        while page['next']:
+            page = self.client.get(page['next']).json()
+        backward = []
+        while True:
+            backward = [row['slug'] for row in page['results']] + backward
+            if not page['previous']:
+                break
+            page = self.client.get(page['previous']).json()
+        self.assertEqual(backward, forward)
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get('/api/projects/?page=2')
+        self.assertEqual(response.data['count'], 30)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/projects/?cursor=garbage').status_code, 404)
+
+    def test_cursor_respects_explicit_ordering(self):
+        slugs, _ = self.walk('/api/projects/?cursor=&ordering=-title')
+        self.assertEqual(slugs, list(Project.objects.order_by('-title', 'pk').values_list('slug', flat=True)))
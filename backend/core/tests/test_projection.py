@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import Category, NewsArticle, Project, WorkCategory, Work
+from core.pagination import KeysetPagination, OptInCursorPagination
+from core.projection import ValuesProjectionMixin
+
+
+class ValuesProjectionTests(TestCase):
+    """List pages read with .values() render exactly like the instance path"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        category = Category.objects.create(name='Civic')
+        for i in range(5):
+            Project.objects.create(
+                title=f'Project {i} — café', description='Summary line', full_content='Body',
+                project_type='design', category=category if i % 2 else None,
+                featured_image='projects/featured/p.jpg' if i % 3 else None, display_order=i % 2
+            )
+        design = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/design.jpg', description='Design'
+        )
+        for i in range(5):
+            Work.objects.create(title=f'Work {i}', category=design, featured_image='works/w.jpg',
+                                description='Description', is_featured=i == 0, display_order=i % 2)
+        named = User.objects.create_user('writer', first_name='Nate', last_name='Writer')
+        unnamed = User.objects.create_user('anon')
+        for i in range(5):
+            NewsArticle.objects.create(
+                title=f'Article {i}', excerpt='Excerpt', content='Body', published=True,
+                author=named if i % 2 else unnamed,
+                publish_date=timezone.now() if i % 3 else None
+            )
+
+    def fetch(self, path, fast=True, **params):
+        cache.clear()
+        if fast:
+            response = self.client.get(path, params)
+        else:
+            with mock.patch.object(ValuesProjectionMixin, 'get_values_plan', return_value=None):
+                response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assertSameResponse(self, path, **params):
+        self.assertEqual(self.fetch(path, **params), self.fetch(path, fast=False, **params))
+
+    def test_lists_match_instance_rendering(self):
+        for path in ('/api/projects/', '/api/works/', '/api/news/'):
+            with self.subTest(path=path):
+                self.assertSameResponse(path)
+                with mock.patch.object(OptInCursorPagination, 'page_size', 2):
+                    self.assertSameResponse(path, page=2)
+
+    def test_filters_ordering_search_and_sparse_fields_match(self):
+        self.assertSameResponse('/api/projects/', ordering='-title', project_type='design')
+        self.assertSameResponse('/api/projects/', q='project')
+        self.assertSameResponse('/api/works/', fields='title,category_name', is_featured='false')
+        self.assertSameResponse('/api/news/', fields='author_name,publish_date')
+        self.assertSameResponse('/api/projects/', expand='category')
+
+    def test_keyset_cursors_match(self):
+        with mock.patch.object(KeysetPagination, 'page_size', 2):
+            for path in ('/api/projects/', '/api/news/'):
+                first = self.fetch(path, cursor='')
+                self.assertEqual(first, self.fetch(path, fast=False, cursor=''))
+                next_link = self.client.get(path, {'cursor': ''}).json()['next']
+                cache.clear()
+                self.assertEqual(self.client.get(next_link).content, self.fetch(next_link, fast=False))
+
+    def test_null_relations_render_like_instances(self):
+        results = self.client.get('/api/projects/', {'ordering': 'title'}).json()['results']
+        self.assertNotIn('category_name', results[0])
+        self.assertEqual(results[1]['category_name'], 'Civic')
+        self.assertIsNone(results[0]['featured_image'])
+        self.assertTrue(results[1]['featured_image'].endswith('/projects/featured/p.jpg'))
+
+    def test_rows_are_not_instantiated(self):
+        with mock.patch.object(Project, '__init__', side_effect=AssertionError) as init:
+            self.client.get('/api/projects/')
+        init.assert_not_called()
+        with CaptureQueriesContext(connection) as ctx:
+            cache.clear()
+            self.client.get('/api/news/')
+        select = next(q['sql'] for q in ctx.captured_queries if 'FROM "core_newsarticle"' in q['sql']
+                      and 'LIMIT' in q['sql'])
+        self.assertNotIn('"content"', select)
+        self.assertIn('"auth_user"."first_name"', select)
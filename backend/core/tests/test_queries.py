@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Category, Project, NewsArticle, WorkCategory, Work
+
+
+class ListQueryCountTests(TestCase):
+    """List pages run a constant number of queries regardless of row count"""
+
+    LIST_PATHS = [
+        '/api/categories/', '/api/projects/', '/api/projects/featured/',
+        '/api/projects/by_type/?type=design', '/api/news/', '/api/news/latest/?count=12',
+        '/api/work-categories/', '/api/works/', '/api/works/featured/',
+        '/api/works/by_category/?category=design',
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.work_category = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/design.jpg', description='Design'
+        )
+
+    def add_rows(self, count):
+        start = Project.objects.count()
+        for i in range(start, start + count):
+            category = Category.objects.create(name=f'Category {i}')
+            author = User.objects.create_user(f'author{i}', first_name='Author', last_name=str(i))
+            Project.objects.create(
+                title=f'Project {i}', description='Summary', full_content='Body',
+                project_type='design', category=category, featured=True
+            )
+            Work.objects.create(
+                title=f'Work {i}', category=self.work_category, featured_image='works/w.jpg',
+                description='Description', is_featured=True
+            )
+            NewsArticle.objects.create(
+                title=f'Article {i}', excerpt='Excerpt', content='Body', author=author, published=True
+            )
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(2)
+        small = {path: self.count_queries(path) for path in self.LIST_PATHS}
+        self.add_rows(10)
+        for path in self.LIST_PATHS:
+            with self.subTest(path=path):
+                self.assertEqual(self.count_queries(path), small[path])
+
+    def test_work_detail_related_works_query_count_is_constant(self):
+        self.add_rows(2)
+        small = self.count_queries('/api/works/work-0/')
+        self.add_rows(10)
+        self.assertEqual(self.count_queries('/api/works/work-0/'), small)
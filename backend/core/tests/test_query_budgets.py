@@ -0,0 +1,127 @@
+"""
+Query and latency budgets for every API route
+Seeds thousands of rows, then holds each GET endpoint registered on the
+router to a fixed maximum query count and a wall-clock budget, so
+performance regressions fail here instead of in production.
+"""
+
+import os
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.urls import router
+from core.benchmarks import seed_content
+from core.cache import singletons
+from core.models import Collaboration, HeroSlide, TeamMember
+
+
+# Slow CI machines can stretch the wall-clock budgets without touching the table
+TIME_SCALE = float(os.environ.get('PERF_BUDGET_SCALE', '1'))
+
+# url name -> (kwargs, query string, max queries, max milliseconds, as staff)
+BUDGETS = {
+    'category-list': ({}, '', 4, 60, False),
+    'category-detail': ({'slug': 'category-0'}, '', 3, 40, False),
+    'project-list': ({}, '', 5, 80, False),
+    'project-list:search': ({}, '?search=Project 1', 5, 250, False),
+    'project-list:fulltext': ({}, '?q=lagoon', 5, 150, False),
+    'project-featured': ({}, '', 4, 80, False),
+    'project-by-type': ({}, '?type=design', 4, 250, False),
+    'project-detail': ({'slug': 'project-0'}, '', 4, 40, False),
+    'news-list': ({}, '', 3, 80, False),
+    'news-latest': ({}, '', 2, 40, False),
+    'news-detail': ({'slug': 'article-1'}, '', 2, 40, False),
+    'collaboration-list': ({}, '', 2, 80, True),
+    'collaboration-detail': ({'pk': 'first'}, '', 1, 40, True),
+    'settings-list': ({}, '', 2, 40, False),
+    'settings-current': ({}, '', 1, 40, False),
+    'settings-detail': ({'pk': 1}, '', 2, 40, False),
+    'hero-slide-list': ({}, '', 3, 40, False),
+    'hero-slide-detail': ({'pk': 'first'}, '', 2, 40, False),
+    'work-category-list': ({}, '', 4, 60, False),
+    'work-category-detail': ({'name': 'design'}, '', 3, 40, False),
+    'work-list': ({}, '', 5, 80, False),
+    'work-featured': ({}, '', 4, 80, False),
+    'work-by-category': ({}, '?category=design', 4, 250, False),
+    'work-detail': ({'slug': 'work-0'}, '', 5, 60, False),
+    'team-member-list': ({}, '', 3, 40, False),
+    'team-member-detail': ({'pk': 'first'}, '', 2, 40, False),
+    'about-list': ({}, '', 2, 40, False),
+    'about-current': ({}, '', 1, 40, False),
+    'about-detail': ({'pk': 1}, '', 2, 40, False),
+    'slogan-list': ({}, '', 2, 40, False),
+    'slogan-current': ({}, '', 1, 40, False),
+    'slogan-detail': ({'pk': 1}, '', 2, 40, False),
+}
+
+# Routes without a GET handler have nothing to budget
+WRITE_ONLY_ROUTES = {'collaboration-mark-reviewed', 'collaboration-update-status'}
+
+RUNS = 3
+
+
+class QueryBudgetTests(TestCase):
+    """Every read endpoint stays within its query and latency budget on a large dataset"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_content()
+        cls.staff = User.objects.create_user('staff', is_staff=True)
+        cls.first_pk = {
+            'collaboration-detail': Collaboration.objects.order_by('pk').first().pk,
+            'hero-slide-detail': HeroSlide.objects.order_by('pk').first().pk,
+            'team-member-detail': TeamMember.objects.order_by('pk').first().pk,
+        }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def build_path(self, name, kwargs, query):
+        url_name = name.split(':')[0]
+        kwargs = {
+            key: self.first_pk[url_name] if value == 'first' else value
+            for key, value in kwargs.items()
+        }
+        return reverse(url_name, kwargs=kwargs) + query
+
+    def measure(self, path):
+        """Return (queries, median ms) for a cold-cache GET of `path`"""
+        timings = []
+        for _ in range(RUNS):
+            cache.clear()
+            singletons.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = self.client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+            self.assertEqual(response.status_code, 200, path)
+        return len(ctx.captured_queries), statistics.median(timings)
+
+    def test_every_router_get_route_has_a_budget(self):
+        route_names = {url.name for url in router.urls if url.name and url.name != 'api-root'}
+        budgeted = {name.split(':')[0] for name in BUDGETS}
+        self.assertEqual(route_names - WRITE_ONLY_ROUTES - budgeted, set())
+
+    def test_endpoints_stay_within_budget(self):
+        # Warm URL resolution and imports so the first route isn't penalised
+        self.client.get('/api/')
+        for name, (kwargs, query, max_queries, max_ms, as_staff) in BUDGETS.items():
+            with self.subTest(route=name):
+                self.client.force_authenticate(self.staff if as_staff else None)
+                path = self.build_path(name, kwargs, query)
+                queries, elapsed = self.measure(path)
+                self.assertLessEqual(
+                    queries, max_queries, f'{path} ran {queries} queries (budget {max_queries})'
+                )
+                self.assertLessEqual(
+                    elapsed, max_ms * TIME_SCALE,
+                    f'{path} took {elapsed:.1f}ms (budget {max_ms * TIME_SCALE:.0f}ms)'
+                )
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import WorkCategory, Work
+from core.related import RELATED_WORKS_COUNT, rebuild_related_works
+
+
+class RelatedWorksTests(TestCase):
+    """Related works are precomputed per category and kept current on writes"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.design = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/design.jpg', description='Design'
+        )
+        self.art = WorkCategory.objects.create(
+            name='art_projects', display_name='Art', image='categories/art.jpg', description='Art'
+        )
+        self.works = [self.add_work(self.design, f'Design {i}', order=i) for i in range(8)]
+
+    def add_work(self, category, title, order=0):
+        return Work.objects.create(
+            title=title, category=category, featured_image='works/w.jpg',
+            description='Description', display_order=order
+        )
+
+    def related_titles(self, work):
+        return [other.title for other in Work.objects.get(pk=work.pk).related_works.order_by('display_order')]
+
+    def test_lists_hold_the_category_head_without_the_work_itself(self):
+        self.assertEqual(self.related_titles(self.works[0]), [f'Design {i}' for i in range(1, 7)])
+        self.assertEqual(self.related_titles(self.works[3]), [f'Design {i}' for i in (0, 1, 2, 4, 5, 6)])
+        self.assertEqual(self.related_titles(self.works[7]), [f'Design {i}' for i in range(6)])
+
+    def test_reordering_and_moving_update_both_categories(self):
+        last = self.works[7]
+        last.display_order = -1
+        last.save()
+        self.assertEqual(self.related_titles(self.works[0])[0], 'Design 7')
+
+        last.category = self.art
+        last.save()
+        self.assertNotIn('Design 7', self.related_titles(self.works[0]))
+        self.assertEqual(self.related_titles(last), [])
+        sculpture = self.add_work(self.art, 'Sculpture')
+        self.assertEqual(self.related_titles(sculpture), ['Design 7'])
+
+    def test_deleting_a_work_refills_the_lists(self):
+        self.works[1].delete()
+        self.assertEqual(self.related_titles(self.works[0]), [f'Design {i}' for i in range(2, 8)])
+
+    def test_edits_that_keep_the_position_skip_the_rebuild(self):
+        work = self.works[2]
+        work.title = 'Renamed'
+        with CaptureQueriesContext(connection) as ctx:
+            work.save()
+        self.assertFalse(any('core_work_related_works' in query['sql'] for query in ctx.captured_queries))
+
+    def test_rebuild_repairs_bulk_created_works(self):
+        Work.objects.bulk_create([
+            Work(title='Bulk', slug='bulk', category=self.art, featured_image='works/w.jpg',
+                 description='Description')
+        ])
+        Work.related_works.through.objects.filter(from_work=self.works[0]).delete()
+        rebuild_related_works()
+        self.assertEqual(len(self.related_titles(self.works[0])), RELATED_WORKS_COUNT)
+        self.assertEqual(self.related_titles(Work.objects.get(slug='bulk')), [])
+
+    def test_detail_reads_related_works_in_one_query(self):
+        path = f'/api/works/{self.works[0].slug}/'
+        with CaptureQueriesContext(connection) as ctx:
+            data = APIClient().get(path).json()
+        self.assertEqual([work['title'] for work in data['related_works']], [f'Design {i}' for i in range(1, 7)])
+        self.assertEqual(data['related_works'][0]['category_name'], 'Design')
+        related_queries = [query for query in ctx.captured_queries if 'core_work_related_works' in query['sql']]
+        self.assertEqual(len(related_queries), 1)
+        self.assertFalse(any('FROM "core_workcategory" WHERE' in query['sql'] for query in ctx.captured_queries))
@@ -0,0 +1,53 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core import renderers
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer output is byte-for-byte JSONRenderer's"""
+
+    samples = [
+        {'title': 'Plain', 'count': 3, 'ok': True, 'missing': None, 'ratio': 0.25},
+        {'unicode': 'Kampala — café ✓ 漢字 🎨', 'control': 'tab\tnew\nline\x00\x1f"quote"\\'},
+        {'separators': 'line\u2028paragraph\u2029end', 'html': '<script>&</script>'},
+        {'when': datetime.datetime(2024, 5, 1, 12, 30, 5, 123456, tzinfo=datetime.timezone.utc),
+         'naive': datetime.datetime(2024, 5, 1, 12, 30), 'day': datetime.date(2024, 5, 1),
+         'time': datetime.time(9, 15), 'span': datetime.timedelta(hours=1, seconds=3)},
+        {'price': decimal.Decimal('12.50'), 'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+         'lazy': gettext_lazy('Projects'), 'raw': b'bytes', 'big': 2 ** 70},
+        {1: 'int key', 'nested': OrderedDict([('b', [1, (2, 3)]), ('a', {'deep': []})])},
+        ReturnDict({'results': ReturnList([{'id': 1}, {'id': 2}], serializer=None)}, serializer=None),
+        ['top', 'level', 'list'],
+        'just a string',
+        {},
+    ]
+
+    def test_output_matches_json_renderer(self):
+        for data in self.samples:
+            with self.subTest(data=data):
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_matches(self):
+        data = self.samples[0]
+        accepted = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(data, accepted), JSONRenderer().render(data, accepted))
+
+    def test_empty_and_unserializable_data(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'object': object()})
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            for data in self.samples:
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import Category, HeroSlide, NewsArticle, Project, SiteSettings
+from core.response_cache import normalize_query
+
+
+class ResponseCacheTests(TestCase):
+    """Anonymous GETs are served from the cache until a dependent model changes"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Civic')
+        self.project = Project.objects.create(
+            title='Pavilion', description='Summary', full_content='Body',
+            project_type='architecture', category=self.category
+        )
+
+    def test_repeat_requests_run_no_queries(self):
+        for path in ['/api/projects/', '/api/projects/pavilion/', '/api/projects/featured/',
+                     '/api/categories/', '/api/news/latest/', '/api/settings/current/']:
+            with self.subTest(path=path):
+                first = self.client.get(path)
+                with self.assertNumQueries(0):
+                    second = self.client.get(path)
+                self.assertEqual(second.status_code, 200)
+                self.assertEqual(second.content, first.content)
+                self.assertEqual(second['ETag'], first['ETag'])
+                self.assertEqual(second['Content-Type'], first['Content-Type'])
+
+    def test_cached_response_revalidates(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_query_param_order_shares_an_entry(self):
+        self.client.get('/api/projects/?project_type=architecture&ordering=title')
+        with self.assertNumQueries(0):
+            self.client.get('/api/projects/?ordering=title&project_type=architecture')
+        self.assertEqual(
+            normalize_query(QueryDict('b=2&a=1&a=0')), normalize_query(QueryDict('a=0&a=1&b=2'))
+        )
+
+    @override_settings(MEDIA_URL='/media/')
+    def test_hosts_get_their_own_entries(self):
+        HeroSlide.objects.create(image='hero/one.jpg', caption='Slide')
+        self.client.get('/api/hero-slides/')
+        response = self.client.get('/api/hero-slides/', HTTP_HOST='localhost')
+        self.assertEqual(response.json()['results'][0]['image'], 'http://localhost/media/hero/one.jpg')
+
+    def test_save_and_delete_invalidate(self):
+        self.client.get('/api/projects/pavilion/')
+        self.project.title = 'Renamed pavilion'
+        self.project.save()
+        self.assertEqual(self.client.get('/api/projects/pavilion/').json()['title'], 'Renamed pavilion')
+
+        self.client.get('/api/projects/')
+        self.project.delete()
+        self.assertEqual(self.client.get('/api/projects/').json()['count'], 0)
+
+    def test_dependency_change_invalidates(self):
+        self.client.get('/api/projects/')
+        self.category.name = 'Civic buildings'
+        self.category.save()
+        response = self.client.get('/api/projects/')
+        self.assertEqual(response.json()['results'][0]['category_name'], 'Civic buildings')
+
+    def test_author_change_invalidates_news(self):
+        author = User.objects.create_user('writer', first_name='Ada')
+        NewsArticle.objects.create(
+            title='Opening', excerpt='Excerpt', content='Body', author=author, published=True
+        )
+        self.client.get('/api/news/')
+        author.first_name = 'Grace'
+        author.save()
+        self.assertIn('Grace', self.client.get('/api/news/').content.decode())
+
+    def test_singleton_change_invalidates(self):
+        self.client.get('/api/settings/current/')
+        settings = SiteSettings.load()
+        settings.site_title = 'Renamed'
+        settings.save()
+        self.assertEqual(self.client.get('/api/settings/current/').json()['site_title'], 'Renamed')
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        staff = User.objects.create_user('staff', is_staff=True)
+        NewsArticle.objects.create(
+            title='Draft', excerpt='Excerpt', content='Body', author=staff, published=False
+        )
+        self.assertEqual(self.client.get('/api/news/').json()['count'], 0)
+
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.client.get('/api/news/').json()['count'], 1)
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/projects/missing/').status_code, 404)
+        Project.objects.create(
+            title='Missing', description='Summary', full_content='Body', project_type='art'
+        )
+        self.assertEqual(self.client.get('/api/projects/missing/').status_code, 200)
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Project, NewsArticle, WorkCategory, Work
+from core.search import search, repair_sqlite_search_triggers
+
+
+class FullTextSearchTests(TestCase):
+    """Relevance-ranked ?q= search backed by the database's full-text index"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.body_match = Project.objects.create(
+            title='Community hall', description='A timber hall',
+            full_content='The roof recalls a pavilion.', project_type='architecture'
+        )
+        self.title_match = Project.objects.create(
+            title='Brick pavilion', description='A summer pavilion',
+            full_content='Built from reclaimed brick.', project_type='architecture'
+        )
+        Project.objects.create(
+            title='Board game', description='Rules and pieces',
+            full_content='Playtesting notes.', project_type='game'
+        )
+
+    def titles(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.data['results']]
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.titles('/api/projects/?q=pavilion'), ['Brick pavilion', 'Community hall'])
+
+    def test_stemming_and_prefixes_match(self):
+        self.assertEqual(self.titles('/api/projects/?q=pavilions'), ['Brick pavilion', 'Community hall'])
+        self.assertEqual(self.titles('/api/projects/?q=playtest'), ['Board game'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.body_match.full_content = 'No longer relevant.'
+        self.body_match.save()
+        self.assertEqual(self.titles('/api/projects/?q=pavilion'), ['Brick pavilion'])
+
+        self.title_match.delete()
+        self.assertEqual(self.titles('/api/projects/?q=pavilion'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.titles('/api/projects/?q="brick OR (*'), [])
+        self.assertEqual(self.titles('/api/projects/?q=***'), [])
+
+    def test_news_and_works_are_searchable(self):
+        author = User.objects.create_user('writer')
+        NewsArticle.objects.create(
+            title='Exhibition opening', excerpt='Join us', content='Models and drawings.',
+            author=author, published=True
+        )
+        NewsArticle.objects.create(
+            title='Draft', excerpt='Hidden', content='An unpublished exhibition.', author=author
+        )
+        category = WorkCategory.objects.create(
+            name='omweso', display_name='Omweso', image='categories/o.jpg', description='Board games'
+        )
+        Work.objects.create(
+            title='Omweso board', category=category, featured_image='works/o.jpg',
+            description='Carved hardwood board'
+        )
+
+        self.assertEqual(self.titles('/api/news/?q=exhibition'), ['Exhibition opening'])
+        self.assertEqual(self.titles('/api/works/?q=hardwood'), ['Omweso board'])
+
+    def test_repair_reinstalls_dropped_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 triggers are SQLite-only')
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER core_project_fts_{suffix}')
+        repair_sqlite_search_triggers()
+
+        Project.objects.create(
+            title='Observatory', description='Dome', full_content='Telescope', project_type='design'
+        )
+        self.assertEqual(
+            [p.title for p in search(Project.objects.all(), 'telescope')], ['Observatory']
+        )
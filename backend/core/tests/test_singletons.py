@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.cache import SingletonCache, singletons
+from core.models import SiteSettings, AboutSection, SloganSection
+
+
+class SingletonCacheTests(TestCase):
+    """Singleton rows are served from worker memory until a save bumps the stamp"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+
+    def test_repeat_loads_run_no_queries(self):
+        for model in (SiteSettings, AboutSection, SloganSection):
+            model.load()
+            with self.assertNumQueries(0):
+                model.load()
+
+    def test_save_invalidates_cached_copy(self):
+        settings = SiteSettings.load()
+        settings.site_title = 'Renamed'
+        settings.save()
+        self.assertEqual(SiteSettings.load().site_title, 'Renamed')
+
+    def test_save_invalidates_other_workers(self):
+        other_worker = SingletonCache()
+        self.assertEqual(other_worker.get(SloganSection).text, SloganSection.load().text)
+
+        slogan = SloganSection.load()
+        slogan.text = 'A new slogan'
+        slogan.save()
+
+        self.assertEqual(other_worker.get(SloganSection).text, 'A new slogan')
+
+    def test_load_returns_independent_copies(self):
+        first = SiteSettings.load()
+        first.tagline = 'Unsaved edit'
+        self.assertNotEqual(SiteSettings.load().tagline, 'Unsaved edit')
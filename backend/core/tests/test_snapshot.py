@@ -0,0 +1,105 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.cache import singletons
+from core.models import AboutSection, Collaboration, NewsArticle, Project, SiteSettings, SloganSection
+from core.snapshot import SnapshotExporter
+
+
+class SnapshotExportTests(TestCase):
+    """The public API exports to static JSON, incrementally and atomically"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        for i in range(13):
+            Project.objects.create(
+                title=f'Project {i}', description='Summary', full_content='Body', project_type='design',
+                featured=i == 0
+            )
+        author = User.objects.create_user('writer')
+        NewsArticle.objects.create(
+            title='Draft', excerpt='Excerpt', content='Body', author=author, published=False
+        )
+        Collaboration.objects.create(name='Ada', email='ada@example.com', project_type='design',
+                                     message='Hello')
+        # `current` creates missing singletons; do it up front so the first export is complete
+        for model in (SiteSettings, AboutSection, SloganSection):
+            model.load()
+
+    def export(self, **kwargs):
+        exporter = SnapshotExporter(self.root, host='testserver', **kwargs)
+        return exporter, exporter.run()
+
+    def read(self, path):
+        return json.loads((self.root / path.lstrip('/') / 'index.json').read_text())
+
+    def test_exports_lists_pages_details_and_actions(self):
+        self.export()
+        self.assertEqual(self.read('/api/projects/')['count'], 13)
+        self.assertEqual(self.read('/api/projects/project-3/')['title'], 'Project 3')
+        self.assertEqual(len(self.read('/api/projects/featured/')), 1)
+        self.assertIn('site_title', self.read('/api/settings/current/'))
+        self.assertIn('featured_projects', self.read('/api/home/'))
+
+    def test_page_links_point_at_snapshot_files(self):
+        self.export()
+        first, second = self.read('/api/projects/'), self.read('/api/projects/page/2/')
+        self.assertEqual(first['next'], '/api/projects/page/2/')
+        self.assertEqual(second['previous'], '/api/projects/')
+        self.assertIsNone(second['next'])
+        self.assertEqual(len(first['results']) + len(second['results']), 13)
+
+    def test_private_rows_and_endpoints_are_not_exported(self):
+        self.export()
+        self.assertFalse((self.root / 'api/collaborations').exists())
+        self.assertFalse((self.root / 'api/news/draft').exists())
+        self.assertEqual(self.read('/api/news/')['count'], 0)
+
+    def test_reexport_only_touches_changed_endpoints(self):
+        self.export()
+        exporter, stats = self.export()
+        self.assertEqual(stats['written'], 0)
+        self.assertEqual(stats['rendered'], 0)
+        self.assertEqual(exporter.version, 1)
+
+        project = Project.objects.get(slug='project-5')
+        project.description = 'Updated summary'
+        project.save()
+        untouched = self.root / 'api/categories/index.json'
+        mtime = untouched.stat().st_mtime_ns
+
+        exporter, stats = self.export()
+        self.assertEqual(exporter.version, 2)
+        self.assertEqual(self.read('/api/projects/project-5/')['description'], 'Updated summary')
+        self.assertEqual(untouched.stat().st_mtime_ns, mtime)
+        manifest = json.loads((self.root / 'manifest.json').read_text())
+        self.assertEqual(manifest['files']['/api/projects/project-5/']['version'], 2)
+        self.assertEqual(manifest['files']['/api/projects/project-4/']['version'], 1)
+
+    def test_deleted_objects_are_removed(self):
+        self.export()
+        Project.objects.filter(slug__in=['project-11', 'project-12']).delete()
+        _, stats = self.export()
+        self.assertFalse((self.root / 'api/projects/project-12').exists())
+        # Two details plus the now-empty second page
+        self.assertEqual(stats['removed'], 3)
+        self.assertIsNone(self.read('/api/projects/')['next'])
+
+    def test_no_temporary_files_are_left_behind(self):
+        self.export()
+        self.assertEqual([path for path in self.root.rglob('*') if path.name.startswith('.')], [])
+
+    def test_command_reports_the_snapshot(self):
+        out = StringIO()
+        call_command('export_api', '--output', str(self.root), '--host', 'testserver', stdout=out)
+        self.assertIn('Snapshot v1', out.getvalue())
+        self.assertTrue((self.root / 'manifest.json').exists())
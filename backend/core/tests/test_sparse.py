@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.cache import singletons
+from core.models import Category, NewsArticle, Project, WorkCategory, Work
+from core.pagination import KeysetPagination
+from core.serializers import WorkDetailSerializer
+
+
+class SparseFieldsetTests(TestCase):
+    """?fields= trims responses and the columns behind them; ?expand= adds nested objects"""
+
+    def setUp(self):
+        cache.clear()
+        singletons.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Civic')
+        for i in range(3):
+            Project.objects.create(
+                title=f'Project {i}', description='Summary', full_content='Long body ' * 50,
+                project_type='design', category=self.category, display_order=i
+            )
+        design = WorkCategory.objects.create(
+            name='design', display_name='Design', image='categories/design.jpg', description='Design'
+        )
+        for i in range(3):
+            Work.objects.create(title=f'Work {i}', category=design, featured_image='works/w.jpg',
+                                description='Description', display_order=i)
+
+    def get(self, path, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query['sql'] for query in ctx.captured_queries]
+
+    def test_fields_trims_list_and_detail_payloads(self):
+        data, _ = self.get('/api/projects/', fields='id,title')
+        self.assertEqual(data['results'][0], {'id': data['results'][0]['id'], 'title': 'Project 0'})
+        data, _ = self.get('/api/projects/project-1/', fields='title,gallery_images')
+        self.assertEqual(data, {'title': 'Project 1', 'gallery_images': []})
+
+    def test_unrequested_columns_and_joins_are_deferred(self):
+        _, queries = self.get('/api/projects/', fields='id,title')
+        select = next(sql for sql in queries if 'FROM "core_project"' in sql and 'LIMIT' in sql)
+        self.assertNotIn('full_content', select)
+        self.assertNotIn('"description"', select)
+        self.assertNotIn('JOIN', select)
+
+    def test_related_columns_are_narrowed(self):
+        data, queries = self.get('/api/projects/', fields='title,category_name')
+        self.assertEqual(data['results'][0]['category_name'], 'Civic')
+        select = next(sql for sql in queries if 'FROM "core_project"' in sql and 'LIMIT' in sql)
+        self.assertIn('"core_category"."name"', select)
+        self.assertNotIn('"core_category"."description"', select)
+
+    def test_unrequested_method_fields_are_not_computed(self):
+        with mock.patch.object(WorkDetailSerializer, 'get_related_works') as related:
+            data, _ = self.get('/api/works/work-0/', fields='title')
+        related.assert_not_called()
+        self.assertEqual(data, {'title': 'Work 0'})
+
+    def test_expand_adds_nested_objects(self):
+        data, _ = self.get('/api/projects/', expand='category', fields='title,category')
+        self.assertEqual(data['results'][0]['category']['name'], 'Civic')
+        self.assertEqual(data['results'][0]['category']['project_count'], 3)
+        data, _ = self.get('/api/works/', expand='category')
+        self.assertEqual(data['results'][0]['category']['display_name'], 'Design')
+        self.assertIn('category_name', data['results'][0])
+
+    def test_default_responses_are_unchanged(self):
+        data, _ = self.get('/api/projects/project-0/')
+        self.assertIn('full_content', data)
+        self.assertEqual(data['category']['name'], 'Civic')
+        self.assertNotIn('category', self.get('/api/projects/')[0]['results'][0])
+
+    def test_keyset_cursor_works_with_sparse_rows(self):
+        with mock.patch.object(KeysetPagination, 'page_size', 1):
+            data, _ = self.get('/api/projects/', fields='title', cursor='')
+            with CaptureQueriesContext(connection) as ctx:
+                page = self.client.get(data['next']).json()
+        self.assertEqual(page['results'][0], {'title': 'Project 1'})
+        self.assertFalse(any('WHERE "core_project"."id" =' in query['sql'] for query in ctx.captured_queries))
+
+    def test_writes_ignore_fields(self):
+        staff = User.objects.create_user('staff', is_staff=True)
+        self.client.force_authenticate(staff)
+        response = self.client.post('/api/news/?fields=title', {
+            'title': 'Opening', 'excerpt': 'Excerpt', 'content': 'Body', 'published': True
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('content', response.json())
+        self.assertTrue(NewsArticle.objects.filter(slug='opening').exists())
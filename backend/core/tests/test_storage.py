@@ -0,0 +1,570 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from io import StringIO
+from unittest import mock
+
+import httpx
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import HeroSlide, PendingDeletion, StoredFile
+from utils import media_cache, supabase_storage
+from utils.fake_storage import RESET, FakeStorageServer
+from utils.supabase_client import RESUMABLE_CHUNK_SIZE, close_clients
+from utils.supabase_storage import SupabaseStorage, public_url
+
+
+@override_settings(MEDIA_CACHE_DIR='', MEDIA_DELETIONS_IN_BACKGROUND=False)
+class SupabaseStorageTests(TestCase):
+    """SupabaseStorage against a local stand-in for the Storage API"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.storage = SupabaseStorage()
+        self.addCleanup(close_clients)
+
+    def test_save_indexes_the_object(self):
+        name = self.storage.save('projects/gallery/plan.jpg', ContentFile(b'jpeg bytes', name='plan.jpg'))
+        self.assertEqual(name, 'projects/gallery/plan.jpg')
+        self.assertEqual(self.server.objects[name][1], b'jpeg bytes')
+        stored = StoredFile.objects.get(name=name)
+        self.assertEqual(stored.size, 10)
+
+    def test_exists_and_size_never_list_the_bucket(self):
+        name = self.storage.save('projects/gallery/plan.jpg', ContentFile(b'jpeg bytes'))
+        self.server.requests.clear()
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(self.storage.size(name), 10)
+        # Both answered from the index
+        self.assertEqual(self.server.requests, [])
+
+        self.assertFalse(self.storage.exists('projects/gallery/missing.jpg'))
+        self.assertEqual(self.storage.size('projects/gallery/missing.jpg'), 0)
+        self.assertEqual(self.server.calls('POST'), [])
+
+    def test_objects_missing_from_the_index_are_looked_up_individually(self):
+        self.server.objects['news/old.png'] = ('image/png', b'png bytes!!')
+        self.assertTrue(self.storage.exists('news/old.png'))
+        self.assertEqual(self.server.calls('HEAD'), ['/storage/v1/object/test-media/news/old.png'])
+        self.assertEqual(self.storage.size('news/old.png'), 11)
+        self.assertEqual(StoredFile.objects.get(name='news/old.png').content_type, 'image/png')
+        self.assertEqual(self.storage.size('news/old.png'), 11)
+        self.assertEqual(len(self.server.calls('GET')), 1)
+
+    def test_taken_names_get_an_alternative(self):
+        first = self.storage.save('works/piece.jpg', ContentFile(b'one'))
+        second = self.storage.save('works/piece.jpg', ContentFile(b'two'))
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.server.objects[second][1], b'two')
+
+    def test_delete_removes_the_index_row(self):
+        name = self.storage.save('hero/slide.jpg', ContentFile(b'slide'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(name)
+        self.assertNotIn(name, self.server.objects)
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse(self.storage.exists(name))
+
+    def test_public_urls_match_the_client(self):
+        from supabase import create_client
+
+        bucket = create_client(self.server.url, 'test-key').storage.from_('test-media')
+        for name in ['projects/gallery/plan.jpg', '/hero/slide 1.jpg', 'news/café €.png',
+                     "works/a+b&c=d;e,f!'()*~:@$.jpg", 'team/100%.jpg']:
+            with self.subTest(name=name):
+                self.assertEqual(self.storage.url(name), bucket.get_public_url(name))
+
+    def test_urls_make_no_client_calls(self):
+        with mock.patch('utils.supabase_client.get_storage_client') as client:
+            urls = [self.storage.url(f'works/work-{i}.jpg') for i in range(100)]
+        client.assert_not_called()
+        self.assertEqual(urls[0], f'{self.server.url}/storage/v1/object/public/test-media/works/work-0.jpg')
+
+    def test_cdn_origin_rewrite(self):
+        self.assertEqual(
+            public_url('https://abc.supabase.co', 'media', 'works/a.jpg', cdn_url='https://cdn.example.com/'),
+            'https://cdn.example.com/storage/v1/object/public/media/works/a.jpg'
+        )
+
+
+@override_settings(MEDIA_CACHE_DIR='')
+class SupabaseClientTests(TestCase):
+    """One lazily created, pooled client per process"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+
+    def test_importing_the_backend_does_not_load_the_sdk(self):
+        script = (
+            'import sys, django; django.setup(); '
+            'from utils.supabase_storage import SupabaseStorage; SupabaseStorage().url("a.jpg"); '
+            'print(sorted(m for m in ("supabase", "storage3", "httpx") if m in sys.modules))'
+        )
+        self.server.objects.pop('warm-up.txt', None)
+        self.server.objects['warm-up-copy.txt'] = ('text/plain', b'x')
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                                env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'api.settings'})
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_the_client_imports_without_django(self):
+        # The cold-start benchmark times exactly this import
+        script = 'from utils.supabase_client import get_storage_client; print("django.apps" in __import__("sys").modules)'
+        env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, env=env)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_storages_share_one_client_and_reuse_connections(self):
+        first, second = SupabaseStorage(), SupabaseStorage()
+        self.assertIs(first.client, second.client)
+        for i in range(5):
+            first.save(f'works/piece-{i}.jpg', ContentFile(b'bytes'))
+            second.bucket.download(f'works/piece-{i}.jpg')
+        # An existence check and an upload per save, plus the downloads
+        self.assertEqual(len(self.server.requests), 15)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_idempotent_requests_are_retried(self):
+        storage = SupabaseStorage()
+        self.server.objects['news/a.jpg'] = ('image/jpeg', b'jpeg')
+        self.server.failures = [503, 502]
+        with mock.patch('utils.supabase_client.time.sleep') as sleep:
+            self.assertEqual(storage.bucket.download('news/a.jpg'), b'jpeg')
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.25, 0.5])
+
+    def test_uploads_are_not_resent(self):
+        storage = SupabaseStorage()
+        self.server.failures = [503]
+        with self.assertRaises(Exception):
+            storage._save('works/once.jpg', ContentFile(b'bytes'))
+        self.assertEqual(len(self.server.calls('POST')), 1)
+
+
+# Run in a child process by StreamingTransferTests.peak_memory; prints the peak RSS growth
+PEAK_MEMORY_SCRIPT = """
+import resource, sys
+from unittest import mock
+import django
+django.setup()
+from django.core.files import File
+from django.core.files.base import ContentFile
+from utils.supabase_storage import SupabaseStorage
+
+operation, name, path = sys.argv[1:]
+storage = SupabaseStorage()
+# Uploads aren't indexed: this process isn't on the test database
+mock.patch.object(SupabaseStorage, '_index').start()
+mock.patch('utils.supabase_storage.PendingDeletion').start()
+storage._save('warm-up.txt', ContentFile(b'x'))
+with storage.open('warm-up-copy.txt') as file:
+    file.read()
+
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if operation == 'upload':
+    with open(path, 'rb') as file:
+        storage._save(name, File(file))
+else:
+    with storage.open(name) as file:
+        for _ in file.chunks():
+            pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+
+
+@override_settings(MEDIA_CACHE_DIR='')
+class StreamingTransferTests(TestCase):
+    """Uploads and downloads move through memory a chunk at a time"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer(keep_bodies=False))
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        self.storage = SupabaseStorage()
+
+    def test_open_streams_a_file(self):
+        data = os.urandom(300 * 1024)
+        self.server.objects['news/report.pdf'] = ('application/pdf', data)
+        with self.storage.open('news/report.pdf') as file:
+            self.assertIsInstance(file, File)
+            self.assertEqual(file.size, len(data))
+            self.assertEqual(file.read(10), data[:10])
+            self.assertEqual(file.read(), data[10:])
+
+    def test_large_uploads_are_resumable_and_chunked(self):
+        data = os.urandom(2 * RESUMABLE_CHUNK_SIZE + 1000)
+        name = self.storage.save('works/portfolio.pdf', ContentFile(data))
+        self.assertEqual(len(self.server.calls('PATCH')), 3)
+        self.assertEqual(self.server.received[name], (len(data), hashlib.sha256(data).hexdigest()))
+        self.assertEqual(StoredFile.objects.get(name=name).size, len(data))
+
+    def test_failed_chunks_resume_from_the_server_offset(self):
+        data = os.urandom(2 * RESUMABLE_CHUNK_SIZE + 1000)
+        self.server.failures = [('PATCH', 503)]
+        with mock.patch('utils.supabase_client.time.sleep'):
+            name = self.storage.save('works/portfolio.pdf', ContentFile(data))
+        self.assertEqual(self.server.calls('HEAD')[-1], '/storage/v1/upload/resumable/1')
+        self.assertEqual(self.server.received[name], (len(data), hashlib.sha256(data).hexdigest()))
+
+    def peak_memory(self, operation, name, path=''):
+        """
+        Growth in peak RSS, in bytes, of a fresh process running one transfer
+        A small transfer first warms the client up, so only the sized one is measured.
+        """
+        self.server.objects.pop('warm-up.txt', None)
+        self.server.objects['warm-up-copy.txt'] = ('text/plain', b'x')
+        result = subprocess.run(
+            [sys.executable, '-c', PEAK_MEMORY_SCRIPT, operation, name, path], capture_output=True, text=True,
+            check=True, env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'api.settings', 'MEDIA_CACHE_DIR': ''},
+        )
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        return int(result.stdout) * (1 if sys.platform == 'darwin' else 1024)
+
+    def test_peak_memory_stays_flat_as_files_grow(self):
+        mib = 1024 * 1024
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        uploads, downloads = [], []
+        for size in (8 * mib, 32 * mib):
+            path = os.path.join(directory, f'{size}.jpg')
+            with open(path, 'wb') as file:
+                for _ in range(size // mib):
+                    file.write(b'x' * mib)
+            uploads.append(self.peak_memory('upload', f'hero/{size}.jpg', path))
+            self.server.objects[f'hero/{size}-copy.jpg'] = ('image/jpeg', b'x' * size)
+            downloads.append(self.peak_memory('download', f'hero/{size}-copy.jpg'))
+        # Transfers move CHUNK_SIZE pieces, so no file size raises the peak by more
+        # than noise; buffering the 32 MiB file whole would
+        for growth in uploads + downloads:
+            self.assertLess(growth, 4 * mib)
+
+
+class MediaCacheTests(TestCase):
+    """_open() reads through a shared, size-capped disk cache validated by ETag"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_CACHE_DIR=self.root, MEDIA_CACHE_MAX_SIZE=1000))
+        self.storage = SupabaseStorage()
+
+    def read(self, name, storage=None):
+        with (storage or self.storage).open(name) as file:
+            return file.read()
+
+    def test_repeat_reads_are_served_from_disk(self):
+        self.server.objects['works/piece.jpg'] = ('image/jpeg', b'x' * 300)
+        self.assertEqual(self.read('works/piece.jpg'), b'x' * 300)
+        self.server.requests.clear()
+        with self.storage.open('works/piece.jpg') as file:
+            self.assertEqual(file.size, 300)
+            self.assertEqual(file.read(), b'x' * 300)
+        # One conditional GET answered 304, no body
+        self.assertEqual(self.server.calls('GET'), ['/storage/v1/object/test-media/works/piece.jpg'])
+        stats = self.storage.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+        self.assertEqual((stats['files'], stats['size']), (1, 300))
+        out = StringIO()
+        call_command('media_cache', stdout=out)
+        self.assertIn('Hit rate: 50.0%', out.getvalue())
+        call_command('media_cache', clear=True, stdout=out)
+        self.assertIsNone(self.storage.cache.lookup('works/piece.jpg'))
+
+    def test_objects_changed_elsewhere_are_fetched_again(self):
+        self.server.objects['works/piece.jpg'] = ('image/jpeg', b'old')
+        self.read('works/piece.jpg')
+        # Another host overwrote it: the ETag moves on
+        self.server.objects['works/piece.jpg'] = ('image/jpeg', b'new')
+        self.assertEqual(self.read('works/piece.jpg'), b'new')
+        self.assertEqual(self.read('works/piece.jpg'), b'new')
+        stats = self.storage.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['files']), (1, 2, 1))
+
+    def test_save_and_delete_invalidate(self):
+        name = self.storage.save('hero/slide.jpg', ContentFile(b'slide'))
+        self.read(name)
+        self.assertIsNotNone(self.storage.cache.lookup(name))
+        self.storage.delete(name)
+        self.assertIsNone(self.storage.cache.lookup(name))
+
+        self.server.store(name, 'image/jpeg', b'one')
+        self.read(name)
+        self.server.objects.pop(name)
+        self.storage._save(name, ContentFile(b'two'))
+        self.assertIsNone(self.storage.cache.lookup(name))
+        self.assertEqual(self.read(name), b'two')
+
+    def test_least_recently_used_copies_are_evicted_past_the_cap(self):
+        for name in ('a.jpg', 'b.jpg', 'c.jpg', 'd.jpg'):
+            self.server.objects[name] = ('image/jpeg', name.encode() * 60)
+        for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+            self.read(name)
+            os.utime(self.storage.cache.lookup(name)[1], (1, {'a.jpg': 10, 'b.jpg': 20, 'c.jpg': 30}[name]))
+        # A hit makes a.jpg the most recently used
+        self.read('a.jpg')
+        self.read('d.jpg')
+        cached = {name for name in ('a.jpg', 'b.jpg', 'c.jpg', 'd.jpg') if self.storage.cache.lookup(name)}
+        self.assertEqual(cached, {'a.jpg', 'c.jpg', 'd.jpg'})
+        self.assertLessEqual(self.storage.cache.stats()['size'], 1000)
+
+    def test_misses_only_scan_the_cache_once_it_is_full(self):
+        names = [f'{letter}.jpg' for letter in 'abcd']
+        for name in names:
+            self.server.objects[name] = ('image/jpeg', name.encode() * 60)
+        with mock.patch.object(media_cache.MediaCache, '_files', autospec=True,
+                               side_effect=media_cache.MediaCache._files) as scans:
+            # 300 bytes each against a 1000-byte cap
+            for name in names[:3]:
+                self.read(name)
+            # Once, to seed the running total
+            self.assertEqual(scans.call_count, 1)
+            self.read(names[3])
+            self.assertEqual(scans.call_count, 2)
+        self.assertEqual(media_cache._sizes[self.root], self.storage.cache.stats()['size'])
+
+    def test_objects_larger_than_the_cache_stream_straight_through(self):
+        self.server.objects['news/report.pdf'] = ('application/pdf', b'p' * 5000)
+        self.assertEqual(self.read('news/report.pdf'), b'p' * 5000)
+        self.assertIsNone(self.storage.cache.lookup('news/report.pdf'))
+        self.assertEqual(self.storage.cache.stats()['misses'], 1)
+
+    def test_workers_share_the_cache(self):
+        self.server.objects['works/piece.jpg'] = ('image/jpeg', b'shared' * 50)
+        storages = [SupabaseStorage() for _ in range(8)]
+        results = [None] * len(storages)
+
+        def read(index):
+            results[index] = self.read('works/piece.jpg', storages[index])
+
+        threads = [threading.Thread(target=read, args=(i,)) for i in range(len(storages))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [b'shared' * 50] * len(storages))
+        self.assertEqual(self.read('works/piece.jpg'), b'shared' * 50)
+        stats = self.storage.cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], len(storages) + 1)
+        self.assertEqual(stats['files'], 1)
+        # No temporary files left behind
+        leftovers = [name for _, _, names in os.walk(self.root) for name in names if name.startswith('.tmp-')]
+        self.assertEqual(leftovers, [])
+
+    @unittest.skipIf(media_cache.fcntl is None, 'needs flock')
+    def test_reads_never_wait_for_the_stats_file(self):
+        self.server.objects['works/piece.jpg'] = ('image/jpeg', b'shared' * 50)
+        self.read('works/piece.jpg')
+        # Another process is writing its counts
+        with open(os.path.join(self.root, media_cache.STATS_FILE), 'a') as held:
+            media_cache.fcntl.flock(held, media_cache.fcntl.LOCK_EX)
+            with mock.patch.object(media_cache, 'STATS_FLUSH_INTERVAL', 0):
+                reader = threading.Thread(target=self.read, args=('works/piece.jpg',))
+                reader.start()
+                reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+            media_cache.fcntl.flock(held, media_cache.fcntl.LOCK_UN)
+        # The skipped count went out with the next flush
+        stats = self.storage.cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 2)
+
+
+@override_settings(MEDIA_CACHE_DIR='', MEDIA_DELETIONS_IN_BACKGROUND=False)
+class DeletionQueueTests(TestCase):
+    """delete() only queues; queued objects go out in one remove() per batch"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        self.storage = SupabaseStorage()
+        self.names = [f'projects/gallery/{i}.jpg' for i in range(4)]
+        for name in self.names:
+            self.server.objects[name] = ('image/jpeg', b'gallery')
+
+    def test_deletions_in_one_transaction_share_a_request(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for name in self.names:
+                self.storage.delete(name)
+        # Nothing sent before the commit
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(PendingDeletion.objects.count(), 4)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.server.calls('DELETE'), ['/storage/v1/object/test-media'])
+        self.assertFalse(any(name in self.server.objects for name in self.names))
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    def test_batches_are_capped(self):
+        self.storage.queue_deletions(self.names)
+        with mock.patch.object(supabase_storage, 'DELETE_BATCH_SIZE', 3):
+            self.assertEqual(self.storage.flush_deletions(), (4, 0))
+        self.assertEqual(len(self.server.calls('DELETE')), 2)
+
+    def test_failed_batches_stay_queued_and_back_off(self):
+        self.server.failures = [('DELETE', 400)]
+        self.storage.queue_deletions(self.names)
+        with self.assertLogs('utils.supabase_storage', 'WARNING'):
+            self.assertEqual(self.storage.flush_deletions(), (0, 4))
+        pending = PendingDeletion.objects.first()
+        self.assertEqual(pending.attempts, 1)
+        self.assertIn('Injected', pending.last_error)
+        # Not due yet
+        self.assertEqual(self.storage.flush_deletions(), (0, 0))
+        self.assertTrue(all(name in self.server.objects for name in self.names))
+
+        out = StringIO()
+        call_command('flush_media_deletions', all=True, stdout=out)
+        self.assertIn('Removed 4 file(s), 0 failed, 0 still queued', out.getvalue())
+        self.assertFalse(any(name in self.server.objects for name in self.names))
+
+    def test_saves_after_a_failed_flush_survive_it(self):
+        name, other = self.names[:2]
+        self.storage.delete(name)
+        self.server.failures = [('DELETE', 400)]
+        with self.assertLogs('utils.supabase_storage', 'WARNING'):
+            self.storage.flush_deletions()
+        # Still queued, so still taken
+        saved = self.storage.save(name, ContentFile(b'new'))
+        self.assertNotEqual(saved, name)
+        # Saving straight over a queued name takes it out of the queue
+        self.storage.queue_deletions([other])
+        # Looking a queued object up doesn't save it
+        self.storage.size(other)
+        self.assertTrue(PendingDeletion.objects.filter(name=other).exists())
+        del self.server.objects[other]
+        self.storage._save(other, ContentFile(b'replacement'))
+
+        call_command('flush_media_deletions', all=True, stdout=StringIO())
+        self.assertNotIn(name, self.server.objects)
+        self.assertEqual(self.server.objects[saved][1], b'new')
+        self.assertEqual(self.server.objects[other][1], b'replacement')
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    @override_settings(MEDIA_DELETIONS_IN_BACKGROUND=True)
+    def test_flushes_run_off_the_calling_thread(self):
+        threads = []
+        with mock.patch.object(SupabaseStorage, 'flush_deletions', lambda storage: threads.append(
+            threading.current_thread().name
+        )):
+            supabase_storage.schedule_flush(self.storage).result(timeout=5)
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('media-deletions'))
+
+
+@override_settings(MEDIA_CACHE_DIR='', MEDIA_DELETIONS_IN_BACKGROUND=False)
+class SweepMediaTests(TestCase):
+    """sweep_media removes stored images nothing refers to"""
+
+    def setUp(self):
+        self.server = self.enterContext(FakeStorageServer())
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': self.server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        HeroSlide.objects.bulk_create([
+            HeroSlide(image='hero/kept.jpg', caption='Kept', image_variants={
+                'image': {'source': 'hero/kept.jpg', 'formats': {'webp': {'320': 'hero/kept.320w.webp'}}},
+            }),
+            HeroSlide(image='hero/gone.jpg', caption='Gone'),
+        ])
+        for name in ('hero/kept.jpg', 'hero/kept.320w.webp', 'hero/orphan.jpg',
+                     'projects/gallery/orphan.jpg', 'documents/brief.pdf'):
+            self.server.objects[name] = ('image/jpeg', b'bytes')
+        # Just uploaded; its row may not be saved yet
+        self.server.store('hero/fresh.jpg', 'image/jpeg', b'bytes')
+
+    def sweep(self, **options):
+        out = StringIO()
+        call_command('sweep_media', stdout=out, stderr=out, **options)
+        return out.getvalue()
+
+    def test_dry_run_reports_only(self):
+        output = self.sweep(dry_run=True)
+        self.assertIn('2 orphaned, 1 missing', output)
+        self.assertIn('Missing from the bucket: hero/gone.jpg', output)
+        self.assertEqual(self.server.calls('DELETE'), [])
+
+    def test_old_orphans_under_image_directories_are_removed_together(self):
+        # Small pages, to walk the listing's pagination
+        with mock.patch.object(supabase_storage, 'LIST_PAGE_SIZE', 2):
+            output = self.sweep()
+        self.assertIn('Removed 2 file(s)', output)
+        self.assertEqual(len(self.server.calls('DELETE')), 1)
+        self.assertEqual(sorted(self.server.objects), [
+            'documents/brief.pdf', 'hero/fresh.jpg', 'hero/kept.320w.webp', 'hero/kept.jpg',
+        ])
+
+
+@override_settings(MEDIA_CACHE_DIR='')
+class FakeStorageServerTests(TestCase):
+    """The stand-in's latency and failure injection, for offline benchmarks"""
+
+    def start(self, **options):
+        server = self.enterContext(FakeStorageServer(**options))
+        self.enterContext(mock.patch.dict(os.environ, {
+            'SUPABASE_URL': server.url, 'SUPABASE_KEY': 'test-key', 'SUPABASE_BUCKET': 'test-media',
+        }))
+        self.addCleanup(close_clients)
+        return server, SupabaseStorage()
+
+    def test_public_urls_are_served_without_a_key(self):
+        server, storage = self.start()
+        server.objects['works/piece.jpg'] = ('image/jpeg', b'public bytes')
+        response = httpx.get(storage.url('works/piece.jpg'))
+        self.assertEqual((response.status_code, response.content), (200, b'public bytes'))
+
+    def test_latency_and_bandwidth_slow_every_request(self):
+        server, storage = self.start(latency=0.05, bandwidth=100_000)
+        server.objects['works/piece.jpg'] = ('image/jpeg', b'x' * 10_000)
+        start = time.perf_counter()
+        self.assertTrue(storage.exists('works/piece.jpg'))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        start = time.perf_counter()
+        with storage.open('works/piece.jpg') as file:
+            file.read()
+        # Latency plus 10 KB at 100 KB/s
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+
+    def test_failure_rate_is_repeatable_for_a_seed(self):
+        def statuses(seed):
+            server, _ = self.start(failure_rate=0.5, seed=seed)
+            server.objects['works/piece.jpg'] = ('image/jpeg', b'bytes')
+            with httpx.Client() as client:
+                return [client.head(f'{server.url}/storage/v1/object/test-media/works/piece.jpg').status_code
+                        for _ in range(20)]
+
+        first = statuses(seed=1)
+        self.assertEqual(set(first), {200, 503})
+        self.assertEqual(statuses(seed=1), first)
+        self.assertNotEqual(statuses(seed=2), first)
+
+    def test_dropped_connections_are_retried_for_reads(self):
+        server, storage = self.start()
+        server.objects['works/piece.jpg'] = ('image/jpeg', b'bytes')
+        server.failures = [RESET]
+        with storage.open('works/piece.jpg') as file:
+            self.assertEqual(file.read(), b'bytes')
+        self.assertEqual(len(server.calls('GET')), 2)
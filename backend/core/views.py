@@ -1,6 +1,9 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.contrib.auth.models import User
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
@@ -16,6 +19,13 @@ from .serializers import (
     WorkDetailSerializer, TeamMemberSerializer, AboutSectionSerializer,
     SloganSectionSerializer
 )
+from .conditional import ConditionalGetMixin
+from .response_cache import ResponseCacheMixin
+from .pagination import OptInCursorPagination
+from .projection import ValuesListMixin
+from .search import FullTextSearchFilter
+from .sparse import SparseQuerysetMixin
+from .homepage import get_home_payload
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -27,7 +37,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for Category model"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -36,17 +46,22 @@ class CategoryViewSet(viewsets.ModelViewSet):
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at']
+    conditional_dependencies = [Project]
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     """ViewSet for Project model"""
-    queryset = Project.objects.all()
+    queryset = Project.objects.select_related('category')
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptInCursorPagination
+    filter_backends = [DjangoFilterBackend, SearchFilter, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['project_type', 'category', 'featured']
     search_fields = ['title', 'description', 'full_content']
     ordering_fields = ['display_order', 'created_at', 'title']
+    # Category names and per-category project counts are rendered too
+    conditional_dependencies = [Category, Project]
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -57,8 +72,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def featured(self, request):
         """Get featured projects for homepage"""
         featured_projects = self.queryset.filter(featured=True)
-        serializer = ProjectListSerializer(featured_projects, many=True)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, featured_projects,
+            lambda: Response(ProjectListSerializer(featured_projects, many=True).data)
+        )
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
@@ -66,26 +83,34 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project_type = request.query_params.get('type', None)
         if project_type:
             projects = self.queryset.filter(project_type=project_type)
-            serializer = ProjectListSerializer(projects, many=True)
-            return Response(serializer.data)
+            return self.conditional_response(
+                request, projects,
+                lambda: Response(ProjectListSerializer(projects, many=True).data)
+            )
         return Response({"error": "Please provide a type parameter"}, 
                        status=status.HTTP_400_BAD_REQUEST)
 
 
-class NewsArticleViewSet(viewsets.ModelViewSet):
+class NewsArticleViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin,
+                         viewsets.ModelViewSet):
     """ViewSet for NewsArticle model"""
+    queryset = NewsArticle.objects.select_related('author')
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptInCursorPagination
+    filter_backends = [DjangoFilterBackend, SearchFilter, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['published', 'author']
     search_fields = ['title', 'excerpt', 'content']
     ordering_fields = ['publish_date', 'created_at', 'title']
+    # Author names are rendered on every article
+    conditional_dependencies = [User]
     
     def get_queryset(self):
         """Only show published articles to non-admin users"""
+        queryset = super().get_queryset()
         if self.request.user.is_staff:
-            return NewsArticle.objects.all()
-        return NewsArticle.objects.filter(published=True)
+            return queryset
+        return queryset.filter(published=True)
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -100,15 +125,18 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
     def latest(self, request):
         """Get latest published articles"""
         count = int(request.query_params.get('count', 3))
-        articles = self.get_queryset()[:count]
-        serializer = NewsArticleListSerializer(articles, many=True)
-        return Response(serializer.data)
+        articles = self.get_queryset()
+        return self.conditional_response(
+            request, articles,
+            lambda: Response(NewsArticleListSerializer(articles[:count], many=True).data)
+        )
 
 
 class CollaborationViewSet(viewsets.ModelViewSet):
     """ViewSet for Collaboration model"""
     queryset = Collaboration.objects.all()
     serializer_class = CollaborationSerializer
+    pagination_class = OptInCursorPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['status', 'reviewed', 'project_type']
     ordering_fields = ['submitted_at', 'status']
@@ -144,7 +172,7 @@ class CollaborationViewSet(viewsets.ModelViewSet):
         )
 
 
-class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
+class SiteSettingsViewSet(ResponseCacheMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for SiteSettings (read-only for API)"""
     queryset = SiteSettings.objects.all()
     serializer_class = SiteSettingsSerializer
@@ -154,11 +182,12 @@ class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
     def current(self, request):
         """Get current site settings"""
         settings = SiteSettings.load()
-        serializer = self.get_serializer(settings)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, settings, lambda: Response(self.get_serializer(settings).data)
+        )
 
 
-class HeroSlideViewSet(viewsets.ModelViewSet):
+class HeroSlideViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for Hero Slides"""
     queryset = HeroSlide.objects.filter(is_active=True)
     serializer_class = HeroSlideSerializer
@@ -166,24 +195,29 @@ class HeroSlideViewSet(viewsets.ModelViewSet):
     ordering = ['display_order', '-created_at']
 
 
-class WorkCategoryViewSet(viewsets.ModelViewSet):
+class WorkCategoryViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for Work Categories"""
     queryset = WorkCategory.objects.filter(is_active=True)
     serializer_class = WorkCategorySerializer
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'name'
     ordering = ['display_order']
+    conditional_dependencies = [Work]
 
 
-class WorkViewSet(viewsets.ModelViewSet):
+class WorkViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin,
+                  viewsets.ModelViewSet):
     """ViewSet for Works"""
-    queryset = Work.objects.all()
+    queryset = Work.objects.select_related('category')
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'slug'
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptInCursorPagination
+    filter_backends = [DjangoFilterBackend, SearchFilter, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['category', 'is_featured']
     search_fields = ['title', 'description']
     ordering_fields = ['display_order', 'created_at']
+    # Category details, counts and related works are rendered too
+    conditional_dependencies = [WorkCategory, Work]
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -194,8 +228,10 @@ class WorkViewSet(viewsets.ModelViewSet):
     def featured(self, request):
         """Get featured works for homepage"""
         featured_works = self.queryset.filter(is_featured=True)
-        serializer = WorkListSerializer(featured_works, many=True)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, featured_works,
+            lambda: Response(WorkListSerializer(featured_works, many=True).data)
+        )
     
     @action(detail=False, methods=['get'])
     def by_category(self, request):
@@ -203,13 +239,15 @@ class WorkViewSet(viewsets.ModelViewSet):
         category_name = request.query_params.get('category', None)
         if category_name:
             works = self.queryset.filter(category__name=category_name)
-            serializer = WorkListSerializer(works, many=True)
-            return Response(serializer.data)
+            return self.conditional_response(
+                request, works,
+                lambda: Response(WorkListSerializer(works, many=True).data)
+            )
         return Response({"error": "Please provide a category parameter"}, 
                        status=status.HTTP_400_BAD_REQUEST)
 
 
-class TeamMemberViewSet(viewsets.ModelViewSet):
+class TeamMemberViewSet(ResponseCacheMixin, ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for Team Members"""
     queryset = TeamMember.objects.filter(is_active=True)
     serializer_class = TeamMemberSerializer
@@ -217,7 +255,7 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
     ordering = ['display_order', 'name']
 
 
-class AboutSectionViewSet(viewsets.ReadOnlyModelViewSet):
+class AboutSectionViewSet(ResponseCacheMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for About Section (read-only for API)"""
     queryset = AboutSection.objects.all()
     serializer_class = AboutSectionSerializer
@@ -227,11 +265,12 @@ class AboutSectionViewSet(viewsets.ReadOnlyModelViewSet):
     def current(self, request):
         """Get current about section"""
         about = AboutSection.load()
-        serializer = self.get_serializer(about)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, about, lambda: Response(self.get_serializer(about).data)
+        )
 
 
-class SloganSectionViewSet(viewsets.ReadOnlyModelViewSet):
+class SloganSectionViewSet(ResponseCacheMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Slogan Section (read-only for API)"""
     queryset = SloganSection.objects.all()
     serializer_class = SloganSectionSerializer
@@ -241,5 +280,19 @@ class SloganSectionViewSet(viewsets.ReadOnlyModelViewSet):
     def current(self, request):
         """Get current slogan"""
         slogan = SloganSection.load()
-        serializer = self.get_serializer(slogan)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, slogan, lambda: Response(self.get_serializer(slogan).data)
+        )
+
+
+class HomeView(APIView):
+    """Everything the homepage needs in a single cached response"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        home = get_home_payload(request)
+        response = get_conditional_response(request._request, etag=home['etag'])
+        if response is None:
+            response = Response(home['data'])
+        response['ETag'] = home['etag']
+        return response
@@ -0,0 +1,302 @@
+"""
+In-process stand-in for the Supabase Storage HTTP API
+Serves the endpoints `utils.supabase_storage` and `utils.supabase_client`
+use (upload, resumable upload, download, HEAD, info, list, remove and the
+public object URL) from an in-memory dict on a real socket, and records
+every request it handles. Tests use it in place of the real service;
+`core.benchmarks` uses it to time the storage path offline.
+
+For benchmarks, every request can be slowed down by a fixed `latency`
+(seconds, before the reply) and bodies by a `bandwidth` (bytes per
+second). Failures are injected explicitly through `failures`, or at a
+`failure_rate` drawn from a generator seeded with `seed`, so runs repeat
+exactly.
+"""
+
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from base64 import b64decode
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+PREFIX = '/storage/v1/object/'
+RESUMABLE = '/storage/v1/upload/resumable'
+FAILED = 'failed'
+# Injected failure that drops the connection instead of answering
+RESET = 'reset'
+# Listed modification time of objects put straight into `objects`
+OLD = '2020-01-01T00:00:00.000Z'
+
+
+class FakeStorageServer:
+    """Start with `with FakeStorageServer() as server:`; point SUPABASE_URL at `server.url`"""
+
+    def __init__(self, bucket='test-media', keep_bodies=True, latency=0, bandwidth=None,
+                 failure_rate=0, failure_status=503, seed=0):
+        self.bucket = bucket
+        self.objects = {}  # name -> (content_type, bytes, or None without keep_bodies)
+        self.received = {}  # name -> (size, sha256 hex digest) of every completed upload
+        self.modified = {}  # name -> ISO time of its last upload
+        self.keep_bodies = keep_bodies
+        self.uploads = {}  # resumable upload id -> state
+        self.requests = []
+        self.connections = set()
+        # Injected failures, consumed in order: a status (or RESET) answers
+        # the next request, a (method, status) pair the next request with that method
+        self.failures = []
+        self.latency = latency
+        self.bandwidth = bandwidth
+        # Share of the other requests answered with failure_status
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _handler(self))
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def store(self, name, content_type, data):
+        self.modified[name] = _now()
+        self.received[name] = (len(data), hashlib.sha256(data).hexdigest())
+        self.objects[name] = (content_type, data if self.keep_bodies else None)
+
+    def size(self, name):
+        data = self.objects[name][1]
+        return len(data) if data is not None else self.received[name][0]
+
+    def etag(self, name):
+        data = self.objects[name][1]
+        digest = hashlib.md5(data).hexdigest() if data is not None else self.received[name][1][:32]
+        return f'"{digest}"'
+
+    def calls(self, method=None):
+        return [path for verb, path in self.requests if method is None or verb == method]
+
+    def transfer(self, size):
+        """Wait as long as `size` bytes take at `bandwidth`"""
+        if self.bandwidth and size:
+            time.sleep(size / self.bandwidth)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so clients can reuse connections
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; don't let Nagle stall the second
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def route(self):
+            path = unquote(urlsplit(self.path).path)
+            with server.lock:
+                server.requests.append((self.command, path))
+                server.connections.add(self.client_address)
+                status = self.take_failure()
+            if server.latency:
+                time.sleep(server.latency)
+            if status == RESET:
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return FAILED, None
+            if status is not None:
+                self.body()
+                self.reply(status, {'statusCode': str(status), 'error': 'Injected', 'message': 'Injected failure'})
+                return FAILED, None
+            if path == RESUMABLE or path.startswith(RESUMABLE + '/'):
+                return 'resumable', path[len(RESUMABLE) + 1:]
+            if not path.startswith(PREFIX):
+                return None, None
+            rest = path[len(PREFIX):]
+            for action in ('info', 'list', 'public'):
+                if rest.startswith(action + '/'):
+                    rest = rest[len(action) + 1:]
+                    break
+            else:
+                action = 'object'
+            bucket, _, name = rest.partition('/')
+            if bucket != server.bucket:
+                return None, None
+            return action, name
+
+        def take_failure(self):
+            for index, failure in enumerate(server.failures):
+                method, status = failure if isinstance(failure, tuple) else (self.command, failure)
+                if method == self.command:
+                    del server.failures[index]
+                    return status
+            if server.failure_rate and server.random.random() < server.failure_rate:
+                return server.failure_status
+            return None
+
+        def body(self):
+            data = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            server.transfer(len(data))
+            return data
+
+        def reply(self, status, payload=None, content_type='application/json', body=None, headers=None):
+            if body is None and payload is not None:
+                body = json.dumps(payload).encode()
+            self.send_response(status)
+            for header, value in (headers or {}).items():
+                self.send_header(header, value)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body or b'')))
+            self.end_headers()
+            if body and self.command != 'HEAD':
+                server.transfer(len(body))
+                self.wfile.write(body)
+
+        def not_found(self):
+            self.reply(404, {'statusCode': '404', 'error': 'not_found', 'message': 'Object not found'})
+
+        def do_HEAD(self):
+            action, name = self.route()
+            if action == FAILED:
+                return
+            if action == 'resumable' and name in server.uploads:
+                self.send_response(200)
+                self.send_header('Upload-Offset', str(server.uploads[name]['offset']))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            elif action in ('object', 'public') and name in server.objects:
+                self.reply(200, body=b'', content_type=server.objects[name][0], headers={'ETag': server.etag(name)})
+            else:
+                # The real API answers a missing HEAD with a bodiless 400
+                self.reply(400, body=b'')
+
+        def do_GET(self):
+            action, name = self.route()
+            if action == FAILED:
+                return
+            if name not in server.objects:
+                return self.not_found()
+            content_type, data = server.objects[name]
+            if action == 'info':
+                return self.reply(200, {'name': name, 'size': server.size(name), 'content_type': content_type})
+            etag = server.etag(name)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.reply(200, content_type=content_type, body=data, headers={'ETag': etag})
+
+        def do_POST(self):
+            action, name = self.route()
+            if action == FAILED:
+                return
+            if action == 'resumable':
+                return self.create_upload()
+            raw = self.body()
+            if action == 'list':
+                return self.reply(200, self.listing(json.loads(raw)))
+            if action != 'object':
+                return self.not_found()
+            if name in server.objects and self.headers.get('x-upsert') != 'true':
+                return self.reply(400, {'statusCode': '409', 'error': 'Duplicate',
+                                        'message': 'The resource already exists'})
+            message = BytesParser(policy=HTTP).parsebytes(
+                b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + raw
+            )
+            part = next(part for part in message.iter_parts() if part.get_filename())
+            server.store(name, part.get_content_type(), part.get_payload(decode=True))
+            self.reply(200, {'Key': f'{server.bucket}/{name}'})
+
+        def listing(self, options):
+            """One folder level, as the real API lists it: subfolders have no id"""
+            prefix = options.get('prefix', '').strip('/')
+            prefix = prefix + '/' if prefix else ''
+            entries = {}
+            for key in sorted(server.objects):
+                if not key.startswith(prefix):
+                    continue
+                child, _, rest = key[len(prefix):].partition('/')
+                if rest:
+                    entries.setdefault(child, {'name': child, 'id': None, 'metadata': None})
+                else:
+                    entries[child] = {
+                        'name': child, 'id': key, 'updated_at': server.modified.get(key, OLD),
+                        'metadata': {'size': server.size(key), 'mimetype': server.objects[key][0]},
+                    }
+            offset = options.get('offset', 0)
+            return list(entries.values())[offset:offset + options.get('limit', 100)]
+
+        def create_upload(self):
+            metadata = dict(
+                (key, b64decode(value).decode()) for key, value in
+                (item.split(' ') for item in self.headers['Upload-Metadata'].split(','))
+            )
+            name = metadata['objectName']
+            if name in server.objects and self.headers.get('x-upsert') != 'true':
+                return self.reply(409, {'statusCode': '409', 'error': 'Duplicate',
+                                        'message': 'The resource already exists'})
+            upload_id = str(len(server.uploads) + 1)
+            server.uploads[upload_id] = {
+                'name': name, 'content_type': metadata['contentType'], 'offset': 0,
+                'length': int(self.headers['Upload-Length']), 'data': bytearray(), 'digest': hashlib.sha256(),
+            }
+            self.send_response(201)
+            self.send_header('Location', f'{RESUMABLE}/{upload_id}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_PATCH(self):
+            action, upload_id = self.route()
+            if action == FAILED:
+                return
+            upload = server.uploads.get(upload_id)
+            if action != 'resumable' or upload is None:
+                return self.not_found()
+            chunk = self.body()
+            if int(self.headers['Upload-Offset']) != upload['offset']:
+                return self.reply(409, {'statusCode': '409', 'error': 'Conflict', 'message': 'Offset mismatch'})
+            upload['offset'] += len(chunk)
+            upload['digest'].update(chunk)
+            if server.keep_bodies:
+                upload['data'] += chunk
+            del chunk
+            if upload['offset'] >= upload['length']:
+                server.received[upload['name']] = (upload['offset'], upload['digest'].hexdigest())
+                server.modified[upload['name']] = _now()
+                server.objects[upload['name']] = (
+                    upload['content_type'], bytes(upload['data']) if server.keep_bodies else None
+                )
+            self.send_response(204)
+            self.send_header('Upload-Offset', str(upload['offset']))
+            self.end_headers()
+
+        def do_DELETE(self):
+            action, _ = self.route()
+            if action == FAILED:
+                return
+            if action != 'object':
+                return self.not_found()
+            removed = []
+            for name in json.loads(self.body()).get('prefixes', []):
+                if server.objects.pop(name, None) is not None:
+                    removed.append({'name': name})
+            self.reply(200, removed)
+
+    return Handler
@@ -0,0 +1,309 @@
+"""
+Local disk cache for Supabase Storage reads
+Objects are kept under MEDIA_CACHE_DIR, one directory per object name with
+one file per ETag:
+
+    <root>/<sha256(name)[:2]>/<sha256(name)>/<base64url(etag)>
+
+SupabaseStorage asks for the cached ETag and sends it as If-None-Match, so a
+hit costs a bodiless 304 instead of a download, and an object changed by
+another host is never served stale. Several gunicorn workers can share one
+root: files are written to a temporary name and renamed into place, eviction
+runs under an exclusive lock and readers treat a file evicted under them as a
+miss. Recency is the file's mtime, bumped on every hit; once the cache
+outgrows `max_size`, the least recently used files are removed. Each
+process keeps a running byte total, seeded by one scan, and only walks the
+tree to evict once that total passes `max_size`; the scan resyncs it with
+what other processes stored meanwhile. Hit and miss
+counts gather in each process and are added to the shared stats file now and
+then, so reads never queue on its lock.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from contextlib import contextmanager
+from hashlib import sha256
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev servers run a single process
+    fcntl = None
+
+
+# Evict down to this share of max_size, so a full cache doesn't evict on every write
+EVICT_TO = 0.9
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+STATS_FILE = 'stats.json'
+LOCK_FILE = '.lock'
+TEMP_PREFIX = '.tmp-'
+
+# Seconds between writes of a process's counts to STATS_FILE
+STATS_FLUSH_INTERVAL = 10
+
+# root -> {'hits', 'misses'} counted by this process and not yet in STATS_FILE
+_unsaved = {}
+# root -> time.monotonic() of this process's last write attempt
+_flushed = {}
+_counts_lock = threading.Lock()
+
+# root -> bytes cached, as far as this process knows
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def _encode(etag):
+    return urlsafe_b64encode(etag.encode()).decode()
+
+
+def _decode(filename):
+    return urlsafe_b64decode(filename.encode()).decode()
+
+
+class MediaCache:
+    """Read-through copies of storage objects under `root`, at most about `max_size` bytes"""
+
+    def __init__(self, root, max_size):
+        self.root = os.fspath(root)
+        self.max_size = max_size
+
+    def _directory(self, name):
+        digest = sha256(name.encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    @contextmanager
+    def _locked(self, filename, blocking=True):
+        """
+        Open `filename` under the root with an exclusive lock shared by every
+        process; yields the handle, or None if busy and not `blocking`
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, filename), 'a+') as handle:
+            if fcntl is None:
+                yield handle
+                return
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield None
+                return
+            try:
+                yield handle
+            finally:
+                # Buffered writes must land before another process gets the lock
+                handle.flush()
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def lookup(self, name):
+        """(etag, path) of the newest cached copy of `name`, or None"""
+        directory = self._directory(name)
+        try:
+            entries = [entry for entry in os.scandir(directory) if not entry.name.startswith(TEMP_PREFIX)]
+        except FileNotFoundError:
+            return None
+        newest = None
+        for entry in entries:
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if newest is None or mtime > newest[0]:
+                newest = (mtime, entry)
+        if newest is None:
+            return None
+        return _decode(newest[1].name), newest[1].path
+
+    def open(self, path):
+        """Open a cached file and mark it recently used; FileNotFoundError if it was evicted"""
+        file = open(path, 'rb')
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return file
+
+    def store(self, name, etag, source):
+        """
+        Copy the file object `source` in as `name` at `etag`, replacing older copies
+        Returns the new copy opened for reading; the handle stays valid even
+        if another process evicts the file straight away.
+        """
+        directory = self._directory(name)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                shutil.copyfileobj(source, temp, COPY_BUFFER_SIZE)
+                size = temp.tell()
+            file = open(temp_path, 'rb')
+            path = os.path.join(directory, _encode(etag))
+            os.replace(temp_path, path)
+        except BaseException:
+            self._unlink(temp_path)
+            raise
+        for entry in os.scandir(directory):
+            if entry.path != path and not entry.name.startswith(TEMP_PREFIX):
+                size -= self._remove(entry.path)
+        if self._grow(size) > self.max_size:
+            self.evict()
+        return file
+
+    def invalidate(self, name):
+        """Drop every cached copy of `name`"""
+        try:
+            entries = list(os.scandir(self._directory(name)))
+        except FileNotFoundError:
+            return
+        freed = sum(self._remove(entry.path) for entry in entries if not entry.name.startswith(TEMP_PREFIX))
+        self._grow(-freed, seed=False)
+
+    def _unlink(self, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, path):
+        """Delete a cached copy; returns the bytes freed"""
+        try:
+            size = os.stat(path).st_size
+            os.unlink(path)
+        except FileNotFoundError:
+            return 0
+        return size
+
+    def _grow(self, delta, seed=True):
+        """
+        Add `delta` bytes to the running total and return it
+        The first call in a process scans the tree instead (after the change
+        it reports), or returns None without `seed`.
+        """
+        with _sizes_lock:
+            if self.root in _sizes:
+                _sizes[self.root] += delta
+                return _sizes[self.root]
+        if not seed:
+            return None
+        total = sum(size for _, size, _ in self._files())
+        with _sizes_lock:
+            _sizes[self.root] = total
+        return total
+
+    def _files(self):
+        """[(mtime, size, path), ...] for every cached copy"""
+        files = []
+        if not os.path.isdir(self.root):
+            return files
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for directory in os.scandir(shard.path):
+                for entry in os.scandir(directory.path):
+                    if entry.name.startswith(TEMP_PREFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def evict(self):
+        """Remove least recently used copies until the cache fits; skipped while another process evicts"""
+        with self._locked(LOCK_FILE, blocking=False) as handle:
+            if handle is None:
+                return
+            files = self._files()
+            total = sum(size for _, size, _ in files)
+            if total > self.max_size:
+                for _, size, path in sorted(files):
+                    self._unlink(path)
+                    total -= size
+                    if total <= self.max_size * EVICT_TO:
+                        break
+            with _sizes_lock:
+                _sizes[self.root] = total
+
+    def record(self, hit):
+        """
+        Count a hit or a miss
+        Every STATS_FLUSH_INTERVAL seconds the counts go to the shared stats;
+        if another process holds the file they wait for the next round.
+        """
+        with _counts_lock:
+            counts = _unsaved.setdefault(self.root, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+            last = _flushed.get(self.root)
+            due = last is None or time.monotonic() - last >= STATS_FLUSH_INTERVAL
+        if due:
+            self.flush_stats(blocking=False)
+
+    def flush_stats(self, blocking=True):
+        """Add this process's counts to the shared stats; False if busy and not `blocking`"""
+        with _counts_lock:
+            counts = _unsaved.pop(self.root, None)
+            _flushed[self.root] = time.monotonic()
+        if not counts:
+            return True
+        with self._locked(STATS_FILE, blocking=blocking) as handle:
+            if handle is None:
+                with _counts_lock:
+                    unsaved = _unsaved.setdefault(self.root, {'hits': 0, 'misses': 0})
+                    for key, count in counts.items():
+                        unsaved[key] += count
+                return False
+            handle.seek(0)
+            try:
+                stats = json.loads(handle.read() or '{}')
+            except ValueError:
+                stats = {}
+            for key, count in counts.items():
+                stats[key] = stats.get(key, 0) + count
+            # Append mode: after truncating, the write lands at the start
+            handle.truncate(0)
+            handle.write(json.dumps(stats))
+        return True
+
+    def stats(self):
+        """
+        {'hits', 'misses', 'hit_rate', 'size', 'files'} across every process sharing the root
+        Other processes' latest counts show up once they flush them.
+        """
+        self.flush_stats()
+        with self._locked(STATS_FILE) as handle:
+            handle.seek(0)
+            try:
+                counts = json.loads(handle.read() or '{}')
+            except ValueError:
+                counts = {}
+        hits, misses = counts.get('hits', 0), counts.get('misses', 0)
+        files = self._files()
+        with _sizes_lock:
+            _sizes[self.root] = sum(size for _, size, _ in files)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else None,
+            'size': sum(size for _, size, _ in files),
+            'files': len(files),
+        }
+
+    def clear(self):
+        with _counts_lock:
+            _unsaved.pop(self.root, None)
+        with _sizes_lock:
+            _sizes.pop(self.root, None)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+@atexit.register
+def _flush_on_exit():
+    for root in list(_unsaved):
+        MediaCache(root, 0).flush_stats()
@@ -0,0 +1,22 @@
+"""
+Supabase Storage object URLs
+Plain string building with no Django or SDK imports, shared by
+`utils.supabase_storage` and `utils.supabase_client`.
+"""
+
+from urllib.parse import quote
+
+
+# Characters get_public_url() leaves unescaped in object paths
+PATH_SAFE = "/!$&'()*+,;=:@~"
+
+
+def public_url(supabase_url, bucket_name, name, cdn_url=None):
+    """
+    Public URL of an object in a public bucket, built without the client
+    Matches get_public_url(). `cdn_url` replaces the Supabase origin with a
+    CDN that proxies /storage/v1/object/public/.
+    """
+    origin = (cdn_url or supabase_url).rstrip('/')
+    path = quote(name.lstrip('/'), safe=PATH_SAFE)
+    return f"{origin}/storage/v1/object/public/{quote(bucket_name, safe='')}/{path}"
@@ -0,0 +1,264 @@
+"""
+Shared Supabase Storage client
+One `storage3.SyncStorageClient` per process and project, created on first
+use, over a pooled keep-alive `httpx.Client` with bounded timeouts and
+retries. Only the storage API is needed, so the full `supabase` SDK (auth,
+postgrest, realtime, functions) is never imported. Import this module
+lazily: `utils.supabase_storage` does so on the first real storage call.
+"""
+
+import io
+import os
+import posixpath
+import threading
+import time
+from base64 import b64encode
+from urllib.parse import quote
+
+import httpx
+from storage3 import SyncStorageClient
+
+from .storage_urls import PATH_SAFE
+
+
+POOL_SIZE = 10
+KEEPALIVE_EXPIRY = 30
+CONNECT_TIMEOUT = 5
+# Reads and writes cover whole uploads and downloads
+TIMEOUT = 60
+
+RETRIES = 3
+BACKOFF = 0.25
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}
+
+# Transfers: bodies move through memory in pieces of this size
+CHUNK_SIZE = 64 * 1024
+# Larger objects go through the resumable (TUS) endpoint in the fixed
+# chunk size Supabase requires
+RESUMABLE_THRESHOLD = 6 * 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+CACHE_CONTROL = '3600'
+
+_clients = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Retries with exponential backoff (BACKOFF, 2 * BACKOFF, ...)
+    Connection failures are retried for every method, since nothing reached
+    the server; other transport errors and overloaded/unavailable responses
+    only for idempotent methods, so an upload is never sent twice.
+    """
+
+    def __init__(self, transport, retries=RETRIES, backoff=BACKOFF):
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    def handle_request(self, request):
+        idempotent = request.method in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = self.transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if last:
+                    raise
+            except httpx.TransportError:
+                if last or not idempotent:
+                    raise
+            else:
+                if last or not idempotent or response.status_code not in RETRY_STATUSES:
+                    return response
+                response.close()
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def close(self):
+        self.transport.close()
+
+
+def build_http_client():
+    limits = httpx.Limits(
+        max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE, keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+    return httpx.Client(
+        transport=RetryTransport(httpx.HTTPTransport(limits=limits)),
+        timeout=httpx.Timeout(TIMEOUT, connect=CONNECT_TIMEOUT),
+        follow_redirects=True,
+    )
+
+
+def get_storage_client(supabase_url, supabase_key):
+    """The process-wide storage client for a project, created on first use"""
+    global _pid
+    key = (supabase_url, supabase_key)
+    with _lock:
+        if os.getpid() != _pid:
+            # Forked worker: pooled sockets belong to the parent
+            _clients.clear()
+            _pid = os.getpid()
+        client = _clients.get(key)
+        if client is None:
+            headers = {'apiKey': supabase_key, 'Authorization': f'Bearer {supabase_key}'}
+            http_client = build_http_client()
+            http_client.headers.update(headers)
+            client = SyncStorageClient(
+                f"{supabase_url.rstrip('/')}/storage/v1/", headers, http_client=http_client
+            )
+            _clients[key] = client
+        return client
+
+
+def close_clients():
+    """Close every pooled connection (tests, shutdown)"""
+    with _lock:
+        for client in _clients.values():
+            client.session.close()
+        _clients.clear()
+
+
+def object_url(storage_url, *parts):
+    """URL under /storage/v1/ with each part path-quoted"""
+    return storage_url + '/'.join(quote(part.strip('/'), safe=PATH_SAFE) for part in parts)
+
+
+def upload(session, storage_url, bucket_name, name, fileobj, size, content_type):
+    """Upload `fileobj` without holding more than one chunk of it in memory"""
+    if size > RESUMABLE_THRESHOLD:
+        return upload_resumable(session, storage_url, bucket_name, name, fileobj, size, content_type)
+    # httpx reads file-like multipart fields CHUNK_SIZE bytes at a time
+    fileobj.seek(0)
+    response = session.post(
+        object_url(storage_url, 'object', bucket_name, name),
+        files={'file': (posixpath.basename(name), fileobj, content_type)},
+        data={'cacheControl': CACHE_CONTROL},
+        headers={'x-upsert': 'false'},
+    )
+    response.raise_for_status()
+
+
+def upload_resumable(session, storage_url, bucket_name, name, fileobj, size, content_type):
+    """
+    TUS upload in RESUMABLE_CHUNK_SIZE pieces
+    A failed chunk is retried from the offset the server reports, so a
+    dropped connection costs at most one chunk.
+    """
+    tus = {'Tus-Resumable': '1.0.0'}
+    metadata = {
+        'bucketName': bucket_name, 'objectName': name,
+        'contentType': content_type, 'cacheControl': CACHE_CONTROL,
+    }
+    encoded = ','.join(f'{key} {b64encode(value.encode()).decode()}' for key, value in metadata.items())
+    response = session.post(object_url(storage_url, 'upload/resumable'), headers={
+        **tus, 'Upload-Length': str(size), 'Upload-Metadata': encoded, 'x-upsert': 'false',
+    })
+    response.raise_for_status()
+    location = str(response.url.join(response.headers['Location']))
+
+    offset, failures = 0, 0
+    while offset < size:
+        length = min(RESUMABLE_CHUNK_SIZE, size - offset)
+        try:
+            response = session.patch(location, content=read_range(fileobj, offset, length), headers={
+                **tus, 'Upload-Offset': str(offset), 'Content-Length': str(length),
+                'Content-Type': 'application/offset+octet-stream',
+            })
+            response.raise_for_status()
+            offset = int(response.headers['Upload-Offset'])
+        except httpx.HTTPError as exc:
+            status = getattr(getattr(exc, 'response', None), 'status_code', None)
+            failures += 1
+            if failures > RETRIES or (status is not None and status < 500 and status != 409):
+                raise
+            time.sleep(BACKOFF * 2 ** (failures - 1))
+            response = session.head(location, headers=tus)
+            response.raise_for_status()
+            offset = int(response.headers['Upload-Offset'])
+
+
+def read_range(fileobj, offset, length):
+    """Yield `length` bytes of `fileobj` from `offset`, CHUNK_SIZE at a time"""
+    fileobj.seek(offset)
+    while length > 0:
+        piece = fileobj.read(min(CHUNK_SIZE, length))
+        if not piece:
+            raise ValueError('File is shorter than its reported size')
+        length -= len(piece)
+        yield piece
+
+
+def download(session, storage_url, bucket_name, name, etag=None):
+    """
+    Open a streamed download: returns (buffered reader, size or None, ETag or None)
+    Only the headers have been read when this returns. With `etag`, an
+    unchanged object answers 304 and the reader is None.
+    """
+    headers = {'If-None-Match': etag} if etag else {}
+    request = session.build_request('GET', object_url(storage_url, 'object', bucket_name, name), headers=headers)
+    response = session.send(request, stream=True)
+    if etag and response.status_code == 304:
+        response.close()
+        return None, None, etag
+    if response.status_code != 200:
+        response.read()
+        response.close()
+        response.raise_for_status()
+    length = response.headers.get('Content-Length')
+    size = int(length) if length is not None and 'Content-Encoding' not in response.headers else None
+    return io.BufferedReader(ResponseStream(response), buffer_size=CHUNK_SIZE), size, response.headers.get('ETag')
+
+
+def object_etag(session, storage_url, bucket_name, name):
+    """ETag of a stored object from a HEAD request, or None if it doesn't exist"""
+    response = session.head(object_url(storage_url, 'object', bucket_name, name))
+    # A missing object answers 400 or 404
+    if response.status_code in (400, 404):
+        return None
+    response.raise_for_status()
+    return response.headers.get('ETag')
+
+
+def is_duplicate(exc):
+    """Whether an upload failed because the object already exists"""
+    response = getattr(exc, 'response', None)
+    if response is None:
+        return False
+    if response.status_code == 409:
+        return True
+    # The object endpoint reports duplicates as a 400 with a 409 in the body
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and str(payload.get('statusCode')) == '409'
+
+
+class ResponseStream(io.RawIOBase):
+    """Raw, read-only file over a streamed httpx response body"""
+
+    def __init__(self, response):
+        self.response = response
+        self.chunks = response.iter_bytes(CHUNK_SIZE)
+        self.pending = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.pending:
+            try:
+                self.pending = memoryview(next(self.chunks))
+            except StopIteration:
+                return 0
+        count = min(len(buffer), len(self.pending))
+        buffer[:count] = self.pending[:count]
+        self.pending = self.pending[count:]
+        return count
+
+    def close(self):
+        if not self.closed:
+            self.response.close()
+        super().close()
@@ -3,12 +3,40 @@ Supabase Storage Backend for Django
 Handles file uploads to Supabase Storage buckets
 """
 
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.core.files import File
 from django.core.files.storage import Storage
 from django.conf import settings
-from supabase import create_client, Client
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from urllib.parse import urljoin
 
+from core.models import PendingDeletion, StoredFile
+
+from .media_cache import MediaCache
+from .storage_urls import public_url
+
+
+logger = logging.getLogger(__name__)
+
+# Queued deletions go out this many names per remove() request
+DELETE_BATCH_SIZE = 100
+# A failed batch is retried after DELETE_BACKOFF * 2 ** (attempts - 1) seconds, at most DELETE_MAX_BACKOFF
+DELETE_BACKOFF = 30
+DELETE_MAX_BACKOFF = 3600
+# Objects per list() request
+LIST_PAGE_SIZE = 1000
+
+_flush_executor = None
+_flush_pid = None
+_flush_pending = False
+_flush_lock = threading.Lock()
+
 
 class SupabaseStorage(Storage):
     """
@@ -19,96 +47,283 @@ class SupabaseStorage(Storage):
         self.supabase_url = os.environ.get('SUPABASE_URL')
         self.supabase_key = os.environ.get('SUPABASE_KEY')
         self.bucket_name = os.environ.get('SUPABASE_BUCKET', 'atelier-media')
-        
-        if self.supabase_url and self.supabase_key:
-            self.client: Client = create_client(self.supabase_url, self.supabase_key)
-        else:
-            self.client = None
+        self.cdn_url = os.environ.get('SUPABASE_CDN_URL')
+        self.configured = bool(self.supabase_url and self.supabase_key)
+        if self.configured:
+            self.storage_url = f"{self.supabase_url.rstrip('/')}/storage/v1/"
+        # Read-through disk cache for _open(); off when MEDIA_CACHE_DIR is empty
+        self.cache = None
+        if self.configured and settings.MEDIA_CACHE_DIR:
+            self.cache = MediaCache(settings.MEDIA_CACHE_DIR, settings.MEDIA_CACHE_MAX_SIZE)
+    
+    @property
+    def client(self):
+        """
+        The shared storage client; the SDK is imported on first use, not at startup
+        """
+        if not self.configured:
+            return None
+        from .supabase_client import get_storage_client
+        return get_storage_client(self.supabase_url, self.supabase_key)
+    
+    @property
+    def bucket(self):
+        return self.client.from_(self.bucket_name)
     
     def _save(self, name, content):
         """
         Save file to Supabase Storage
+        The file is streamed in chunks; large files use resumable uploads.
         """
-        if not self.client:
+        if not self.configured:
             raise ValueError("Supabase client not configured")
         
+        from . import supabase_client
+        
+        content_type = content.content_type if hasattr(content, 'content_type') else 'application/octet-stream'
         try:
-            # Read file content
-            content.seek(0)
-            file_data = content.read()
-            
-            # Upload to Supabase
-            response = self.client.storage.from_(self.bucket_name).upload(
-                name, 
-                file_data,
-                file_options={"content-type": content.content_type if hasattr(content, 'content_type') else 'application/octet-stream'}
+            supabase_client.upload(
+                self.client.session, self.storage_url, self.bucket_name, name,
+                content, content.size, content_type
             )
-            
-            return name
         except Exception as e:
             raise Exception(f"Failed to upload to Supabase: {str(e)}")
+        
+        self._index(name, content.size, content_type)
+        # A deletion queued for an earlier object under this name must not take this one
+        PendingDeletion.objects.filter(name=name).delete()
+        if self.cache:
+            self.cache.invalidate(name)
+        return name
     
     def _open(self, name, mode='rb'):
         """
         Retrieve a file from Supabase Storage
+        Returns a read-only File whose body streams in as it's read. With the
+        disk cache on, an unchanged object is read from the local copy after
+        a bodiless 304, and a changed or new one is saved there first.
         """
-        if not self.client:
+        if not self.configured:
             raise ValueError("Supabase client not configured")
         
+        cached = self.cache.lookup(name) if self.cache else None
+        if cached:
+            stream, size, etag = self._download(name, etag=cached[0])
+            if stream is None:
+                try:
+                    return self._cached_file(self.cache.open(cached[1]), name, hit=True)
+                except FileNotFoundError:
+                    # Evicted since the lookup
+                    stream, size, etag = self._download(name)
+        else:
+            stream, size, etag = self._download(name)
+        
+        if self.cache and etag and (size is None or size <= self.cache.max_size):
+            with stream:
+                copy = self.cache.store(name, etag, stream)
+            return self._cached_file(copy, name, hit=False)
+        if self.cache:
+            self.cache.record(hit=False)
+        
+        file = File(stream, name)
+        if size is not None:
+            file.size = size
+        return file
+    
+    def _download(self, name, etag=None):
+        from . import supabase_client
+        
         try:
-            response = self.client.storage.from_(self.bucket_name).download(name)
-            return response
+            return supabase_client.download(
+                self.client.session, self.storage_url, self.bucket_name, name, etag=etag
+            )
         except Exception as e:
             raise Exception(f"Failed to download from Supabase: {str(e)}")
     
+    def _cached_file(self, handle, name, hit):
+        self.cache.record(hit=hit)
+        file = File(handle, name)
+        file.size = os.fstat(handle.fileno()).st_size
+        return file
+    
     def delete(self, name):
         """
-        Delete a file from Supabase Storage
+        Queue a file for deletion from Supabase Storage
+        Nothing is sent here: the name is recorded in PendingDeletion and,
+        once the caller's transaction commits, a background flush removes
+        everything queued in batches (see flush_deletions()).
+        """
+        self.queue_deletions([name])
+        transaction.on_commit(lambda: schedule_flush(self))
+    
+    def queue_deletions(self, names):
+        """
+        Record `names` in the deletion queue without flushing it
+        They drop out of the index and the disk cache straight away.
         """
-        if not self.client:
+        if not self.configured:
             raise ValueError("Supabase client not configured")
         
-        try:
-            self.client.storage.from_(self.bucket_name).remove([name])
-        except Exception as e:
-            raise Exception(f"Failed to delete from Supabase: {str(e)}")
+        PendingDeletion.objects.bulk_create(
+            [PendingDeletion(name=name) for name in names], ignore_conflicts=True
+        )
+        StoredFile.objects.filter(name__in=names).delete()
+        if self.cache:
+            for name in names:
+                self.cache.invalidate(name)
+    
+    def flush_deletions(self):
+        """
+        Remove queued deletions that are due, DELETE_BATCH_SIZE names per request
+        A failed batch stays queued and is retried after a growing backoff.
+        Returns (removed, failed) counts.
+        """
+        removed = failed = 0
+        while True:
+            now = timezone.now()
+            batch = list(
+                PendingDeletion.objects.filter(next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'pk')[:DELETE_BATCH_SIZE]
+            )
+            if not batch:
+                return removed, failed
+            try:
+                # Names already gone are simply left out of the reply
+                self.bucket.remove([pending.name for pending in batch])
+            except Exception as e:
+                for pending in batch:
+                    pending.attempts += 1
+                    pending.last_error = str(e)
+                    delay = min(DELETE_BACKOFF * 2 ** (pending.attempts - 1), DELETE_MAX_BACKOFF)
+                    pending.next_attempt_at = now + timedelta(seconds=delay)
+                PendingDeletion.objects.bulk_update(batch, ['attempts', 'last_error', 'next_attempt_at'])
+                failed += len(batch)
+                logger.warning('Could not delete %d file(s) from Supabase: %s', len(batch), e)
+                continue
+            PendingDeletion.objects.filter(pk__in=[pending.pk for pending in batch]).delete()
+            removed += len(batch)
+    
+    def list_objects(self, prefix=''):
+        """
+        Every object under `prefix`, recursively, as (name, size, updated_at) tuples
+        """
+        if not self.configured:
+            return
+        
+        prefix = prefix.strip('/')
+        offset = 0
+        while True:
+            entries = self.bucket.list(prefix, {'limit': LIST_PAGE_SIZE, 'offset': offset})
+            for entry in entries:
+                name = f"{prefix}/{entry['name']}" if prefix else entry['name']
+                if entry.get('id') is None:
+                    # Folders have no id
+                    yield from self.list_objects(name)
+                    continue
+                metadata = entry.get('metadata') or {}
+                updated = entry.get('updated_at') or entry.get('created_at')
+                yield name, metadata.get('size', 0), updated and parse_datetime(updated)
+            if len(entries) < LIST_PAGE_SIZE:
+                return
+            offset += LIST_PAGE_SIZE
     
     def exists(self, name):
         """
         Check if a file exists in Supabase Storage
+        The local index answers for files saved through this backend; anything
+        else costs one HEAD request for that object. Names queued for deletion
+        stay taken until the queue is flushed.
         """
-        if not self.client:
+        if not self.configured:
             return False
         
+        if StoredFile.objects.filter(name=name).exists() or PendingDeletion.objects.filter(name=name).exists():
+            return True
         try:
-            files = self.client.storage.from_(self.bucket_name).list()
-            return any(f['name'] == name for f in files)
-        except:
+            return self.bucket.exists(name)
+        except Exception:
             return False
     
     def url(self, name):
         """
         Return the URL for accessing a file
         """
-        if not self.client or not self.supabase_url:
+        if not self.configured:
             return name
         
-        # Get public URL
-        public_url = self.client.storage.from_(self.bucket_name).get_public_url(name)
-        return public_url
+        # Public buckets need no signing, so there's nothing to ask the client
+        return public_url(self.supabase_url, self.bucket_name, name, self.cdn_url)
     
     def size(self, name):
         """
         Return the size of a file
         """
-        if not self.client:
+        if not self.configured:
             return 0
         
+        size = StoredFile.objects.filter(name=name).values_list('size', flat=True).first()
+        if size is not None:
+            return size
         try:
-            files = self.client.storage.from_(self.bucket_name).list()
-            for f in files:
-                if f['name'] == name:
-                    return f.get('metadata', {}).get('size', 0)
-            return 0
-        except:
+            stored = self._fetch_info(name)
+        except Exception:
             return 0
+        return stored.size if stored else 0
+    
+    def _fetch_info(self, name):
+        """
+        Look up a single object's metadata and index it; None if it doesn't exist
+        """
+        from storage3.exceptions import StorageApiError
+        
+        try:
+            info = self.bucket.info(name)
+        except StorageApiError as e:
+            if str(e.status) in ('400', '404'):
+                return None
+            raise
+        metadata = info.get('metadata') or {}
+        size = info.get('size', metadata.get('size')) or 0
+        content_type = info.get('content_type') or metadata.get('mimetype') or ''
+        return self._index(name, size, content_type)
+    
+    def _index(self, name, size, content_type):
+        stored, _ = StoredFile.objects.update_or_create(
+            name=name, defaults={'size': size, 'content_type': content_type or ''}
+        )
+        return stored
+
+
+def _flush(storage):
+    global _flush_pending
+    with _flush_lock:
+        # Deletions queued from here on need another flush
+        _flush_pending = False
+    try:
+        storage.flush_deletions()
+    except Exception:
+        logger.exception('Flushing queued deletions failed')
+    finally:
+        connection.close()
+
+
+def schedule_flush(storage):
+    """
+    Flush queued deletions on a background thread (inline when
+    MEDIA_DELETIONS_IN_BACKGROUND is off); at most one flush waits at a time,
+    so a burst of deletions goes out together
+    """
+    global _flush_executor, _flush_pid, _flush_pending
+    if not settings.MEDIA_DELETIONS_IN_BACKGROUND:
+        storage.flush_deletions()
+        return None
+    with _flush_lock:
+        if _flush_executor is None or _flush_pid != os.getpid():
+            # Forked workers don't inherit the parent's pool thread
+            _flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='media-deletions')
+            _flush_pid = os.getpid()
+            _flush_pending = False
+        if _flush_pending:
+            return None
+        _flush_pending = True
+        return _flush_executor.submit(_flush, storage)
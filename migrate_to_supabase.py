@@ -26,6 +26,7 @@ try:
     print("Running migrations on Supabase PostgreSQL...")
     call_command('migrate')
     print("✅ Migrations completed successfully!")
+    print("Media files are not copied; run `python manage.py migrate_media` in backend/ for those.")
 except Exception as e:
     print(f"❌ Migration failed: {e}")
     sys.exit(1)